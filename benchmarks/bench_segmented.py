@@ -0,0 +1,78 @@
+"""Parçalı indirme karşılaştırması: yerel, bağlantı başına hız sınırlı bir HTTP sunucusu.
+
+    python benchmarks/bench_segmented.py [--size-mb 32] [--rate-mb 4] [--connections 1 4 8]
+
+Her bağlantı `--rate-mb` MB/s ile sınırlanır (CDN kısıtlamasının benzeri);
+tek bağlantı ile N bağlantı arasındaki süre farkı ölçülür.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from segmented import ParallelYoutubeDL  # noqa: E402
+from mediaserver import serve_range  # noqa: E402
+
+
+def make_handler(payload, rate):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            serve_range(self, payload, rate)
+
+    return Handler
+
+
+def run(url, connections, folder, payload):
+    target = os.path.join(folder, f"out_{connections}.bin")
+    info = {"id": "bench", "title": "bench", "url": url, "ext": "bin", "protocol": "http"}
+    opts = {"quiet": True, "noprogress": True, "concurrent_fragment_downloads": connections, "continuedl": False}
+    started = time.perf_counter()
+    with ParallelYoutubeDL(opts) as ydl:
+        ydl.dl(target, info)
+    elapsed = time.perf_counter() - started
+    with open(target, "rb") as f:
+        ok = f.read() == payload
+    os.remove(target)
+    return elapsed, ok
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=32)
+    parser.add_argument("--rate-mb", type=float, default=4.0, help="Bağlantı başına hız sınırı (MB/s)")
+    parser.add_argument("--connections", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    payload = os.urandom(args.size_mb * 1024 * 1024)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(payload, args.rate_mb * 1024 * 1024))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/file.bin"
+
+    baseline = None
+    with tempfile.TemporaryDirectory() as folder:
+        for n in args.connections:
+            elapsed, ok = run(url, n, folder, payload)
+            if not ok:
+                print(f"{n} bağlantı: indirilen dosya kaynakla aynı değil")
+                continue
+            baseline = baseline or elapsed
+            print(
+                f"{n:>2} bağlantı: {elapsed:6.2f} sn  "
+                f"{len(payload) / elapsed / 1024 / 1024:6.1f} MB/s  x{baseline / elapsed:.1f}"
+            )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
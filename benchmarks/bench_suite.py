@@ -0,0 +1,364 @@
+"""Ağ gerektirmeyen karşılaştırma paketi: yerel medya sunucusu + sahte yt-dlp çıkarıcısı.
+
+    python benchmarks/bench_suite.py [--only info download postprocess batch gui]
+    python benchmarks/bench_suite.py --json temel.json
+    python benchmarks/bench_suite.py --compare temel.json [--tolerance 0.25]
+
+Ölçümler:
+    info         InfoFetchThread gecikmesi (soğuk ve önbellekten)
+    download     DownloadThread uçtan uca hızı (progressive, DASH, HLS)
+    postprocess  mod başına son işlem süresi (ffmpeg yoksa atlanır)
+    batch        run_batch toplam hızı, farklı eşzamanlılık düzeylerinde
+    gui          indirme ve bilgi alma sürerken arayüz iş parçacığı takılmaları
+
+--compare verilirse herhangi bir ölçüm temelden `--tolerance` oranından
+fazla kötüleştiğinde çıkış kodu 1 olur (gerileme kapısı).
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEventLoop, QTimer, Qt  # noqa: E402
+from PyQt5.QtGui import QImage, QPixmap  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from mediaserver import MediaServer  # noqa: E402
+from fake_extractor import install  # noqa: E402
+
+MB = 1024 * 1024
+BENCHES = ("info", "download", "postprocess", "batch", "gui")
+
+
+class Results:
+    def __init__(self):
+        self.values = {}
+
+    def add(self, name, value, unit, higher=False, detail=""):
+        self.values[name] = {"value": value, "unit": unit, "higher": higher}
+        print(f"{name:<32} {value:10.2f} {unit:<5} {detail}", flush=True)
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.values, f, indent=2)
+
+    def compare(self, path, tolerance):
+        with open(path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = []
+        for name, base in baseline.items():
+            current = self.values.get(name)
+            if not current or not base["value"]:
+                continue
+            change = current["value"] / base["value"] - 1
+            worse = -change if base["higher"] else change
+            if worse > tolerance:
+                regressions.append(f"{name}: {base['value']:.2f} -> {current['value']:.2f} {current['unit']}")
+        return regressions
+
+
+def wait_signal(signal, start, timeout=300):
+    # Sinyal ana iş parçacığına ulaşana kadar olay döngüsünü çalıştırır
+    loop = QEventLoop()
+    box = {}
+
+    def received(*args):
+        box["args"] = args
+        loop.quit()
+
+    signal.connect(received)
+    QTimer.singleShot(int(timeout * 1000), loop.quit)
+    start()
+    loop.exec_()
+    signal.disconnect(received)
+    if "args" not in box:
+        raise TimeoutError("Zaman aşımı")
+    return box["args"]
+
+
+def make_job(url, folder, download_type="Birleştir (Normal)"):
+    from jobs import DownloadJob
+
+    return DownloadJob(url, folder, "mp4", "best", False, download_type, False, "Otomatik", False, "", "", "fast")
+
+
+def clear_folder(folder):
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+
+
+def bench_info(server, args, results, folder):
+    from cache import MetadataCache
+    from downloader import InfoFetchThread
+
+    cache = MetadataCache(os.path.join(folder, "info"), 3600)
+    cold, warm = [], []
+    for i in range(args.runs):
+        url = server.watch_url("progressive", MB, f"info{i}")
+        # İlki çözümler ve önbelleğe yazar, ikincisi önbellekten okur
+        for samples in (cold, warm):
+            thread = InfoFetchThread(url, cache)
+            started = time.perf_counter()
+            wait_signal(thread.info_ready, thread.start)
+            samples.append(time.perf_counter() - started)
+            thread.wait()
+    results.add("info.cold_ms", statistics.median(cold) * 1000, "ms", detail=f"en kötü {max(cold) * 1000:.1f} ms")
+    results.add("info.cached_ms", statistics.median(warm) * 1000, "ms", detail=f"en kötü {max(warm) * 1000:.1f} ms")
+
+
+def bench_download(server, args, results, folder, has_ffmpeg):
+    from downloader import DownloadThread
+
+    size = args.size_mb * MB
+    for layout in ("progressive", "dash", "hls"):
+        # ffmpeg yoksa DASH akışları birleştirilemez; ayrı ayrı indirilir
+        mode = "Birleştir (Normal)" if has_ffmpeg or layout != "dash" else "Ayrı Ayrı (Ses + Video)"
+        samples = []
+        for i in range(args.runs):
+            thread = DownloadThread(
+                make_job(server.watch_url(layout, size, f"dl{i}"), folder, mode), connections=args.connections
+            )
+            started = time.perf_counter()
+            message, files, _ = wait_signal(thread.done, thread.start)
+            elapsed = time.perf_counter() - started
+            thread.wait()
+            if not files:
+                raise RuntimeError(f"{layout}: {message}")
+            samples.append(size / elapsed / MB)
+            clear_folder(folder)
+        results.add(
+            f"download.{layout}_mbps", statistics.median(samples), "MB/s", higher=True,
+            detail=f"{args.size_mb} MB, {args.connections} bağlantı" + ("" if mode.startswith("Birleştir") else ", ayrı")
+        )
+
+
+def bench_postprocess(args, results, folder):
+    from postprocess import plan_audio, plan_postprocess, run_plan
+
+    source = os.path.join(folder, "kaynak.mp4")
+    seconds = args.media_seconds
+    subprocess.run([
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-f", "lavfi", "-i", "testsrc2=size=1280x720:rate=30",
+        "-f", "lavfi", "-i", "sine=frequency=440:sample_rate=44100",
+        "-t", str(seconds), "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+        "-c:a", "aac", "-b:a", "128k", source
+    ], check=True)
+    modes = {
+        "remux_mkv": lambda src: plan_postprocess(src, "mkv"),
+        "faststart": lambda src: plan_postprocess(src, "mp4", faststart=True),
+        "clip": lambda src: plan_postprocess(src, clip=(seconds / 4, seconds / 2)),
+        "audio_copy": lambda src: plan_audio(src, "mp4", "mp4a.40.2", seconds),
+        "audio_mp3": lambda src: plan_audio(src, "mp3", "mp4a.40.2", seconds),
+    }
+    for name, make_plan in modes.items():
+        samples, cpu = [], []
+        for _ in range(args.runs):
+            work = os.path.join(folder, "is.mp4")
+            shutil.copyfile(source, work)
+            plan = make_plan(work)
+            started = time.perf_counter()
+            output = run_plan(plan)
+            samples.append(time.perf_counter() - started)
+            cpu.append(plan.cpu_seconds or 0.0)
+            os.remove(output)
+        results.add(
+            f"postprocess.{name}_s", statistics.median(samples), "sn",
+            detail=f"{seconds} sn ortam, CPU {statistics.median(cpu):.2f} sn"
+        )
+
+
+def bench_batch(server, args, results, folder):
+    from engine import run_batch
+
+    size = args.batch_mb * MB
+    for level in args.concurrency:
+        jobs = [make_job(server.watch_url("progressive", size, f"b{level}x{i}"), folder) for i in range(args.batch_jobs)]
+        errors = []
+        started = time.perf_counter()
+        # Tüm işler aynı sunucuda: site sınırı eşzamanlılığı kısmasın
+        run_batch(jobs, level, level, on_done=lambda job, files, title, error: error and errors.append(error))
+        elapsed = time.perf_counter() - started
+        clear_folder(folder)
+        if errors:
+            raise RuntimeError(errors[0])
+        results.add(
+            f"batch.j{level}_mbps", size * len(jobs) / elapsed / MB, "MB/s", higher=True,
+            detail=f"{len(jobs)} x {args.batch_mb} MB, {elapsed:.2f} sn"
+        )
+
+
+class StallMeter:
+    """Ana iş parçacığında sık bir zamanlayıcı; gecikmesi arayüzün ne kadar takıldığını gösterir."""
+
+    def __init__(self, interval_ms=5):
+        self.interval = interval_ms / 1000
+        self.lateness = []
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self._tick)
+        self._last = None
+
+    def start(self):
+        self._last = time.perf_counter()
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def _tick(self):
+        now = time.perf_counter()
+        self.lateness.append(max(0.0, now - self._last - self.interval))
+        self._last = now
+
+
+def bench_gui(server, args, results, folder):
+    from gui import DownloaderApp
+    from metrics import METRICS
+
+    class BenchApp(DownloaderApp):
+        def check_for_update(self):
+            # Ölçüm ağsız çalışır
+            pass
+
+    workdir = os.path.join(folder, "app")
+    target = os.path.join(folder, "indirilenler")
+    os.makedirs(workdir)
+    os.makedirs(target)
+    cwd = os.getcwd()
+    # Ayarlar, geçmiş, önbellek ve iş veritabanı geçici klasöre yazılır
+    os.chdir(workdir)
+    try:
+        app = BenchApp()
+        # GitHub logosu indirilmesin
+        app.github_logo.setPixmap(QPixmap(22, 22))
+        app.path_input.setText(target)
+        app.show()
+        # Ertelenmiş açılış işleri (yarım iş sorusu vb.) ölçümden önce bitsin
+        QApplication.processEvents()
+        template = app._make_job("")
+        layouts = ("progressive", "hls")
+        jobs = [
+            template.with_url(server.watch_url(layouts[i % 2], args.batch_mb * MB, f"g{i}"))
+            for i in range(args.batch_jobs)
+        ]
+        fetches = {"left": args.runs * 2}
+
+        def next_fetch(*_):
+            # Önceki bilgi iş parçacığı bitmeden yenisi başlatılmaz
+            if fetches["left"] <= 0:
+                return
+            fetches["left"] -= 1
+            app.url_input.setText(server.watch_url("progressive", MB, f"gi{fetches['left']}"))
+            app.fetch_video_info()
+            app.info_thread.finished.connect(lambda: QTimer.singleShot(50, next_fetch))
+
+        meter = StallMeter()
+        meter.start()
+        started = time.perf_counter()
+        QTimer.singleShot(0, next_fetch)
+        wait_signal(app.scheduler.all_done, lambda: app._submit_batch(jobs, "Karşılaştırma"))
+        elapsed = time.perf_counter() - started
+        meter.stop()
+        fetches["left"] = 0
+        for thread in [*app.info_threads, *app.thumb_threads]:
+            thread.wait()
+        app.close()
+        app.job_store.close()
+    finally:
+        # Uygulama zamanlama kaydını göreli yola açtı; geçici klasör dışına yazılmasın
+        METRICS.configure()
+        os.chdir(cwd)
+
+    lateness = sorted(meter.lateness)
+    p99 = lateness[int(len(lateness) * 0.99)] if lateness else 0.0
+    results.add("gui.p99_stall_ms", p99 * 1000, "ms", detail=f"{len(lateness)} örnek, {elapsed:.1f} sn")
+    results.add("gui.max_stall_ms", (lateness[-1] if lateness else 0.0) * 1000, "ms")
+    results.add("gui.stalls_over_50ms", sum(1 for v in lateness if v > 0.05), "adet")
+
+
+def thumbnail_png():
+    from PyQt5.QtCore import QBuffer, QByteArray, QIODevice
+
+    image = QImage(320, 180, QImage.Format_RGB32)
+    image.fill(0x3260A8)
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(data)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--only", nargs="+", choices=BENCHES, default=list(BENCHES))
+    parser.add_argument("--runs", type=int, default=3, help="Ölçüm başına tekrar")
+    parser.add_argument("--size-mb", type=int, default=16, help="download ölçümündeki dosya boyutu")
+    parser.add_argument("--connections", type=int, default=4, help="Dosya başına bağlantı")
+    parser.add_argument("--batch-jobs", type=int, default=8)
+    parser.add_argument("--batch-mb", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--rate-mb", type=float, default=8.0,
+                        help="Bağlantı başına hız sınırı, MB/s (0 = sınırsız)")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Bilgi/manifest isteği gecikmesi")
+    parser.add_argument("--media-seconds", type=int, default=30, help="postprocess kaynağının süresi")
+    parser.add_argument("--json", help="Sonuçları bu dosyaya yaz")
+    parser.add_argument("--compare", help="Temel sonuç dosyası")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    qt_app = QApplication(sys.argv[:1])  # noqa: F841
+    install()
+    has_ffmpeg = shutil.which("ffmpeg") is not None
+    blob = os.urandom(max(args.size_mb, args.batch_mb, 1) * MB)
+    server = MediaServer(
+        blob, args.rate_mb * MB if args.rate_mb > 0 else None, args.latency_ms / 1000, thumbnail_png()
+    ).start()
+    results = Results()
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            for name in args.only:
+                work = os.path.join(folder, name)
+                os.makedirs(work)
+                if name == "info":
+                    bench_info(server, args, results, work)
+                elif name == "download":
+                    bench_download(server, args, results, work, has_ffmpeg)
+                elif name == "postprocess":
+                    if not has_ffmpeg:
+                        print("postprocess: ffmpeg bulunamadı, atlandı", flush=True)
+                        continue
+                    bench_postprocess(args, results, work)
+                elif name == "batch":
+                    bench_batch(server, args, results, work)
+                elif name == "gui":
+                    bench_gui(server, args, results, work)
+    finally:
+        server.stop()
+
+    if args.json:
+        results.save(args.json)
+    if args.compare:
+        regressions = results.compare(args.compare, args.tolerance)
+        for line in regressions:
+            print(f"GERİLEME {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
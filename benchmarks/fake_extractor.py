@@ -0,0 +1,70 @@
+"""mediaserver için yt-dlp çıkarıcısı: gerçek bir siteye gitmeden tam çözümleme yolu.
+
+install() çağrıldıktan sonra oluşturulan her YoutubeDL (uygulamanın kendi
+iş parçacıkları dahil) `http://127.0.0.1:<port>/watch/<id>` adreslerini
+bu çıkarıcıyla çözer. Formatlar uygulamanın format dizgeleriyle
+(bestvideo[ext=mp4][vcodec^=avc1]+bestaudio[ext=m4a] vb.) eşleşir.
+"""
+import re
+
+from yt_dlp.extractor.common import InfoExtractor
+
+
+class BenchIE(InfoExtractor):
+    IE_NAME = "bench"
+    _VALID_URL = r"https?://(?:127\.0\.0\.1|localhost):\d+/watch/(?P<id>[\w-]+)"
+
+    def _real_extract(self, url):
+        video_id = self._match_id(url)
+        base = re.match(r"https?://[^/]+", url).group(0)
+        meta = self._download_json(f"{base}/api/{video_id}.json", video_id)
+        layout = meta["layout"]
+
+        if layout == "progressive":
+            formats = [{
+                "format_id": "18",
+                "url": f"{base}/media/{video_id}/progressive.mp4",
+                "ext": "mp4",
+                "vcodec": "avc1.42001E",
+                "acodec": "mp4a.40.2",
+                "height": 720,
+                "filesize": meta["size"],
+            }]
+        elif layout == "dash":
+            formats = []
+            for kind, fields in (
+                ("video", {"format_id": "137", "ext": "mp4", "vcodec": "avc1.640028", "acodec": "none",
+                           "height": 1080}),
+                ("audio", {"format_id": "140", "ext": "m4a", "vcodec": "none", "acodec": "mp4a.40.2"}),
+            ):
+                fragment_base = f"{base}/dash/{video_id}/{kind}/"
+                formats.append({
+                    **fields,
+                    "url": fragment_base,
+                    "protocol": "http_dash_segments",
+                    "fragment_base_url": fragment_base,
+                    "fragments": [{"path": f"seg-{i}.m4s"} for i in range(meta["segments"][kind])],
+                })
+        else:
+            formats = self._extract_m3u8_formats(
+                f"{base}/hls/{video_id}/master.m3u8", video_id, "mp4", "m3u8_native", m3u8_id="hls"
+            )
+
+        return {
+            "id": video_id,
+            "title": meta["title"],
+            "uploader": "easyytd karşılaştırma",
+            "duration": meta["duration"],
+            "thumbnail": meta.get("thumbnail"),
+            "formats": formats,
+        }
+
+
+def install():
+    # Varsayılan çıkarıcı listesinin başına eklenir; eklentiler yüklense de yerinde kalır
+    from yt_dlp.extractor import import_extractors
+    from yt_dlp.globals import extractors
+
+    import_extractors()
+    if "BenchIE" not in extractors.value:
+        extractors.value = {"BenchIE": BenchIE, **extractors.value}
@@ -0,0 +1,194 @@
+"""Karşılaştırmalar için yerel, ağ gerektirmeyen sahte medya sunucusu.
+
+Video kimliği düzeni taşır: `<düzen>-<KB>-<ad>`, ör. `dash-8192-a1`.
+    /api/<id>.json                 sahte çıkarıcının okuduğu bilgi (gecikmeli)
+    /media/<id>/progressive.mp4    tek dosya (Range destekli)
+    /dash/<id>/<video|audio>/seg-<i>.m4s
+    /hls/<id>/master.m3u8, /hls/<id>/media.m3u8, /hls/<id>/seg-<i>.ts
+    /thumb/<id>.png                verilmişse küçük resim
+İçerik rastgele baytlardır; yalnızca ağ ve disk yolunu ölçer.
+"""
+import re
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SEGMENT = 1024 * 1024
+SEGMENT_SECONDS = 4
+# DASH'te görüntü/ses bayt oranı
+VIDEO_SHARE = 0.85
+_ID_RE = re.compile(r"(?P<layout>progressive|dash|hls)-(?P<kb>\d+)-[\w]+")
+
+
+def video_id(layout, size, name):
+    return f"{layout}-{size // 1024}-{name}"
+
+
+def parse_id(vid):
+    m = _ID_RE.fullmatch(vid)
+    if not m:
+        return None, 0
+    return m.group("layout"), int(m.group("kb")) * 1024
+
+
+def segment_sizes(size):
+    return [min(SEGMENT, size - start) for start in range(0, size, SEGMENT)]
+
+
+def dash_sizes(size):
+    video = int(size * VIDEO_SHARE)
+    return {"video": video, "audio": size - video}
+
+
+def serve_range(handler, payload, rate=None, content_type="application/octet-stream"):
+    """`payload`'u Range başlığına göre gönderir; `rate` bayt/sn bağlantı başına sınırdır."""
+    total = len(payload)
+    m = re.match(r"bytes=(\d+)-(\d*)", handler.headers.get("Range") or "")
+    if m:
+        start = int(m.group(1))
+        end = min(int(m.group(2)) if m.group(2) else total - 1, total - 1)
+        handler.send_response(206)
+        handler.send_header("Content-Range", f"bytes {start}-{end}/{total}")
+    else:
+        start, end = 0, total - 1
+        handler.send_response(200)
+    handler.send_header("Content-Type", content_type)
+    handler.send_header("Accept-Ranges", "bytes")
+    handler.send_header("Content-Length", str(end - start + 1))
+    handler.end_headers()
+    if handler.command == "HEAD":
+        return
+    # Bağlantı başına hız sınırı: 64 KB'lık bloklar arasında bekle
+    block = 64 * 1024
+    began = time.monotonic()
+    sent = 0
+    pos = start
+    try:
+        while pos <= end:
+            data = payload[pos:min(pos + block, end + 1)]
+            handler.wfile.write(data)
+            pos += len(data)
+            sent += len(data)
+            if rate:
+                delay = sent / rate - (time.monotonic() - began)
+                if delay > 0:
+                    time.sleep(delay)
+    except (BrokenPipeError, ConnectionResetError):
+        pass
+
+
+class MediaServer:
+    """`blob` içinden dilimlenen sahte medya dosyalarını 127.0.0.1'de sunar.
+
+    `rate`: bağlantı başına bayt/sn (None = sınırsız),
+    `latency`: bilgi ve manifest isteklerine eklenen gecikme (sn).
+    """
+
+    def __init__(self, blob, rate=None, latency=0.0, thumbnail=None):
+        self.blob = memoryview(blob)
+        self.rate = rate
+        self.latency = latency
+        self.thumbnail = thumbnail
+        self._server = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def watch_url(self, layout, size, name):
+        return f"{self.base_url}/watch/{video_id(layout, size, name)}"
+
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _info(self, vid):
+        layout, size = parse_id(vid)
+        return {
+            "id": vid,
+            "title": f"Karşılaştırma {vid}",
+            "layout": layout,
+            "size": size,
+            "duration": max(1, size // (256 * 1024)),
+            "segments": {kind: len(segment_sizes(n)) for kind, n in dash_sizes(size).items()}
+            if layout == "dash" else len(segment_sizes(size)),
+            "thumbnail": f"{self.base_url}/thumb/{vid}.png" if self.thumbnail else None,
+        }
+
+    def _route(self, path):
+        # (gövde, içerik türü, gecikmeli mi) veya None
+        m = re.fullmatch(r"/api/([\w-]+)\.json", path)
+        if m and parse_id(m.group(1))[0]:
+            return json.dumps(self._info(m.group(1))).encode(), "application/json", True
+        m = re.fullmatch(r"/media/([\w-]+)/progressive\.mp4", path)
+        if m and parse_id(m.group(1))[0] == "progressive":
+            return self.blob[:parse_id(m.group(1))[1]], "video/mp4", False
+        m = re.fullmatch(r"/dash/([\w-]+)/(video|audio)/seg-(\d+)\.m4s", path)
+        if m and parse_id(m.group(1))[0] == "dash":
+            size = dash_sizes(parse_id(m.group(1))[1])[m.group(2)]
+            return self._segment(size, int(m.group(3))), "video/iso.segment", False
+        m = re.fullmatch(r"/hls/([\w-]+)/(master\.m3u8|media\.m3u8|seg-(\d+)\.ts)", path)
+        if m and parse_id(m.group(1))[0] == "hls":
+            size = parse_id(m.group(1))[1]
+            if m.group(3) is not None:
+                return self._segment(size, int(m.group(3))), "video/mp2t", False
+            if m.group(2) == "master.m3u8":
+                body = (
+                    "#EXTM3U\n"
+                    '#EXT-X-STREAM-INF:BANDWIDTH=2000000,RESOLUTION=1280x720,CODECS="avc1.4d401f,mp4a.40.2"\n'
+                    "media.m3u8\n"
+                )
+            else:
+                body = f"#EXTM3U\n#EXT-X-VERSION:3\n#EXT-X-TARGETDURATION:{SEGMENT_SECONDS}\n#EXT-X-MEDIA-SEQUENCE:0\n"
+                for i in range(len(segment_sizes(size))):
+                    body += f"#EXTINF:{SEGMENT_SECONDS}.0,\nseg-{i}.ts\n"
+                body += "#EXT-X-ENDLIST\n"
+            return body.encode(), "application/vnd.apple.mpegurl", True
+        m = re.fullmatch(r"/thumb/([\w-]+)\.png", path)
+        if m and self.thumbnail:
+            return self.thumbnail, "image/png", False
+        return None
+
+    def _segment(self, size, index):
+        start = index * SEGMENT
+        if start >= size:
+            return None
+        return self.blob[start:min(start + SEGMENT, size)]
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                route = server._route(self.path.split("?", 1)[0])
+                if not route or route[0] is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body, content_type, delayed = route
+                if delayed and server.latency:
+                    time.sleep(server.latency)
+                serve_range(self, body, None if delayed else server.rate, content_type)
+
+            do_HEAD = do_GET
+
+        return Handler
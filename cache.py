@@ -0,0 +1,188 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+from utils import canonical_id
+from videoinfo import VideoInfo
+
+# Arayüzde ve indirmede kullanılmayan, bilgi sözlüğünü şişiren alanlar
+PRUNED_KEYS = ("thumbnails", "heatmap", "storyboards", "_version", "__post_extractor")
+# İmzalı akış bağlantılarında son kullanma zamanı (?expire=.. veya /expire/../)
+_EXPIRE_RE = re.compile(r"[?&/]expire[=/](\d{9,11})")
+# Bağlantı süresi dolmadan bu kadar saniye önce girdiyi bayat say
+EXPIRE_MARGIN = 300
+
+
+def prune_info(info):
+    pruned = {k: v for k, v in info.items() if k not in PRUNED_KEYS}
+    formats = pruned.get("formats")
+    if formats:
+        pruned["formats"] = [
+            f for f in formats
+            if isinstance(f, dict) and f.get("ext") != "mhtml"
+        ]
+    return pruned
+
+
+def url_expiry(info):
+    expiries = []
+    for f in info.get("formats") or []:
+        for key in ("url", "manifest_url"):
+            m = _EXPIRE_RE.search(f.get(key) or "")
+            if m:
+                expiries.append(int(m.group(1)))
+    return min(expiries) if expiries else None
+
+
+class MetadataCache:
+    """Video bilgilerini kanonik ID ile diskte saklar (TTL + boyut sınırı + LRU).
+
+    Her video için iki dosya: arayüzün kullandığı küçük VideoInfo kaydı ve
+    indirmede yeniden çözümlemeyi önleyen budanmış tam bilgi (`.info.json`).
+    Tam bilgi yalnızca indirme iş parçacığında, get_info() ile okunur.
+    """
+
+    def __init__(self, folder, ttl=3600, max_bytes=50 * 1024 * 1024):
+        self.folder = folder
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+
+    def _path(self, url, suffix=".json"):
+        key = canonical_id(url)
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.folder, name + suffix)
+
+    def _read(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() >= entry.get("expires", 0):
+            self._remove(path)
+            return None
+        try:
+            # LRU için son erişim zamanı
+            os.utime(path, None)
+        except OSError:
+            pass
+        return entry
+
+    def _write(self, path, entry):
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except OSError:
+            self._remove(tmp)
+            return False
+        return True
+
+    def get(self, url):
+        entry = self._read(self._path(url))
+        if not entry or "record" not in entry:
+            return None
+        return VideoInfo.from_dict(entry["record"])
+
+    def get_info(self, url):
+        entry = self._read(self._path(url, ".info.json"))
+        return entry["info"] if entry else None
+
+    def put(self, url, info, record):
+        import yt_dlp
+
+        info = prune_info(yt_dlp.YoutubeDL.sanitize_info(info, True))
+        now = time.time()
+        expires = now + self.ttl
+        stream_expiry = url_expiry(info)
+        if stream_expiry:
+            expires = min(expires, stream_expiry - EXPIRE_MARGIN)
+        if expires <= now:
+            return
+        base = {"id": canonical_id(url), "created": now, "expires": expires}
+        # Önce tam bilgi: kayıt varsa tam bilgi de vardır
+        if not self._write(self._path(url, ".info.json"), {**base, "info": info}):
+            return
+        if not self._write(self._path(url), {**base, "record": record.to_dict()}):
+            return
+        self.evict()
+
+    def evict(self):
+        with self._lock:
+            now = time.time()
+            entries = []
+            total = 0
+            for e in os.scandir(self.folder):
+                if not e.name.endswith(".json"):
+                    continue
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                # TTL'den eski dosyalar, okunmasa bile silinir
+                if now - st.st_mtime > self.ttl:
+                    self._remove(e.path)
+                    continue
+                entries.append((st.st_mtime, st.st_size, e.path))
+                total += st.st_size
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+
+    def clear(self):
+        for e in os.scandir(self.folder):
+            if e.name.endswith(".json"):
+                self._remove(e.path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class RecordCache:
+    """Oturum içi küçük LRU önbellek: kanonik ID -> VideoInfo.
+
+    Yapıştırma/yazma sırasında önceden alınan bilgiler burada tutulur; aynı
+    video farklı URL biçimleriyle (youtu.be, watch?v=..&t=..) tek kayıttır.
+    Yalnızca arayüz iş parçacığından kullanılır.
+    """
+
+    def __init__(self, max_items=16, ttl=600):
+        self.max_items = max_items
+        self.ttl = ttl
+        self._items = OrderedDict()
+
+    def get(self, url):
+        key = canonical_id(url)
+        entry = self._items.get(key)
+        if entry is None:
+            return None
+        created, record = entry
+        if time.time() - created > self.ttl:
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return record
+
+    def put(self, url, record):
+        key = canonical_id(url)
+        self._items[key] = (time.time(), record)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        self._items.clear()
@@ -0,0 +1,31 @@
+import os
+import glob
+
+import yt_dlp
+
+# İndirici türlerine göre yarım dosyanın yanında kalan durum dosyaları
+_SIDECARS = ('.part', '.ytdl', '.segments', '.part.segments')
+
+
+class JobStopped(yt_dlp.utils.DownloadCancelled):
+    """CancelToken isteğiyle durdurulan iş.
+
+    yt-dlp DownloadCancelled'ı hata olarak raporlamadan yukarı taşır;
+    ilerleme kancasından fırlatılınca indirme o anda bırakılır.
+    """
+
+    def __init__(self, reason):
+        self.reason = reason
+        super().__init__("İndirme duraklatıldı." if reason == "pause" else "İndirme iptal edildi.")
+
+
+def remove_partials(paths):
+    # İptal edilen işin yarım dosyaları: .part, parça (-FragN) ve durum dosyaları
+    for path in paths:
+        candidates = [path] + [path + suffix for suffix in _SIDECARS]
+        candidates += glob.glob(glob.escape(path) + '*-Frag*')
+        for candidate in candidates:
+            try:
+                os.remove(candidate)
+            except OSError:
+                pass
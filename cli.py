@@ -0,0 +1,177 @@
+import os
+import sys
+import time
+import argparse
+import threading
+
+from engine import CLIP_MODES, run_batch
+from jobs import DownloadJob
+from importer import import_urls, describe
+from jobstore import JobStore, BatchFeed
+from metrics import METRICS
+from postprocess import AUDIO_STATS
+from settings import load_settings, JOBS_DB, METRICS_FILE
+from utils import format_bytes
+
+DOWNLOAD_TYPES = {
+    "normal": "Birleştir (Normal)",
+    "video": "Sadece Görüntü",
+    "audio": "Sadece Ses",
+    "split": "Ayrı Ayrı (Ses + Video)",
+}
+SUB_LANGS = {
+    "auto": "Otomatik",
+    "tr": "Türkçe",
+    "en": "İngilizce",
+    "all": "Tüm Diller",
+}
+
+
+def build_parser(settings):
+    p = argparse.ArgumentParser(
+        prog="easyytd download",
+        description="easyytd indirme motorunu arayüz olmadan çalıştırır."
+    )
+    p.add_argument("urls", nargs="*", help="İndirilecek URL'ler")
+    p.add_argument("-i", "--input", action="append", default=[],
+                   help="URL listesi: metin, .csv/.tsv veya JSONL ('-' = stdin); birden çok kez verilebilir")
+    p.add_argument("-o", "--output", default=settings.get("default_download_path", os.path.expanduser("~")),
+                   help="Kayıt klasörü")
+    p.add_argument("-f", "--format", default=settings.get("default_format", "mp4"),
+                   choices=["mp3", "mp4", "webm", "mkv"])
+    p.add_argument("-q", "--quality", default="best",
+                   help="Çözünürlük, ör. '1080p' veya 'best'")
+    p.add_argument("-t", "--type", default="normal", choices=list(DOWNLOAD_TYPES))
+    p.add_argument("--playlist", action="store_true", help="Tüm oynatma listesini indir")
+    p.add_argument("--sync", action="store_true",
+                   help="Playlist/kanalda yalnızca daha önce indirilmemiş videoları indir")
+    p.add_argument("--subs", nargs="?", const="auto", choices=list(SUB_LANGS),
+                   help="Altyazı indir (dil: auto, tr, en, all)")
+    p.add_argument("--clip", nargs=2, metavar=("BAŞLANGIÇ", "BİTİŞ"),
+                   help="Yalnızca bu aralığı indir (ss:dd:sn); bitiş için '' verilebilir")
+    p.add_argument("--clip-mode", default="fast", choices=list(CLIP_MODES.values()))
+    p.add_argument("-j", "--jobs", type=int, default=settings.get("max_concurrent_downloads", 3),
+                   help="Eşzamanlı indirme sayısı")
+    p.add_argument("--per-host", type=int, default=settings.get("per_host_limit", 2),
+                   help="Site başına eşzamanlı indirme sınırı")
+    p.add_argument("-N", "--connections", type=int, default=settings.get("connections_per_file", 4),
+                   help="Dosya başına paralel bağlantı (1 = parçalı indirme kapalı)")
+    p.add_argument("--resume", action="store_true",
+                   help="Önceki çalıştırmada yarım kalan işlere kaldığı yerden devam et")
+    p.add_argument("--metrics", default=METRICS_FILE if settings.get("metrics_log", True) else "",
+                   help="Zamanlama span'lerinin JSON satırları olarak ekleneceği dosya ('' = kapalı)")
+    p.add_argument("--metrics-textfile", default=settings.get("metrics_textfile", ""),
+                   help="Toplamların yazılacağı Prometheus textfile yolu")
+    p.add_argument("--quiet", action="store_true", help="İlerleme satırlarını yazma")
+    return p
+
+
+def main(argv=None):
+    settings = load_settings()
+    args = build_parser(settings).parse_args(argv)
+    if not os.path.isdir(args.output):
+        print(f"Kayıt klasörü bulunamadı: {args.output}", file=sys.stderr)
+        return 2
+
+    quality = args.quality
+    if quality != "best" and not quality.endswith("]"):
+        # DownloadTask, GUI'deki "1080p (.. MB) [mp4]" biçimini bekler
+        quality = f"{quality.rstrip('p')}p [{args.format if args.format != 'mp3' else 'mp4'}]"
+    clip_start, clip_end = args.clip or ("", "")
+    if args.sync:
+        args.playlist = True
+    template = DownloadJob(
+        "", args.output, args.format, quality, args.playlist, DOWNLOAD_TYPES[args.type],
+        bool(args.subs), SUB_LANGS[args.subs or "auto"],
+        bool(args.clip), clip_start, clip_end, args.clip_mode, args.sync
+    )
+    METRICS.configure(args.metrics, args.metrics_textfile)
+    store = JobStore(JOBS_DB)
+    jobs = store.unfinished() if args.resume else []
+    feeds = [BatchFeed(store, batch) for batch, _ in store.queued_batches()] if args.resume else []
+    jobs += store.add_many([template.with_url(url.strip()) for url in args.urls if url.strip()])
+    if args.input:
+        last = [0.0]
+
+        def on_imported(stats):
+            now = time.monotonic()
+            if args.quiet or now - last[0] < 1.0:
+                return
+            last[0] = now
+            percent = f" (%{100 * stats['bytes'] // stats['size']})" if stats["size"] else ""
+            print(f"İçe aktarılıyor: {stats['lines']} satır{percent}", file=sys.stderr)
+
+        try:
+            batch, stats = import_urls(store, template, args.input, on_progress=on_imported)
+        except OSError as e:
+            store.close()
+            print(f"Liste okunamadı: {e}", file=sys.stderr)
+            return 2
+        except KeyboardInterrupt:
+            # Yazılmış parçalar kuyrukta kalır
+            store.close()
+            print("Durduruldu; aktarılan URL'ler --resume ile indirilir.", file=sys.stderr)
+            return 130
+        print(f"İçe aktarıldı: {describe(stats)}", file=sys.stderr)
+        if stats["queued"] and not args.resume:
+            print("Kuyrukta bekleyen işler için --resume kullanın.", file=sys.stderr)
+        if stats["added"]:
+            feeds.append(BatchFeed(store, batch))
+    if not jobs and not feeds:
+        print("İndirilecek URL yok.", file=sys.stderr)
+        return 2
+
+    lock = threading.Lock()
+    trackers = {}
+    # Playlist girdileri bulundukça toplam artar
+    state = {"done": 0, "failed": 0, "total": 0, "last": 0.0}
+
+    def on_added(new_jobs):
+        with lock:
+            state["total"] += len(new_jobs)
+
+    def on_progress(job, tracker):
+        if args.quiet:
+            return
+        with lock:
+            trackers[job.id] = tracker
+            now = time.monotonic()
+            if now - state["last"] < 1.0:
+                return
+            state["last"] = now
+            done = sum(t.downloaded for t in trackers.values())
+            speed = sum(t.speed() for t in trackers.values())
+            print(
+                f"[{state['done']}/{state['total']}] {len(trackers)} aktif | "
+                f"{format_bytes(done)} | {format_bytes(speed)}/s",
+                file=sys.stderr
+            )
+
+    def on_done(job, files, title, error):
+        with lock:
+            trackers.pop(job.id, None)
+            if job.cancel_token.reason == "pause":
+                # Ctrl+C: yarım dosya korundu, iş --resume ile devam eder
+                print(f"DURAKLATILDI\t{job.url}", flush=True)
+                return
+            state["done"] += 1
+            if error:
+                state["failed"] += 1
+                print(f"HATA\t{job.url}\t{error}", flush=True)
+            else:
+                print(f"OK\t{job.url}\t{' ; '.join(files)}", flush=True)
+
+    try:
+        run_batch(jobs, args.jobs, args.per_host, on_done, on_progress, settings.get("progress_emit_hz", 4), store,
+                  on_added, args.connections, feeds)
+    except KeyboardInterrupt:
+        store.close()
+        print("Durduruldu; yarım kalan indirmeler --resume ile devam eder.", file=sys.stderr)
+        return 130
+    store.close()
+    print(f"Tamamlandı: {state['done'] - state['failed']}/{state['total']} başarılı", file=sys.stderr)
+    if AUDIO_STATS.summary():
+        print(AUDIO_STATS.summary(), file=sys.stderr)
+    if METRICS.summary():
+        print(METRICS.summary(), file=sys.stderr)
+    return 1 if state["failed"] else 0
@@ -1,330 +1,133 @@
-import os
-import time
-import subprocess
 from PyQt5.QtCore import QThread, pyqtSignal
-import yt_dlp
 
-SUBTITLE_LANGS = {
-    "Otomatik": None,
-    "Türkçe": ["tr"],
-    "İngilizce": ["en"],
-    "Tüm Diller": ["all"]
-}
+from engine import DownloadTask, expand_playlist, fetch_info, resolve_batch
+from postprocess import postprocess_pool
+
 
 class InfoFetchThread(QThread):
+    # VideoInfo, formatlar, kaliteler
     info_ready = pyqtSignal(object, list, list)
     error = pyqtSignal(str)
 
-    def __init__(self, url):
+    def __init__(self, url, cache=None):
         super().__init__()
         self.url = url
+        self.cache = cache
 
     def run(self):
+        # terminate() yerine: zaman aşımında requestInterruption() çağrılır, istek
+        # soket zaman aşımıyla kendiliğinden biter ve sonucu yayınlanmaz
         try:
-            ydl_opts = {'quiet': True, 'skip_download': True, 'noplaylist': True}
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(self.url, download=False)
-
-            if not info:
+            record = fetch_info(self.url, self.cache)
+            if self.isInterruptionRequested():
+                return
+            if not record:
                 self.error.emit("Video bilgisi alınamadı veya bağlantı desteklenmiyor.")
                 return
+            self.info_ready.emit(record, record.format_exts(), record.quality_labels())
+        except Exception as e:
+            if not self.isInterruptionRequested():
+                self.error.emit(f"Video bilgisi alınamadı: {e}")
 
-            formats = set()
-            qualities = []
-            seen = set()
-
-            fmt_list = info.get('formats') or []
-            for f in fmt_list:
-                # Bazı durumlarda yt-dlp format listesine None koyabiliyor -> koruma
-                if not f or not isinstance(f, dict):
-                    continue
 
-                if f.get('vcodec') != 'none':
-                    ext = f.get('ext')
-                    height = f.get('height')
-                    filesize = f.get('filesize_approx') or f.get('filesize') or 0
-                    if ext in ('mp4', 'webm', 'mkv') and height and (height, ext) not in seen:
-                        mb = f"{round(filesize/1024/1024)} MB" if filesize else "?? MB"
-                        qualities.append((height, ext, mb))
-                        seen.add((height, ext))
-                    if ext:
-                        formats.add(ext)
+class BatchResolveThread(QThread):
+    """Çoklu bağlantı kutusundaki linkleri indirmeden önce çözer (bkz. resolve_batch)."""
 
-            formats.add('mp3')
-            qualities = sorted(qualities, key=lambda x: int(x[0]), reverse=True)
-            qualities_str = [f"{q[0]}p ({q[2]}) [{q[1]}]" for q in qualities]
+    # çözümlenen, toplam
+    progress = pyqtSignal(int, int)
+    # [(url, VideoInfo)], [(url, hata)], [(url, ilk url)]
+    resolved = pyqtSignal(list, list, list)
 
-            if not qualities_str:
-                qualities_str = ["best"]
+    def __init__(self, urls, cache=None):
+        super().__init__()
+        self.urls = urls
+        self.cache = cache
 
-            formats = sorted(
-                list(formats),
-                key=lambda x: ('mp3', 'mp4', 'webm', 'mkv').index(x)
-                if x in ('mp3', 'mp4', 'webm', 'mkv') else 99
-            )
+    def run(self):
+        result = resolve_batch(
+            self.urls, self.cache, on_progress=self.progress.emit, should_stop=self.isInterruptionRequested
+        )
+        if not self.isInterruptionRequested():
+            self.resolved.emit(*result)
 
-            self.info_ready.emit(info, formats, qualities_str)
-        except Exception as e:
-            self.error.emit(f"Video bilgisi alınamadı: {e}")
 
+class ImportThread(QThread):
+    """URL listesi dosyalarını ya da büyük yapıştırmaları JobStore'a aktarır (bkz. import_urls)."""
 
-class DownloadThread(QThread):
-    progress = pyqtSignal(int)
-    done = pyqtSignal(str, str, str)
-    speed_eta = pyqtSignal(float, int)
+    # okunan satır, okunan bayt, toplam bayt
+    progress = pyqtSignal(int, int, int)
+    # grup (iptalde None), istatistikler
+    imported = pyqtSignal(object, dict)
+    error = pyqtSignal(str)
 
-    def __init__(
-        self, url, download_path, fmt, quality, is_playlist, download_type, subtitle, sub_lang,
-        clip_enabled=False, clip_start="", clip_end=""
-    ):
+    def __init__(self, store, template, paths=(), text=""):
         super().__init__()
-        self.url = url
-        self.download_path = download_path
-        self.fmt = fmt
-        self.quality = quality
-        self.is_playlist = is_playlist
-        self.download_type = download_type
-        self.subtitle = subtitle
-        self.sub_lang = sub_lang
-        self.clip_enabled = clip_enabled
-        self.clip_start = clip_start
-        self.clip_end = clip_end
+        self.store = store
+        self.template = template
+        self.paths = paths
+        self.text = text
 
     def run(self):
-        ydl_opts = {
-            'outtmpl': os.path.join(self.download_path, '%(title)s.%(ext)s'),
-            'progress_hooks': [self.my_hook],
-            # ignoreerrors sadece playlist indirirken işe yarasın, tek videoda None dönmesin
-            'ignoreerrors': bool(self.is_playlist),
-            'no-mtime': True
-        }
-
-        if not self.is_playlist:
-            ydl_opts['noplaylist'] = True
-
-        if self.subtitle:
-            ydl_opts['writesubtitles'] = True
-            ydl_opts['writeautomaticsub'] = True
-            if SUBTITLE_LANGS.get(self.sub_lang):
-                ydl_opts['subtitleslangs'] = SUBTITLE_LANGS[self.sub_lang]
-            ydl_opts['subtitlesformat'] = 'vtt'
+        from importer import import_urls
 
         try:
-            import re
-            m = re.match(r"(\d+)p.*\[(\w+)\]", self.quality)
-            ext = self.fmt
-            height = ""
-            if m:
-                height = m.group(1)
-                ext = m.group(2)
-            title = None
-            downloaded_file = None
-            info = None
-
-            def video_format_str():
-                if height:
-                    return f'bestvideo[ext=mp4][vcodec^=avc1][height={height}]+bestaudio[ext=m4a]/best[ext=mp4]'
-                else:
-                    return 'bestvideo[ext=mp4][vcodec^=avc1]+bestaudio[ext=m4a]/best[ext=mp4]'
-
-            def video_only_format_str():
-                if height:
-                    return f'bestvideo[ext=mp4][vcodec^=avc1][height={height}]'
-                else:
-                    return f'bestvideo[ext=mp4][vcodec^=avc1]'
-
-            def audio_only_format_str():
-                return 'bestaudio[ext=m4a]/bestaudio/best'
-
-            if self.download_type == "Birleştir (Normal)":
-                if self.fmt == 'mp3':
-                    ydl_opts.update({
-                        'format': 'bestaudio/best',
-                        'postprocessors': [{
-                            'key': 'FFmpegExtractAudio',
-                            'preferredcodec': 'mp3',
-                            'preferredquality': '192',
-                        }],
-                    })
-                else:
-                    ydl_opts['format'] = video_format_str()
-                    ydl_opts['postprocessors'] = [{
-                        'key': 'FFmpegVideoConvertor',
-                        'preferedformat': 'mp4'
-                    }]
-
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    info = ydl.extract_info(self.url)
-                    if not info or not isinstance(info, dict):
-                        raise Exception("Video bilgisi alınamadı. Link geçersiz, yasaklı veya desteklenmiyor.")
-                    title = info.get("title", "indirilen")
-
-                    for ext_ in ['mp3', 'mp4', 'webm', 'mkv']:
-                        file_ = os.path.join(self.download_path, f"{title}.{ext_}")
-                        if os.path.exists(file_):
-                            downloaded_file = file_
-                            break
-
-                if downloaded_file and downloaded_file.endswith(".mp4"):
-                    fixed_file = downloaded_file.replace(".mp4", "_fixed.mp4")
-                    try:
-                        subprocess.run(
-                            ["ffmpeg", "-y", "-i", downloaded_file, "-c", "copy", "-movflags", "faststart", fixed_file],
-                            check=True,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE
-                        )
-                        os.replace(fixed_file, downloaded_file)
-                    except Exception as e:
-                        print("FFmpeg ile remux hatası:", e)
-
-            elif self.download_type == "Sadece Görüntü":
-                ydl_opts['format'] = video_only_format_str()
-                ydl_opts.pop('postprocessors', None)
-
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    info = ydl.extract_info(self.url)
-                    if not info or not isinstance(info, dict):
-                        raise Exception("Video bilgisi alınamadı. Link geçersiz, yasaklı veya desteklenmiyor.")
-                    title = info.get("title", "indirilen")
-                    video_file = None
-                    for ext_ in ['mp4', 'webm', 'mkv']:
-                        file_ = os.path.join(self.download_path, f"{title}.{ext_}")
-                        if os.path.exists(file_):
-                            video_file = file_
-                            break
-
-                if video_file and video_file.endswith(".mp4"):
-                    fixed_file = video_file.replace(".mp4", "_fixed.mp4")
-                    try:
-                        subprocess.run(
-                            ["ffmpeg", "-y", "-i", video_file, "-c", "copy", "-movflags", "faststart", fixed_file],
-                            check=True,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE
-                        )
-                        os.replace(fixed_file, video_file)
-                    except Exception as e:
-                        print("FFmpeg ile remux hatası:", e)
-                downloaded_file = video_file
-
-            elif self.download_type == "Sadece Ses":
-                ydl_opts['format'] = audio_only_format_str()
-                ydl_opts['postprocessors'] = [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': '192',
-                }]
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    info = ydl.extract_info(self.url)
-                    if not info or not isinstance(info, dict):
-                        raise Exception("Ses bilgisi alınamadı. Link geçersiz, yasaklı veya desteklenmiyor.")
-                    title = info.get("title", "indirilen")
-                    file_ = os.path.join(self.download_path, f"{title}.mp3")
-                    if os.path.exists(file_):
-                        downloaded_file = file_
+            batch, stats = import_urls(
+                self.store, self.template, self.paths, self.text,
+                on_progress=lambda stats: self.progress.emit(stats["lines"], stats["bytes"], stats["size"]),
+                should_stop=self.isInterruptionRequested
+            )
+        except OSError as e:
+            self.error.emit(str(e))
+            return
+        self.imported.emit(batch, stats)
 
-            elif self.download_type == "Ayrı Ayrı (Ses + Video)":
-                # Video kısmı
-                ydl_opts_vid = ydl_opts.copy()
-                ydl_opts_vid['format'] = video_only_format_str()
-                ydl_opts_vid['outtmpl'] = os.path.join(self.download_path, '%(title)s_video.%(ext)s')
-                ydl_opts_vid.pop('postprocessors', None)
 
-                with yt_dlp.YoutubeDL(ydl_opts_vid) as ydl:
-                    info = ydl.extract_info(self.url)
-                    if not info or not isinstance(info, dict):
-                        raise Exception("Video bilgisi alınamadı. Link geçersiz, yasaklı veya desteklenmiyor.")
-                    title = info.get("title", "indirilen")
-                    video_file = None
-                    for ext_ in ['mp4', 'webm', 'mkv']:
-                        file_ = os.path.join(self.download_path, f"{title}_video.{ext_}")
-                        if os.path.exists(file_):
-                            video_file = file_
-                            break
+class PlaylistExpandThread(QThread):
+    # Bulunan girdilerden oluşturulan işler, gruplar halinde
+    entries_found = pyqtSignal(list)
+    error = pyqtSignal(str)
 
-                if video_file and video_file.endswith(".mp4"):
-                    fixed_file = video_file.replace(".mp4", "_fixed.mp4")
-                    try:
-                        subprocess.run(
-                            ["ffmpeg", "-y", "-i", video_file, "-c", "copy", "-movflags", "faststart", fixed_file],
-                            check=True,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE
-                        )
-                        os.replace(fixed_file, video_file)
-                    except Exception as e:
-                        print("FFmpeg ile remux hatası:", e)
+    def __init__(self, job, store=None):
+        super().__init__()
+        self.job = job
+        self.store = store
 
-                # Ses kısmı
-                ydl_opts_audio = ydl_opts.copy()
-                ydl_opts_audio['format'] = audio_only_format_str()
-                ydl_opts_audio['outtmpl'] = os.path.join(self.download_path, '%(title)s_audio.%(ext)s')
-                ydl_opts_audio.pop('postprocessors', None)
+    def run(self):
+        try:
+            for jobs in expand_playlist(self.job, self.store, self.isInterruptionRequested):
+                self.entries_found.emit(jobs)
+        except Exception as e:
+            self.error.emit(str(e))
 
-                with yt_dlp.YoutubeDL(ydl_opts_audio) as ydl:
-                    info = ydl.extract_info(self.url)
-                    if not info or not isinstance(info, dict):
-                        raise Exception("Ses bilgisi alınamadı. Link geçersiz, yasaklı veya desteklenmiyor.")
-                    title = info.get("title", "indirilen")
-                    audio_file = None
-                    for ext_ in ['mp3', 'm4a', 'webm']:
-                        file_ = os.path.join(self.download_path, f"{title}_audio.{ext_}")
-                        if os.path.exists(file_):
-                            audio_file = file_
-                            break
 
-                downloaded_file = f"{video_file or ''} ; {audio_file or ''}"
+class DownloadThread(QThread):
+    """DownloadTask'ı çalıştırır; `job.cancel_token` ile iptal edilebilir veya duraklatılabilir."""
 
-            # Dosya tarihini öne çek
-            self.set_files_to_now(self.download_path, ext)
-            output_file = downloaded_file
+    progress = pyqtSignal(int)
+    done = pyqtSignal(str, str, str)
+    speed_eta = pyqtSignal(float, int)
+    # indirilen bayt, toplam bayt, hız (toplu ilerleme için)
+    bytes_progress = pyqtSignal(float, float, float)
+    # Ağ aşaması bitti; son işlem havuzda sürerken yuva boşaltılabilir
+    downloaded = pyqtSignal()
 
-            # Klip kırpma aktifse
-            if self.clip_enabled and output_file and os.path.exists(output_file):
-                try:
-                    base, ext_ = os.path.splitext(output_file)
-                    clipped_file = f"{base}_clip{ext_}"
-                    ffmpeg_cmd = [
-                        "ffmpeg", "-y",
-                        "-i", output_file,
-                        "-ss", self.clip_start if self.clip_start else "00:00:00"
-                    ]
-                    if self.clip_end:
-                        ffmpeg_cmd += ["-to", self.clip_end]
-                    ffmpeg_cmd += ["-c", "copy", clipped_file]
-                    subprocess.run(ffmpeg_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                    downloaded_file = clipped_file
-                except Exception as e:
-                    print("Klip işlemi hatası:", e)
+    def __init__(self, job, info=None, progress_hz=4, store=None, connections=1, cache=None):
+        super().__init__()
+        self.job = job
+        self.task = DownloadTask(job, info, self._on_progress, progress_hz, store, connections, cache)
 
-            self.done.emit("İndirme tamamlandı!", downloaded_file or "", (title or "İndirilen"))
+    def run(self):
+        try:
+            steps, title = self.task.download()
+            self.downloaded.emit()
+            files = postprocess_pool().submit(self.task.postprocess, steps).result()
+            self.done.emit("İndirme tamamlandı!", " ; ".join(files), (title or "İndirilen"))
         except Exception as e:
-            self.done.emit(f"Hata: {str(e)}", "", "")
-
-    def my_hook(self, d):
-        # Ek güvenlik: yt-dlp bazen beklenmeyen tip gönderebilir
-        if not isinstance(d, dict):
-            return
+            from cancel import JobStopped
 
-        if d.get('status') == 'downloading':
-            percent = d.get('_percent_str', '0.0%').replace('%', '')
-            try:
-                self.progress.emit(int(float(percent)))
-            except Exception:
-                self.progress.emit(0)
-            speed = d.get('speed', 0)
-            eta = d.get('eta', 0)
-            self.speed_eta.emit(speed or 0, eta or 0)
-        elif d.get('status') == 'finished':
-            self.progress.emit(100)
+            self.done.emit(str(e) if isinstance(e, JobStopped) else f"Hata: {str(e)}", "", "")
 
-    def set_files_to_now(self, folder, ext):
-        now = time.time()
-        files = [os.path.join(folder, f) for f in os.listdir(folder) if f.lower().endswith(ext)]
-        if files:
-            last_file = max(files, key=os.path.getctime)
-            try:
-                os.utime(last_file, (now, now))
-            except Exception:
-                pass
+    def _on_progress(self, t):
+        self.progress.emit(t.percent())
+        self.speed_eta.emit(t.speed(), t.eta())
+        self.bytes_progress.emit(float(t.downloaded), float(t.total), t.speed())
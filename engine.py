@@ -0,0 +1,882 @@
+import os
+import re
+import time
+import threading
+import logging
+import importlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from jobs import JobQueue
+from jobstore import DownloadArchive
+from metrics import JobMetrics, file_size
+from postprocess import plan_audio, plan_postprocess, run_plan, postprocess_pool
+from progress import ProgressTracker
+from utils import canonical_id
+from videoinfo import VideoInfo
+from ydlpool import YDL_POOL
+
+SUBTITLE_LANGS = {
+    "Otomatik": None,
+    "Türkçe": ["tr"],
+    "İngilizce": ["en"],
+    "Tüm Diller": ["all"]
+}
+
+CLIP_MODES = {
+    "Hızlı (anahtar kare)": "fast",
+    "Hassas (kesimde yeniden kodla)": "accurate"
+}
+
+log = logging.getLogger(__name__)
+
+# Toplu bağlantılar indirmeden önce bu kadar eşzamanlı bilgi isteğiyle çözümlenir
+RESOLVE_WORKERS = 8
+# İçe aktarılan büyük gruplardan kuyrukta bekletilen en fazla iş
+FEED_WINDOW = 200
+
+
+def warm_up():
+    # yt_dlp ağır bir içe aktarma; pencere açıldıktan sonra arka planda yüklenir
+    threading.Thread(target=importlib.import_module, args=("yt_dlp",), daemon=True).start()
+
+
+def clip_range(clip_start, clip_end):
+    import yt_dlp
+
+    start = yt_dlp.utils.parse_duration(clip_start) if clip_start else 0
+    end = yt_dlp.utils.parse_duration(clip_end) if clip_end else float('inf')
+    if start is None or end is None or end <= start:
+        raise Exception("Geçersiz klip aralığı. Zamanları ss:dd:sn biçiminde giriniz.")
+    return start, end
+
+
+def resolve_and_download(ydl, url, info=None):
+    import yt_dlp
+
+    # Önceden çözülmüş bilgi varsa sayfa/oynatıcı isteklerini tekrarlamadan indir
+    if info:
+        try:
+            return ydl.process_ie_result(yt_dlp.YoutubeDL.sanitize_info(info, True), download=True)
+        except (yt_dlp.utils.DownloadError, yt_dlp.utils.ReExtractInfo):
+            # İmzalı akış bağlantılarının süresi dolmuş olabilir, baştan çöz
+            pass
+    return ydl.extract_info(url)
+
+
+def downloaded_items(info):
+    # yt-dlp'nin bildirdiği son dosya yolları
+    for dl in info.get('requested_downloads') or []:
+        path = dl.get('filepath')
+        if path and os.path.exists(path):
+            yield info, path
+
+
+def completed_entry(info):
+    # Son işlem için gerekenler; format/parça listeleri tutulmaz
+    entry = {k: info.get(k) for k in ('title', 'acodec', 'duration', 'section_start', 'section_end')}
+    entry['requested_formats'] = bool(info.get('requested_formats'))
+    entry['requested_downloads'] = [
+        {'filepath': dl.get('filepath')} for dl in info.get('requested_downloads') or []
+    ]
+    entry['requested_subtitles'] = {
+        lang: {'filepath': sub.get('filepath')}
+        for lang, sub in (info.get('requested_subtitles') or {}).items() if sub
+    }
+    return entry
+
+
+def info_hook(func):
+    """Eklendiği aşamada (`when`) her video için `func(info)` çağıran PostProcessor."""
+    from yt_dlp.postprocessor import PostProcessor
+
+    class InfoHook(PostProcessor):
+        def run(self, info):
+            func(info)
+            return [], info
+
+    return InfoHook()
+
+
+# Yeniden eskiye sıralı akışlar: kanal sekmeleri ve yüklemeler listesi (UU...)
+_NEWEST_FIRST = re.compile(
+    r"youtube\.com/(?:@[^/?#]+|channel/[^/?#]+|c/[^/?#]+|user/[^/?#]+)(?:/(?:videos|shorts|streams))?/?(?:[?#]|$)"
+    r"|[?&]list=UU"
+)
+
+
+def newest_first(url):
+    return bool(_NEWEST_FIRST.search(url or ""))
+
+
+def iter_playlist_entries(url, archive=None):
+    """Playlist/kanal girdilerinin URL'lerini sayfalar geldikçe üretir.
+
+    Girdiler çözülmez (extract_flat); `archive` verilirse arşivdekiler
+    atlanır. Yeniden eskiye sıralı akışlarda (kanal yüklemeleri) yeni
+    girdiler başta olduğundan arşivdeki ilk girdide durulur; sıradan
+    playlist'lerde yeni girdiler sona eklenir, tarama sonuna kadar sürer.
+    """
+    ydl_opts = {
+        'quiet': True,
+        'extract_flat': 'in_playlist',
+        'lazy_playlist': True,
+        'ignoreerrors': True,
+        'download_archive': archive,
+    }
+    with YDL_POOL.ydl(ydl_opts) as ydl:
+        result = ydl.extract_info(url, download=False, process=False)
+        yield from _flat_entries(ydl, result, url)
+
+
+def _flat_entries(ydl, result, url, depth=0):
+    # Kanal ana sayfası gibi yönlendirmeleri izle
+    while result and result.get('_type') in ('url', 'url_transparent') and depth < 5:
+        url = result['url']
+        result = ydl.extract_info(url, download=False, ie_key=result.get('ie_key'), process=False)
+        depth += 1
+    if not result:
+        return
+    if result.get('_type') != 'playlist':
+        # Tek video: playlist seçeneği açık olsa da olduğu gibi indir
+        yield result.get('webpage_url') or url
+        return
+    stop_at_archived = newest_first(url)
+    for entry in result.get('entries') or []:
+        if not entry:
+            continue
+        if ydl.in_download_archive(entry):
+            if stop_at_archived:
+                return
+            continue
+        entry_url = entry.get('url') or entry.get('webpage_url')
+        if not entry_url:
+            continue
+        ie = ydl.get_info_extractor(entry['ie_key']) if entry.get('ie_key') else None
+        if entry.get('_type') == 'playlist' or (ie and ie.is_single_video(entry_url) is False):
+            # Kanal sekmeleri gibi iç içe listeler; 'url' girdileri yukarıdaki döngüde izlenir
+            if depth < 5:
+                yield from _flat_entries(ydl, entry, entry_url, depth + 1)
+            continue
+        yield entry_url
+
+
+def expand_playlist(job, store=None, should_stop=None, interval=0.5):
+    """Playlist işini, girdiler bulundukça tekil işlere açar.
+
+    İş listeleri üretir: ilk girdi hemen, sonrakiler `interval` saniyelik
+    gruplar halinde; böylece indirme, tarama bitmeden başlar. `store`
+    verilirse girdiler playlist işine bağlı olarak, tarama imleciyle aynı
+    işlemde yazılır. Yarıda kalmış bir tarama devam ettirildiğinde önceden
+    verilen girdiler atlanır; durdurulan playlist işi kuyrukta kalır.
+    """
+    archive = DownloadArchive(store) if job.sync and store else None
+    handed = 0
+    if store:
+        store.set_state(job, "running")
+        handed = store.playlist_cursor(job)
+    # Önceden verilmiş girdilerden bulunanlar; hepsi bulununca arama yapılmaz
+    seen = 0
+    batch = []
+    last = 0.0
+
+    def emit():
+        if store:
+            store.add_many(batch, parent=job)
+        return batch
+
+    try:
+        for url in iter_playlist_entries(job.url, archive):
+            if should_stop and should_stop():
+                # Kalan girdiler devam ettirilince taranır
+                if store:
+                    store.set_state(job, "queued")
+                return
+            if seen < handed and store.known(canonical_id(url), parent=job.store_id):
+                seen += 1
+                continue
+            batch.append(job.entry_job(url))
+            now = time.monotonic()
+            if now - last >= interval:
+                yield emit()
+                batch = []
+                last = now
+        if batch:
+            yield emit()
+    except Exception as e:
+        if store:
+            store.set_state(job, "failed", error=str(e))
+        raise
+    if store:
+        store.set_state(job, "done")
+
+
+def media_duration(info):
+    # download_ranges ile yalnızca bir bölüm indirildiyse o bölümün süresi
+    if info.get('section_end') is not None:
+        return info['section_end'] - (info.get('section_start') or 0)
+    return info.get('duration')
+
+
+def ffmpeg_error(e):
+    # ffmpeg'in kendi hata satırı; yoksa istisnanın metni
+    if isinstance(e, FileNotFoundError):
+        return "ffmpeg bulunamadı"
+    stderr = getattr(e, 'stderr', None)
+    if isinstance(stderr, bytes):
+        stderr = stderr.decode('utf-8', errors='replace')
+    lines = (stderr or '').strip().splitlines()
+    return lines[-1] if lines else str(e)
+
+
+def subtitle_files(info):
+    subs = info.get('requested_subtitles') or {}
+    return [sub.get('filepath') for sub in subs.values() if sub and sub.get('filepath')]
+
+
+def fetch_info(url, cache=None):
+    """Kompakt VideoInfo döner; bilgi alınamazsa None.
+
+    Tam bilgi sözlüğü bellekte tutulmaz, yalnızca disk önbelleğine yazılır;
+    indirme sırasında DownloadTask oradan okur.
+    """
+    if cache:
+        record = cache.get(url)
+        if record:
+            return record
+
+    ydl_opts = {'quiet': True, 'skip_download': True, 'noplaylist': True}
+    with YDL_POOL.ydl(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=False)
+
+    if not info:
+        return None
+
+    record = VideoInfo.from_info(info, url)
+    if cache:
+        try:
+            cache.put(url, info, record)
+        except Exception:
+            pass
+    return record
+
+
+def resolve_batch(urls, cache=None, max_workers=RESOLVE_WORKERS, on_progress=None, should_stop=None):
+    """Toplu bağlantıları indirme başlamadan, sınırlı bir havuzda eşzamanlı çözer.
+
+    (çözülenler, hatalar, tekrarlar) döner: [(url, VideoInfo)], [(url, hata)],
+    [(url, aynı videonun ilk url'si)]; sıralar yapıştırma sırasıdır. Aynı
+    video farklı biçimlerde (youtu.be/X, watch?v=X&t=..) verilmişse istek
+    atılmadan elenir; çözümden sonra sitenin kanonik adresiyle ikinci eleme
+    yapılır. `cache` verilirse tam bilgi yazılır, indirme yeniden çözmez.
+    on_progress(biten, toplam) her bağlantıdan sonra çağrılır.
+    """
+    unique, duplicates, first = [], [], {}
+    for url in urls:
+        key = canonical_id(url)
+        if key in first:
+            duplicates.append((url, first[key]))
+            continue
+        first[key] = url
+        unique.append(url)
+
+    def resolve(url):
+        if should_stop and should_stop():
+            return None
+        return fetch_info(url, cache)
+
+    records, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique)))) as pool:
+        futures = {pool.submit(resolve, url): url for url in unique}
+        for done, future in enumerate(as_completed(futures), 1):
+            url = futures[future]
+            try:
+                record = future.result()
+            except Exception as e:
+                errors[url] = str(e)
+            else:
+                if record:
+                    records[url] = record
+                elif not (should_stop and should_stop()):
+                    errors[url] = "Video bilgisi alınamadı veya bağlantı desteklenmiyor."
+            if on_progress:
+                on_progress(done, len(unique))
+
+    resolved, by_id = [], {}
+    for url in unique:
+        record = records.get(url)
+        if record is None:
+            continue
+        if record.id in by_id:
+            duplicates.append((url, by_id[record.id]))
+            continue
+        by_id[record.id] = url
+        resolved.append((url, record))
+    failures = [(url, errors[url]) for url in unique if url in errors]
+    return resolved, failures, duplicates
+
+
+def size_hint(job, record):
+    # İşin seçtiği kalite ve türe göre tahmini boyut (bayt); bilinmiyorsa 0
+    m = re.match(r"(\d+)p", job.quality or "")
+    audio_only = job.download_type == "Sadece Ses" or job.fmt == "mp3"
+    return record.estimated_size(int(m.group(1)) if m else None, audio_only)
+
+
+class DownloadPass:
+    """Tek bir yt-dlp çalıştırmasının sonucu."""
+
+    def __init__(self, title, completed, clip=None):
+        self.title = title
+        # after_video sırasıyla tamamlanan videolar
+        self.completed = completed
+        # Aralıklı indirilemediyse son işlemde yapılacak kesim
+        self.clip = clip
+
+
+class DownloadTask:
+    """Bir DownloadJob'ı indirip son işlemlerini yapar; Qt'ye bağımlı değildir.
+
+    İlerleme, ayarlanan sıklıkta `on_progress(tracker)` ile bildirilir.
+    `run()` (dosyalar, başlık) döner, hata durumunda istisna fırlatır.
+    `store` verilirse işin durumu ve yarım dosyası JobStore'a yazılır.
+    `connections` > 1 ise her dosya o kadar paralel bağlantıyla indirilir.
+    `cache` (MetadataCache) verilirse önceden çözülmüş bilgi oradan okunur.
+    """
+
+    def __init__(
+        self, job, info=None, on_progress=None, progress_hz=4, store=None, connections=1, cache=None
+    ):
+        self.job = job
+        self.url = job.url
+        self.download_path = job.download_path
+        self.fmt = job.fmt
+        self.quality = job.quality
+        self.download_type = job.download_type
+        self.subtitle = job.subtitle
+        self.sub_lang = job.sub_lang
+        self.clip_enabled = job.clip_enabled
+        self.clip_start = job.clip_start
+        self.clip_end = job.clip_end
+        self.clip_mode = job.clip_mode
+        # Önceden çözülmüş tam bilgi
+        self.info = info
+        self.cache = cache
+        self.on_progress = on_progress
+        self.tracker = ProgressTracker(progress_hz)
+        self.store = store
+        self.connections = max(1, int(connections))
+        self.stream_formats = []
+        self.metrics = JobMetrics(job)
+        # Dosya adı -> ilk ilerleme anı; yt-dlp son işlemi -> (başlangıç, bayt)
+        self._streams = {}
+        self._pp_started = {}
+        # İşin diske yazdığı dosyalar (yarım .part'lar ve biten ara kısımlar); iptalde silinir
+        self._partials = set()
+        # Ses ve video akışları paralel indiğinde kanca aynı anda çağrılabilir
+        self._hook_lock = threading.Lock()
+
+    def run(self):
+        steps, title = self.download()
+        return self.postprocess(steps), title
+
+    def download(self):
+        """Yalnızca ağ aşaması: (son işlem adımları, başlık) döner, ffmpeg çalıştırmaz.
+
+        `job.cancel_token` ile durdurulursa JobStopped fırlatır.
+        """
+        from cancel import JobStopped
+
+        if self.store:
+            self.store.set_state(self.job, "running")
+        reason = None
+        try:
+            self.job.cancel_token.check()
+            steps, title = self._run()
+        except JobStopped as e:
+            reason = e.reason
+        except Exception as e:
+            if self.store:
+                self.store.set_state(self.job, "failed", error=str(e))
+            raise
+        if reason:
+            # Temizlik, istisnanın tuttuğu açık dosyalar bırakıldıktan sonra
+            self._stopped(reason)
+            raise JobStopped(reason)
+        if self.store:
+            self.store.set_state(self.job, "processing")
+        return steps, title
+
+    def _stopped(self, reason):
+        from cancel import remove_partials
+
+        if reason == "cancel":
+            remove_partials(self._partials)
+            if self.store:
+                self.store.set_state(self.job, "cancelled")
+            return
+        # Duraklatma: yarım dosyalar kalır; aynı format seçilirse HTTP Range ile devam edilir
+        if self.stream_formats:
+            self.job.resume_format = "+".join(self.stream_formats)
+        self.job.partial_files = tuple(sorted(self._partials))
+        if self.store:
+            self.store.set_state(self.job, "paused")
+
+    def postprocess(self, steps):
+        """CPU aşaması; indirme yuvasını tutmadan son işlem havuzunda çalışabilir."""
+        try:
+            files = [self._run_plan(plan, path) if plan else path for plan, path in steps]
+        except Exception as e:
+            if self.store:
+                self.store.set_state(self.job, "failed", error=str(e))
+            raise
+        # Dosya tarihini öne çek
+        self.set_files_to_now(files)
+        if self.store:
+            self.store.set_state(self.job, "done", files=files)
+        return files
+
+    def _run(self):
+        import yt_dlp
+
+        if self.info is None and self.cache:
+            # Tam bilgi yalnızca bu iş parçacığında ve indirme süresince bellekte
+            self.info = self.cache.get_info(self.url)
+
+        clipping = self.clip_enabled and bool(self.clip_start or self.clip_end)
+        # Klipte tam dosya yerine yalnızca istenen aralık indirilir
+        suffix = "_clip" if clipping else ""
+        ydl_opts = {
+            'outtmpl': os.path.join(self.download_path, f'%(title)s{suffix}.%(ext)s'),
+            'progress_hooks': [self.my_hook],
+            'postprocessor_hooks': [self.pp_hook],
+            'no-mtime': True,
+            'quiet': True,
+            # İlerleme kancayla izlenir; yt-dlp'nin stdout'a yazdığı çubuk gereksiz
+            'noprogress': True,
+            # Yarım kalan .part dosyalarına HTTP Range ile devam et
+            'continuedl': True,
+            # Düz HTTP'de Range parçaları, DASH/HLS'de fragmanlar paralel iner
+            'concurrent_fragment_downloads': self.connections,
+            # Playlist işleri buraya gelmeden expand_playlist ile tekil işlere açılır
+            'noplaylist': True
+        }
+
+        if self.subtitle:
+            ydl_opts['writesubtitles'] = True
+            ydl_opts['writeautomaticsub'] = True
+            if SUBTITLE_LANGS.get(self.sub_lang):
+                ydl_opts['subtitleslangs'] = SUBTITLE_LANGS[self.sub_lang]
+            ydl_opts['subtitlesformat'] = 'vtt'
+
+        if self.store:
+            # Normal indirmeler de arşive yazılır, sonraki senkronizasyon bunları atlar
+            ydl_opts['download_archive'] = DownloadArchive(self.store, check=False)
+
+        if clipping:
+            ydl_opts['download_ranges'] = yt_dlp.utils.download_range_func(
+                None, [clip_range(self.clip_start, self.clip_end)]
+            )
+            # Hızlı modda kesim en yakın anahtar karede, hassas modda tam karede yapılır
+            ydl_opts['force_keyframes_at_cuts'] = self.clip_mode == "accurate"
+
+        m = re.match(r"(\d+)p.*\[(\w+)\]", self.quality)
+        height = m.group(1) if m else ""
+        result = None
+        steps = []
+
+        def video_format_str():
+            if height:
+                return f'bestvideo[ext=mp4][vcodec^=avc1][height={height}]+bestaudio[ext=m4a]/best[ext=mp4]'
+            else:
+                return 'bestvideo[ext=mp4][vcodec^=avc1]+bestaudio[ext=m4a]/best[ext=mp4]'
+
+        def video_only_format_str():
+            if height:
+                return f'bestvideo[ext=mp4][vcodec^=avc1][height={height}]'
+            else:
+                return f'bestvideo[ext=mp4][vcodec^=avc1]'
+
+        def audio_only_format_str():
+            return 'bestaudio[ext=m4a]/bestaudio/best'
+
+        if self.download_type == "Birleştir (Normal)" or self.download_type == "Sadece Ses":
+            audio_mode = self.fmt == 'mp3' or self.download_type == "Sadece Ses"
+            # Sonradan ffmpeg geçişi gerekmiyorsa faststart birleştirme sırasında yapılır
+            merger_faststart = not (self.subtitle or clipping)
+            if self.download_type == "Sadece Ses":
+                # webm seçiliyse Opus tercih edilir, kopyalanıp ogg olarak kalır
+                ydl_opts['format'] = 'bestaudio[ext=webm]/bestaudio/best' if self.fmt == 'webm' \
+                    else audio_only_format_str()
+            elif audio_mode:
+                ydl_opts['format'] = 'bestaudio/best'
+            else:
+                ydl_opts['format'] = video_format_str()
+                ydl_opts['merge_output_format'] = 'mp4'
+                if merger_faststart:
+                    ydl_opts['postprocessor_args'] = {'merger+ffmpeg_o': ['-movflags', '+faststart']}
+            if self.job.resume_format:
+                ydl_opts['format'] = self.job.resume_format
+
+            result = self._download(ydl_opts)
+            if audio_mode:
+                steps = self._plan(result, lambda entry, path, clip: plan_audio(
+                    path, self.fmt, entry.get('acodec'), media_duration(entry), clip
+                ))
+            else:
+                steps = self._plan(result, lambda entry, path, clip: plan_postprocess(
+                    path, 'mp4', faststart=not (entry.get('requested_formats') and merger_faststart),
+                    clip=clip, subtitles=subtitle_files(entry), accurate=self.clip_mode == "accurate",
+                    subtitle_start=entry.get('section_start') or 0
+                ))
+
+        elif self.download_type == "Sadece Görüntü":
+            ydl_opts['format'] = self.job.resume_format or video_only_format_str()
+
+            result = self._download(ydl_opts)
+            steps = self._plan(result, lambda entry, path, clip: plan_postprocess(
+                path, faststart=True, clip=clip, subtitles=subtitle_files(entry),
+                accurate=self.clip_mode == "accurate", subtitle_start=entry.get('section_start') or 0
+            ))
+
+        elif self.download_type == "Ayrı Ayrı (Ses + Video)":
+            # Ses ve video aynı çözümlemeyi paylaşır
+            shared_info = self.info
+            if not shared_info:
+                with self.metrics.span("extract"), YDL_POOL.ydl({**ydl_opts, 'progress_hooks': []}) as ydl:
+                    shared_info = ydl.extract_info(self.url, download=False)
+                if not shared_info or not isinstance(shared_info, dict):
+                    raise Exception("Video bilgisi alınamadı. Link geçersiz, yasaklı veya desteklenmiyor.")
+
+            # Video kısmı
+            ydl_opts_vid = ydl_opts.copy()
+            ydl_opts_vid['format'] = video_only_format_str()
+            ydl_opts_vid['outtmpl'] = os.path.join(self.download_path, f'%(title)s{suffix}_video.%(ext)s')
+            if 'download_archive' in ydl_opts:
+                # Arşive ses kısmı da indikten sonra yazılır
+                ydl_opts_vid['download_archive'] = DownloadArchive(self.store, check=False, record=False)
+
+            # Ses kısmı
+            ydl_opts_audio = ydl_opts.copy()
+            ydl_opts_audio['format'] = audio_only_format_str()
+            ydl_opts_audio['outtmpl'] = os.path.join(self.download_path, f'%(title)s{suffix}_audio.%(ext)s')
+            # Altyazılar video kısmında zaten yazıldı
+            ydl_opts_audio.pop('writesubtitles', None)
+            ydl_opts_audio.pop('writeautomaticsub', None)
+
+            # İki akış aynı anda iner
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                audio = pool.submit(self._download, ydl_opts_audio, shared_info, "Ses bilgisi alınamadı.")
+                result = self._download(ydl_opts_vid, shared_info)
+                audio_result = audio.result()
+
+            steps = self._plan(result, lambda entry, path, clip: plan_postprocess(
+                path, faststart=True, clip=clip, subtitles=subtitle_files(entry),
+                accurate=self.clip_mode == "accurate", subtitle_start=entry.get('section_start') or 0
+            ))
+            steps += self._plan(audio_result, lambda entry, path, clip: plan_postprocess(
+                path, clip=clip, audio_only=True
+            ))
+
+        title = result.title if result else None
+        return steps, title
+
+    def _download(self, ydl_opts, info=None, error="Video bilgisi alınamadı."):
+        import yt_dlp
+
+        if info is None:
+            info = self.info
+        completed = []
+        clip = None
+        try:
+            result = self._resolve(ydl_opts, info, completed)
+        except yt_dlp.utils.DownloadError as e:
+            if 'download_ranges' not in ydl_opts or 'partially downloaded' not in str(e):
+                raise
+            # Bu format aralıklı indirilemiyor: tamamını indir, kesimi son işlemde yap
+            clip = clip_range(self.clip_start, self.clip_end)
+            ydl_opts = {k: v for k, v in ydl_opts.items() if k not in ('download_ranges', 'force_keyframes_at_cuts')}
+            completed = []
+            result = self._resolve(ydl_opts, info, completed)
+        if not result or not isinstance(result, dict):
+            raise Exception(f"{error} Link geçersiz, yasaklı veya desteklenmiyor.")
+        return DownloadPass(result.get("title"), completed, clip)
+
+    def _resolve(self, ydl_opts, info, completed):
+        import yt_dlp
+        from cancel import JobStopped
+        from segmented import ParallelYoutubeDL
+
+        # Çözümleme: başlangıçtan indirmeye kadar
+        phase = {'extract': time.perf_counter(), 'download': None}
+        # İndirme başlamadan diskte olan çıktılar; yt-dlp bunları "zaten indirilmiş" sayar, iptalde silinmez
+        existing = set()
+
+        def extracted(entry):
+            # Çözümleme sürerken gelen durdurma isteği indirme başlamadan uygulanır
+            self.job.cancel_token.check()
+            path = entry.get('_filename')
+            if path:
+                with self._hook_lock:
+                    if os.path.exists(path):
+                        existing.add(path)
+                    else:
+                        # Parçalı indiriciler .part/.ytdl dosyalarını ilk ilerleme kancasından önce açar
+                        self._partials.add(path)
+            now = time.perf_counter()
+            if phase['extract'] is not None:
+                self.metrics.add("extract", now - phase['extract'], cached=info is not None or None)
+            phase['extract'], phase['download'] = None, now
+
+        def finished(entry):
+            completed.append(completed_entry(entry))
+            # Ayrı modda biten ses/video kısmı, iş tamamlanana kadar ara çıktıdır; iptalde silinir
+            with self._hook_lock:
+                self._partials.update(
+                    dl['filepath'] for dl in entry.get('requested_downloads') or []
+                    if dl.get('filepath') and dl['filepath'] not in existing
+                )
+            phase['extract'], phase['download'] = time.perf_counter(), None
+
+        with YDL_POOL.ydl(ydl_opts, ParallelYoutubeDL) as ydl:
+            ydl.add_post_processor(info_hook(extracted), when='before_dl')
+            ydl.add_post_processor(info_hook(finished), when='after_video')
+            try:
+                return resolve_and_download(ydl, self.url, info)
+            except JobStopped:
+                raise
+            except Exception as e:
+                now = time.perf_counter()
+                if phase['extract'] is not None:
+                    self.metrics.add("extract", now - phase['extract'], error=str(e))
+                elif phase['download'] is not None:
+                    kind = "merge" if isinstance(e, yt_dlp.utils.PostProcessingError) else "download"
+                    self.metrics.add(kind, now - phase['download'], error=str(e))
+                raise
+
+    def _plan(self, result, make_plan):
+        # (plan veya None, indirilen dosya) çiftleri; ffmpeg postprocess() içinde çalışır
+        steps = []
+        for info in result.completed:
+            for entry, path in downloaded_items(info):
+                steps.append((make_plan(entry, path, result.clip), path))
+        return steps
+
+    def _run_plan(self, plan, fallback):
+        # Tüm kap dönüşümü / faststart / kesim / altyazı tek ffmpeg geçişinde
+        try:
+            with self.metrics.span(plan.kind, file_size(plan.source), path=plan.source) as span:
+                output = run_plan(plan)
+                span["cpu"] = plan.cpu_seconds and round(plan.cpu_seconds, 3)
+            return output
+        except Exception as e:
+            reason = ffmpeg_error(e)
+            if plan.required:
+                raise Exception(f"Son işlem başarısız ({os.path.basename(plan.source)}): {reason}")
+            # İsteğe bağlı adım: dosya son işlemsiz haliyle kullanılır
+            log.warning("Son işlem atlandı (%s, %s): %s", plan.kind, plan.source, reason)
+            return fallback
+
+    def my_hook(self, d):
+        # Ek güvenlik: yt-dlp bazen beklenmeyen tip gönderebilir
+        if not isinstance(d, dict):
+            return
+
+        status = d.get('status')
+        if status not in ('downloading', 'finished'):
+            return
+        # Durdurma isteği buradan fırlar; yt-dlp ve SegmentedHttpFD indirmeyi bırakır
+        self.job.cancel_token.check()
+        with self._hook_lock:
+            if status == 'downloading':
+                self._record_partial(d)
+                self._partials.update(p for p in (d.get('filename'), d.get('tmpfilename')) if p)
+                self._streams.setdefault(d.get('filename'), time.perf_counter())
+            else:
+                self._stream_done(d)
+            self.tracker.update(d)
+            # Her parçada değil, ayarlanan sıklıkta yayınla (bitişte her zaman)
+            if not self.tracker.should_emit(force=status == 'finished'):
+                return
+            if self.on_progress:
+                self.on_progress(self.tracker)
+
+    def _stream_done(self, d):
+        started = self._streams.pop(d.get('filename'), None)
+        # Zaten inmiş dosyalar için de 'finished' gelir; onlar span değil
+        if started is None and not d.get('elapsed'):
+            return
+        info = d.get('info_dict') or {}
+        self.metrics.add(
+            "download", d.get('elapsed') or time.perf_counter() - started,
+            d.get('downloaded_bytes') or d.get('total_bytes'),
+            format_id=info.get('format_id'), path=d.get('filename')
+        )
+
+    def pp_hook(self, d):
+        # yt-dlp'nin kendi ffmpeg adımları: format birleştirme ve düzeltmeler
+        name = d.get('postprocessor') or ''
+        if not (name == 'Merger' or name.startswith('Fixup')) or d.get('status') not in ('started', 'finished'):
+            return
+        info = d.get('info_dict') or {}
+        key = (name, id(info))
+        if d['status'] == 'started':
+            self.job.cancel_token.check()
+        with self._hook_lock:
+            if d['status'] == 'started':
+                files = info.get('__files_to_merge') or [info.get('filepath')]
+                self._pp_started[key] = (time.perf_counter(), sum(file_size(f) or 0 for f in files if f))
+                return
+            started = self._pp_started.pop(key, None)
+        if started:
+            self.metrics.add(
+                "merge" if name == 'Merger' else "remux", time.perf_counter() - started[0],
+                started[1] or None, postprocessor=name, path=info.get('filepath')
+            )
+
+    def _record_partial(self, d):
+        # Her akış için bir kez: seçilen format ve .part dosyasının yeri
+        if not self.store or self.download_type == "Ayrı Ayrı (Ses + Video)":
+            return
+        format_id = (d.get('info_dict') or {}).get('format_id')
+        if not format_id or format_id in self.stream_formats:
+            return
+        self.stream_formats.append(format_id)
+        self.store.update_partial(self.job, "+".join(self.stream_formats), d.get('tmpfilename') or d.get('filename'))
+
+    def set_files_to_now(self, files):
+        now = time.time()
+        for file_ in files:
+            try:
+                os.utime(file_, (now, now))
+            except Exception:
+                pass
+
+
+def run_batch(
+    jobs, max_workers=3, per_host_limit=2, on_done=None, on_progress=None, progress_hz=4, store=None,
+    on_added=None, connections=1, feeds=()
+):
+    """İşleri Qt olmadan, sınırlı sayıda iş parçacığıyla yürütür.
+
+    Playlist işleri ayrı iş parçacıklarında taranır; bulunan girdiler
+    kuyruğa eklendikçe `on_added(jobs)` çağrılır. `feeds` (jobstore.BatchFeed)
+    içe aktarılan grupların işlerini yuvalar boşaldıkça yükler.
+    on_done(job, files, title, error) her iş bittiğinde,
+    on_progress(job, tracker) ilerleme yayınlandığında çağrılır.
+    İndirme biten işin yuvası hemen boşalır; ffmpeg son işlemleri
+    postprocess_pool() içinde sürerken sıradaki indirme başlar.
+    Ctrl+C (KeyboardInterrupt) çalışan işleri duraklatır; bekleyenler
+    JobStore'da kuyrukta kalır, sonraki çalıştırmada devam edilebilir.
+    """
+    queue = JobQueue(per_host_limit)
+    cond = threading.Condition()
+    state = {"expanding": 0, "workers": 0, "stopping": False, "feeds": list(feeds)}
+    finishing = []
+
+    def added(new_jobs):
+        if on_added and new_jobs:
+            on_added(new_jobs)
+
+    def enqueue(new_jobs):
+        playlists = [job for job in new_jobs if job.is_playlist]
+        queue.extend(job for job in new_jobs if not job.is_playlist)
+        added([job for job in new_jobs if not job.is_playlist])
+        state["expanding"] += len(playlists)
+        for job in playlists:
+            threading.Thread(target=expander, args=(job,), daemon=True).start()
+
+    def refill():
+        # cond tutulurken çağrılır; büyük gruptan bellekte en fazla FEED_WINDOW iş bekler
+        while state["feeds"] and len(queue.pending) < FEED_WINDOW:
+            fed = state["feeds"][0].take(FEED_WINDOW)
+            if not fed:
+                state["feeds"].pop(0)
+                continue
+            enqueue(fed)
+
+    def expander(job):
+        try:
+            for entries in expand_playlist(job, store, lambda: state["stopping"]):
+                with cond:
+                    queue.extend(entries)
+                    cond.notify_all()
+                added(entries)
+        except Exception as e:
+            added([job])
+            if on_done:
+                on_done(job, [], None, str(e))
+        finally:
+            with cond:
+                state["expanding"] -= 1
+                cond.notify_all()
+
+    def worker():
+        try:
+            work()
+        finally:
+            with cond:
+                state["workers"] -= 1
+                cond.notify_all()
+
+    def work():
+        while True:
+            with cond:
+                while True:
+                    # Ctrl+C sonrası yeni iş alınmaz; bekleyenler kuyrukta kalır
+                    if state["stopping"]:
+                        return
+                    refill()
+                    job = queue.next_ready()
+                    if job is not None:
+                        break
+                    if not queue.pending and not state["expanding"] and not state["feeds"]:
+                        return
+                    cond.wait()
+            progress = (lambda tracker, job=job: on_progress(job, tracker)) if on_progress else None
+            task = DownloadTask(
+                job, on_progress=progress, progress_hz=progress_hz, store=store, connections=connections
+            )
+            try:
+                steps, title = task.download()
+            except Exception as e:
+                steps, error = None, str(e)
+            with cond:
+                queue.mark_done(job)
+                cond.notify_all()
+            if steps is None:
+                if on_done:
+                    on_done(job, [], None, error)
+                continue
+            finishing.append(postprocess_pool().submit(finish, job, task, steps, title))
+
+    def finish(job, task, steps, title):
+        try:
+            result = (job, task.postprocess(steps), title, None)
+        except Exception as e:
+            result = (job, [], None, str(e))
+        if on_done:
+            on_done(*result)
+
+    state["workers"] = max(1, int(max_workers))
+    with cond:
+        enqueue(jobs)
+    for _ in range(state["workers"]):
+        threading.Thread(target=worker, daemon=True).start()
+    # Thread.join() Ctrl+C ile kesilince iş parçacığını bitmiş sayar; sayaç güvenilir.
+    # İşçiler kuyruk ve taramalar bitince çıkar, ayrıca playlist'ler beklenmez
+    try:
+        with cond:
+            while state["workers"]:
+                cond.wait()
+    except KeyboardInterrupt:
+        with cond:
+            state["stopping"] = True
+            for job in queue.running.values():
+                job.cancel_token.pause()
+            cond.notify_all()
+            while state["workers"]:
+                cond.wait()
+        raise
+    finally:
+        for future in finishing:
+            future.result()
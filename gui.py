@@ -1,23 +1,61 @@
 import os
 import sys
-import requests
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QComboBox,
     QFileDialog, QProgressBar, QMessageBox, QCheckBox, QDialog, QFormLayout,
-    QDialogButtonBox, QToolButton, QListWidget, QListWidgetItem, QTextEdit, QMenuBar, QAction
+    QDialogButtonBox, QToolButton, QListWidget, QListWidgetItem, QTextEdit, QMenuBar, QAction, QSpinBox, QMenu
 )
-from PyQt5.QtCore import Qt, QTimer, QSize, QUrl
+from PyQt5.QtCore import Qt, QTimer, QSize, QUrl, QThread, pyqtSignal
 from PyQt5.QtGui import QIcon, QPixmap, QCursor, QDesktopServices
 
-from downloader import InfoFetchThread, DownloadThread, SUBTITLE_LANGS
-from settings import load_settings, save_settings, load_history, save_history, clear_history, DEFAULT_SETTINGS
-from utils import get_system_language
+from downloader import InfoFetchThread, DownloadThread, BatchResolveThread, ImportThread
+from engine import SUBTITLE_LANGS, CLIP_MODES, warm_up, size_hint
+from jobs import DownloadJob
+from scheduler import DownloadScheduler
+from settings import load_settings, save_settings, load_history, save_history, clear_history, DEFAULT_SETTINGS, CACHE_DIR, JOBS_DB, METRICS_FILE
+from jobstore import JobStore, BatchFeed
+from importer import describe
+from cache import MetadataCache, RecordCache
+from thumbnails import ThumbnailCache, ThumbnailThread
+from utils import get_system_language, looks_like_url, playlist_key
+from net import get_session
+from postprocess import AUDIO_STATS
+from metrics import METRICS
+
+LOCAL_VERSION = "1.0"
+VERSION_URL = "https://raw.githubusercontent.com/YigithanOzturk/easyytd/main/VERSION"
+GITHUB_LOGO_URL = "https://github.githubassets.com/images/modules/logos_page/GitHub-Mark.png"
+# Kuyruk görünümünde gösterilen en fazla iş; uzun playlist'lerde liste hafif kalır
+QUEUE_VIEW_LIMIT = 200
+# URL yazılırken bilgi çözümlemesi, bu kadar ms yazma durunca başlar
+PREFETCH_DELAY_MS = 400
+# Bu kadar satırı aşan yapıştırmalar tek tek çözülmez, dosya gibi içe aktarılır
+IMPORT_THRESHOLD = 500
+QUEUE_STATES = {
+    "running": "İniyor",
+    "processing": "İşleniyor",
+    "queued": "Bekliyor",
+    "paused": "Duraklatıldı",
+}
 
 def resource_path(relative_path):
     if hasattr(sys, '_MEIPASS'):
         return os.path.join(sys._MEIPASS, relative_path)
     return os.path.join(os.path.abspath("."), relative_path)
 
+class UpdateCheckThread(QThread):
+    update_available = pyqtSignal(str)
+
+    def run(self):
+        try:
+            response = get_session().get(VERSION_URL, timeout=3)
+            if response.status_code == 200:
+                latest_version = response.text.strip()
+                if latest_version and latest_version != LOCAL_VERSION:
+                    self.update_available.emit(latest_version)
+        except Exception:
+            pass
+
 class SettingsDialog(QDialog):
     def __init__(self, settings, format_list, quality_list, parent=None):
         super().__init__(parent)
@@ -56,6 +94,36 @@ class SettingsDialog(QDialog):
         self.sub_lang_combo.setCurrentText(self.settings.get("default_sub_lang", "Otomatik"))
         layout.addRow("Varsayılan Altyazı Dili:", self.sub_lang_combo)
 
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, 32)
+        self.workers_spin.setValue(self.settings.get("max_concurrent_downloads", 3))
+        layout.addRow("Eşzamanlı İndirme:", self.workers_spin)
+
+        self.per_host_spin = QSpinBox()
+        self.per_host_spin.setRange(1, 32)
+        self.per_host_spin.setValue(self.settings.get("per_host_limit", 2))
+        layout.addRow("Site Başına Sınır:", self.per_host_spin)
+
+        self.connections_spin = QSpinBox()
+        self.connections_spin.setRange(1, 16)
+        self.connections_spin.setValue(self.settings.get("connections_per_file", 4))
+        self.connections_spin.setToolTip("1: tek bağlantı (parçalı indirme kapalı)")
+        layout.addRow("Dosya Başına Bağlantı:", self.connections_spin)
+
+        self.cache_ttl_spin = QSpinBox()
+        self.cache_ttl_spin.setRange(0, 24 * 60)
+        self.cache_ttl_spin.setSuffix(" dk")
+        self.cache_ttl_spin.setValue(self.settings.get("info_cache_ttl", 3600) // 60)
+        layout.addRow("Bilgi Önbelleği Süresi:", self.cache_ttl_spin)
+
+        self.metrics_checkbox = QCheckBox(f"Zamanlama kaydı tut ({METRICS_FILE})")
+        self.metrics_checkbox.setChecked(self.settings.get("metrics_log", True))
+        layout.addRow("İstatistik:", self.metrics_checkbox)
+
+        self.textfile_input = QLineEdit(self.settings.get("metrics_textfile", ""))
+        self.textfile_input.setPlaceholderText("Boş: kapalı")
+        layout.addRow("Prometheus Dosyası:", self.textfile_input)
+
         buttons = QDialogButtonBox(QDialogButtonBox.Save | QDialogButtonBox.Cancel)
         buttons.accepted.connect(self.accept)
         buttons.rejected.connect(self.reject)
@@ -72,7 +140,13 @@ class SettingsDialog(QDialog):
             "default_format": self.format_combo.currentText(),
             "default_quality": self.quality_combo.currentText(),
             "default_download_path": self.path_input.text().strip() or os.path.expanduser("~"),
-            "default_sub_lang": self.sub_lang_combo.currentText()
+            "default_sub_lang": self.sub_lang_combo.currentText(),
+            "max_concurrent_downloads": self.workers_spin.value(),
+            "per_host_limit": self.per_host_spin.value(),
+            "connections_per_file": self.connections_spin.value(),
+            "info_cache_ttl": self.cache_ttl_spin.value() * 60,
+            "metrics_log": self.metrics_checkbox.isChecked(),
+            "metrics_textfile": self.textfile_input.text().strip()
         }
  
 class DownloaderApp(QWidget):
@@ -85,11 +159,70 @@ class DownloaderApp(QWidget):
         self.history = load_history()
         self.last_formats = ['mp3', 'mp4', 'webm', 'mkv']
         self.last_qualities = ['1080p (?? MB) [mp4]', '720p (?? MB) [mp4]', 'best']
+        self.job_store = JobStore(JOBS_DB)
+        self.job_store.prune()
+        self.scheduler = DownloadScheduler(
+            self.settings.get("max_concurrent_downloads", 3),
+            self.settings.get("per_host_limit", 2),
+            self.settings.get("progress_emit_hz", 4),
+            self.job_store,
+            self
+        )
+        self.scheduler.jobs_added.connect(self._on_batch_jobs_added)
+        self.scheduler.job_done.connect(self._on_batch_job_done)
+        self.scheduler.all_done.connect(self._on_batch_finished)
+        self.scheduler.aggregate_progress.connect(self._on_batch_progress)
+        self.scheduler.job_paused.connect(self._on_batch_job_paused)
+        self.batch_total = 0
+        self.batch_finished = 0
+        self.batch_failed = 0
+        self.batch_cancelled = 0
+        # Bilgi iş parçacıkları (iptal edilenler dahil) kendi bitene kadar tutulur;
+        # yalnızca son başlatılanın (info_generation) sonucu kullanılır
+        self.info_threads = set()
+        self.info_thread = None
+        self.info_url = None
+        self.info_generation = 0
+        # ARA'ya basıldı, sonuç bekleniyor (önceden alma sessizdir)
+        self.info_waiting = False
+        self.prefetched = RecordCache()
+        self.last_url_text = ""
+        self.info_timeout_timer = QTimer(self)
+        self.info_timeout_timer.setSingleShot(True)
+        self.info_timeout_timer.timeout.connect(self._on_info_timeout)
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.timeout.connect(self.prefetch_video_info)
+        # Gösterilen videonun kompakt kaydı (VideoInfo)
+        self.current_info = None
+        self.info_cache = MetadataCache(
+            os.path.join(CACHE_DIR, "info"),
+            self.settings.get("info_cache_ttl", 3600),
+            self.settings.get("info_cache_max_mb", 50) * 1024 * 1024
+        )
+        self.thumb_cache = ThumbnailCache(
+            os.path.join(CACHE_DIR, "thumbs"),
+            self.settings.get("thumb_cache_max_mb", 20) * 1024 * 1024
+        )
+        self.thumb_threads = set()
+        self.pending_thumb_url = None
         self.init_ui()
         self.apply_settings()
-        self.check_for_update()
         self.clipboard_auto_paste()
         self.setAcceptDrops(True)
+        # Ağ istekleri ve yt_dlp yüklemesi pencere ekrana geldikten sonra başlar
+        QTimer.singleShot(0, self._deferred_startup)
+
+    def _deferred_startup(self):
+        warm_up()
+        self.resume_unfinished_jobs()
+        self.check_for_update()
+        if self.github_logo.pixmap() is None or self.github_logo.pixmap().isNull():
+            thread = ThumbnailThread(GITHUB_LOGO_URL, self.thumb_cache, (22, 22))
+            thread.ready.connect(lambda url, image: self.github_logo.setPixmap(QPixmap.fromImage(image)))
+            thread.finished.connect(lambda thread=thread: self.thumb_threads.discard(thread))
+            self.thumb_threads.add(thread)
+            thread.start()
 
     def init_ui(self):
         main_layout = QVBoxLayout(self)
@@ -100,6 +233,12 @@ class DownloaderApp(QWidget):
         clear_history_action = QAction("Geçmişi Temizle", self)
         clear_history_action.triggered.connect(self.clear_history_clicked)
         settings_menu.addAction(clear_history_action)
+        stats_action = QAction("İstatistikler", self)
+        stats_action.triggered.connect(self.show_stats)
+        settings_menu.addAction(stats_action)
+        clear_cache_action = QAction("Önbelleği Temizle", self)
+        clear_cache_action.triggered.connect(self.clear_cache_clicked)
+        settings_menu.addAction(clear_cache_action)
         about_action = QAction("Hakkında", self)
         about_action.triggered.connect(self.show_about)
         settings_menu.addAction(about_action)
@@ -125,6 +264,7 @@ class DownloaderApp(QWidget):
         self.url_input.setMinimumWidth(200)
         url_layout.addWidget(QLabel("URL:"))
         url_layout.addWidget(self.url_input)
+        self.url_input.textChanged.connect(self._on_url_changed)
         self.fetch_btn = QPushButton("ARA")
         self.fetch_btn.clicked.connect(self.fetch_video_info)
         url_layout.addWidget(self.fetch_btn)
@@ -146,6 +286,10 @@ class DownloaderApp(QWidget):
         self.batch_download_btn = QPushButton("Tümünü İndir")
         self.batch_download_btn.clicked.connect(self.start_batch_download)
         multi_links_layout.addWidget(self.batch_download_btn)
+        self.import_btn = QPushButton("Dosyadan...")
+        self.import_btn.setToolTip("Metin, CSV veya JSONL URL listesi içe aktar")
+        self.import_btn.clicked.connect(self.import_file_clicked)
+        multi_links_layout.addWidget(self.import_btn)
         main_layout.addLayout(multi_links_layout)
 
         self.video_info_box = QHBoxLayout()
@@ -198,7 +342,13 @@ class DownloaderApp(QWidget):
 
         self.playlist_checkbox = QCheckBox("Tüm oynatma listesini indir")
         self.playlist_checkbox.setChecked(False)
-        main_layout.addWidget(self.playlist_checkbox)
+        self.sync_checkbox = QCheckBox("Yalnızca yeni videoları indir (senkronize et)")
+        self.sync_checkbox.setEnabled(False)
+        self.playlist_checkbox.toggled.connect(self.sync_checkbox.setEnabled)
+        playlist_row = QHBoxLayout()
+        playlist_row.addWidget(self.playlist_checkbox)
+        playlist_row.addWidget(self.sync_checkbox)
+        main_layout.addLayout(playlist_row)
 
         path_layout = QHBoxLayout()
         self.path_input = QLineEdit()
@@ -219,15 +369,24 @@ class DownloaderApp(QWidget):
         self.clip_end_input = QLineEdit()
         self.clip_end_input.setPlaceholderText("Bitiş (ss:dd:sn)")
         self.clip_end_input.setFixedWidth(120)
+        self.clip_mode_combo = QComboBox()
+        self.clip_mode_combo.addItems(list(CLIP_MODES.keys()))
         clip_row.addWidget(self.clip_checkbox)
         clip_row.addWidget(self.clip_start_input)
         clip_row.addWidget(self.clip_end_input)
+        clip_row.addWidget(self.clip_mode_combo)
         main_layout.addLayout(clip_row)
 
 
+        download_row = QHBoxLayout()
         self.download_btn = QPushButton("İndir")
         self.download_btn.clicked.connect(self.start_download)
-        main_layout.addWidget(self.download_btn)
+        download_row.addWidget(self.download_btn)
+        self.stop_btn = QPushButton("İptal Et")
+        self.stop_btn.setEnabled(False)
+        self.stop_btn.clicked.connect(self.cancel_download)
+        download_row.addWidget(self.stop_btn)
+        main_layout.addLayout(download_row)
 
         self.progress_bar = QProgressBar()
         self.progress_bar.setValue(0)
@@ -240,6 +399,25 @@ class DownloaderApp(QWidget):
 
 
 
+        self.queue_label = QLabel("İndirme Kuyruğu (sağ tık: duraklat, iptal, öne al):")
+        self.queue_label.setStyleSheet("font-size: 13px; font-weight: bold; padding-top:8px;")
+        main_layout.addWidget(self.queue_label)
+        self.queue_list = QListWidget()
+        self.queue_list.setMaximumHeight(100)
+        self.queue_list.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.queue_list.customContextMenuRequested.connect(self._show_queue_menu)
+        main_layout.addWidget(self.queue_list)
+        self.queue_label.setVisible(False)
+        self.queue_list.setVisible(False)
+        # Kuyruk değişiklikleri en fazla 150 ms'de bir çizilir
+        self.queue_refresh_timer = QTimer(self)
+        self.queue_refresh_timer.setSingleShot(True)
+        self.queue_refresh_timer.setInterval(150)
+        self.queue_refresh_timer.timeout.connect(self.refresh_queue)
+        self.scheduler.queue_changed.connect(
+            lambda: self.queue_refresh_timer.isActive() or self.queue_refresh_timer.start()
+        )
+
         history_label = QLabel("İndirme Geçmişi (son 10):")
         history_label.setStyleSheet("font-size: 13px; font-weight: bold; padding-top:8px;")
         main_layout.addWidget(history_label)
@@ -252,11 +430,11 @@ class DownloaderApp(QWidget):
         github_row = QHBoxLayout()
         github_row.addStretch()
         self.github_logo = QLabel()
-        try:
-            github_pix = QPixmap()
-            github_pix.loadFromData(requests.get("https://github.githubassets.com/images/modules/logos_page/GitHub-Mark.png").content)
-            self.github_logo.setPixmap(github_pix.scaled(22, 22, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        except Exception:
+        # İlk açılışta indirilir, sonrasında önbellekten gelir
+        logo = self.thumb_cache.get(GITHUB_LOGO_URL)
+        if logo is not None:
+            self.github_logo.setPixmap(QPixmap.fromImage(logo))
+        else:
             self.github_logo.setText("@YigithanOzturk")
         self.github_logo.setCursor(QCursor(Qt.PointingHandCursor))
         self.github_logo.mousePressEvent = self._open_github
@@ -294,6 +472,13 @@ class DownloaderApp(QWidget):
         self.quality_combo.setCurrentText(s.get("default_quality", "1080p (?? MB) [mp4]"))
         self.path_input.setText(s.get("default_download_path", os.path.expanduser("~")))
         self.subtitle_lang_combo.setCurrentText(s.get("default_sub_lang", "Otomatik"))
+        self.scheduler.configure(s.get("max_concurrent_downloads", 3), s.get("per_host_limit", 2))
+        self.scheduler.progress_hz = s.get("progress_emit_hz", 4)
+        self.scheduler.connections = s.get("connections_per_file", 4)
+        self.info_cache.ttl = s.get("info_cache_ttl", 3600)
+        self.info_cache.max_bytes = s.get("info_cache_max_mb", 50) * 1024 * 1024
+        self.scheduler.cache = self.info_cache if self.info_cache.ttl > 0 else None
+        METRICS.configure(METRICS_FILE if s.get("metrics_log", True) else None, s.get("metrics_textfile"))
 
     def show_settings(self):
         dialog = SettingsDialog(
@@ -317,23 +502,97 @@ class DownloaderApp(QWidget):
         if not url:
             self.show_error("Lütfen bir YouTube video URL’si giriniz.")
             return
+        self.prefetch_timer.stop()
+        record = self.prefetched.get(url)
+        if record is not None:
+            self._on_video_info_ready(record, record.format_exts(), record.quality_labels())
+            return
+        # Önceden alma aynı URL için sürüyorsa yeniden başlatılmaz, sonucu beklenir
+        if self.info_thread is None or self.info_url != url:
+            self._start_info_fetch(url)
+        self.info_waiting = True
         self.status_label.setText("Video bilgisi alınıyor...")
         self.fetch_btn.setEnabled(False)
         QApplication.setOverrideCursor(Qt.WaitCursor)
-        self.info_thread = InfoFetchThread(url)
-        self.info_thread.info_ready.connect(self._on_video_info_ready)
-        self.info_thread.error.connect(self._on_video_info_error)
-        self.info_thread.finished.connect(lambda: QApplication.restoreOverrideCursor())
-        self.info_thread.finished.connect(lambda: self.fetch_btn.setEnabled(True))
-        self.info_timeout_timer = QTimer(self)
-        self.info_timeout_timer.setSingleShot(True)
-        self.info_timeout_timer.timeout.connect(self._on_info_timeout)
         self.info_timeout_timer.start(10000)
-        self.info_thread.start()
+
+    def prefetch_video_info(self):
+        # Yapıştırılan, bırakılan veya yazılan URL için ARA'dan önce sessiz çözümleme
+        url = self.url_input.text().strip()
+        if not looks_like_url(url) or (self.info_thread is not None and self.info_url == url):
+            return
+        record = self.prefetched.get(url)
+        if record is not None:
+            self._on_video_info_ready(record, record.format_exts(), record.quality_labels())
+            return
+        self._start_info_fetch(url)
+
+    def _on_url_changed(self, text):
+        url = text.strip()
+        # Yapıştırma/bırakma metni tek seferde değiştirir; tuşla yazma tek karakter ekler/siler
+        old = self.last_url_text
+        pasted = abs(len(text) - len(old)) > 1 or (len(text) == len(old) and text != old)
+        self.last_url_text = text
+        if self.info_thread is not None and self.info_url != url:
+            # Metin değişti: eski çözümleme bayat, sonucu beklenmez
+            self._cancel_info_fetch()
+        if not looks_like_url(url):
+            self.prefetch_timer.stop()
+            return
+        # Yapıştırınca hemen, yazarken durunca; açılıştaki pano URL'si ilk çizimi geciktirmesin
+        self.prefetch_timer.start(0 if pasted and self.isVisible() else PREFETCH_DELAY_MS)
+
+    def _start_info_fetch(self, url):
+        self._cancel_info_fetch()
+        generation = self.info_generation
+        cache = self.info_cache if self.info_cache.ttl > 0 else None
+        thread = InfoFetchThread(url, cache)
+        thread.info_ready.connect(
+            lambda info, formats, qualities, generation=generation:
+            self._on_info_fetched(generation, info, formats, qualities)
+        )
+        thread.error.connect(lambda err, generation=generation: self._on_info_failed(generation, err))
+        thread.finished.connect(lambda thread=thread: self.info_threads.discard(thread))
+        self.info_threads.add(thread)
+        self.info_thread, self.info_url = thread, url
+        thread.start()
+
+    def _cancel_info_fetch(self):
+        # terminate() soket ve yarım dosya bırakabilir: iş parçacığı kendi biter, sonucu yok sayılır
+        if self.info_thread is not None:
+            self.info_thread.requestInterruption()
+        self.info_thread = self.info_url = None
+        self.info_generation += 1
+        self._end_info_wait()
+
+    def _end_info_wait(self):
+        if not self.info_waiting:
+            return
+        self.info_waiting = False
+        self.info_timeout_timer.stop()
+        QApplication.restoreOverrideCursor()
+        self.fetch_btn.setEnabled(True)
+
+    def _on_info_fetched(self, generation, info, formats, qualities):
+        if generation != self.info_generation:
+            return
+        self.prefetched.put(self.info_url, info)
+        self.info_thread = self.info_url = None
+        self._end_info_wait()
+        self._on_video_info_ready(info, formats, qualities)
+
+    def _on_info_failed(self, generation, err):
+        if generation != self.info_generation:
+            return
+        waiting = self.info_waiting
+        self.info_thread = self.info_url = None
+        self._end_info_wait()
+        # Önceden almadaki hata gösterilmez; ARA'ya basılınca yeniden denenir
+        if waiting:
+            self._on_video_info_error(err)
 
     def _on_video_info_ready(self, info, formats, qualities):
-        if hasattr(self, "info_timeout_timer"):
-            self.info_timeout_timer.stop()
+        self.current_info = info
         self.show_video_info(info)
         self.status_label.setText("Video bilgisi yüklendi.")
         self.format_combo.blockSignals(True)
@@ -349,19 +608,13 @@ class DownloaderApp(QWidget):
             self.quality_combo.setCurrentText(self.settings.get("default_quality"))
 
     def _on_video_info_error(self, err):
-        if hasattr(self, "info_timeout_timer"):
-            self.info_timeout_timer.stop()
+        self.current_info = None
         self.show_video_info(None)
         self.status_label.setText(f"Video bilgisi alınamadı: {err}")
 
     def _on_info_timeout(self):
+        self._cancel_info_fetch()
         self.status_label.setText("İşlem zaman aşımına uğradı, lütfen tekrar deneyin.")
-        self.fetch_btn.setEnabled(True)
-        QApplication.restoreOverrideCursor()
-        try:
-            self.info_thread.terminate()
-        except Exception:
-            pass
 
     def show_video_info(self, info):
         if not info:
@@ -370,44 +623,69 @@ class DownloaderApp(QWidget):
             self.channel_label.setText("Kanal: -")
             self.duration_label.setText("Süre: -")
             return
-        thumb_url = info.get("thumbnail", "")
+        thumb_url = info.thumbnail
+        self.pending_thumb_url = thumb_url
+        self.thumb_label.clear()
         if thumb_url:
-            try:
-                img = requests.get(thumb_url, timeout=5).content
-                pix = QPixmap()
-                pix.loadFromData(img)
-                self.thumb_label.setPixmap(pix.scaled(120, 68, Qt.KeepAspectRatio))
-            except Exception:
-                self.thumb_label.clear()
-        self.title_label.setText(f"Başlık: {info.get('title', '-')}")
-        self.channel_label.setText(f"Kanal: {info.get('uploader', '-')}")
-        dur = int(info.get('duration', 0))
+            image = self.thumb_cache.get(thumb_url)
+            if image is not None:
+                self.thumb_label.setPixmap(QPixmap.fromImage(image))
+            else:
+                # İndirme ve küçültme arayüz iş parçacığı dışında yapılır
+                thread = ThumbnailThread(thumb_url, self.thumb_cache)
+                thread.ready.connect(self._on_thumbnail_ready)
+                thread.finished.connect(lambda thread=thread: self.thumb_threads.discard(thread))
+                self.thumb_threads.add(thread)
+                thread.start()
+        self.title_label.setText(f"Başlık: {info.title or '-'}")
+        self.channel_label.setText(f"Kanal: {info.uploader or '-'}")
+        dur = info.duration
         mins, secs = divmod(dur, 60)
         h, mins = divmod(mins, 60)
         duration_str = f"{h:02d}:{mins:02d}:{secs:02d}" if h else f"{mins:02d}:{secs:02d}"
         self.duration_label.setText(f"Süre: {duration_str}")
 
-    def start_download(self):
-        url = self.url_input.text().strip()
+    def _make_job(self, url):
         path = self.path_input.text().strip()
         fmt = self.format_combo.currentText().lower()
         quality = self.quality_combo.currentText()
-        is_playlist = self.playlist_checkbox.isChecked()
-        download_type = self.download_type_combo.currentText()
-        subtitle = self.subtitle_checkbox.isChecked()
-        sub_lang = self.subtitle_lang_combo.currentText()
-        clip_enabled = self.clip_checkbox.isChecked()
-        clip_start = self.clip_start_input.text().strip()
-        clip_end = self.clip_end_input.text().strip()
 
-        if not url:
-            self.show_error("Lütfen bir video URL’si giriniz.")
-            return
         if not path or not os.path.isdir(path):
             self.show_error("Lütfen geçerli bir kayıt klasörü seçiniz.")
-            return
+            return None
         if not fmt or not quality:
             self.show_error("Lütfen format ve kalite seçiniz.")
+            return None
+
+        return DownloadJob(
+            url, path, fmt, quality,
+            self.playlist_checkbox.isChecked(),
+            self.download_type_combo.currentText(),
+            self.subtitle_checkbox.isChecked(),
+            self.subtitle_lang_combo.currentText(),
+            self.clip_checkbox.isChecked(),
+            self.clip_start_input.text().strip(),
+            self.clip_end_input.text().strip(),
+            CLIP_MODES[self.clip_mode_combo.currentText()],
+            self.playlist_checkbox.isChecked() and self.sync_checkbox.isChecked()
+        )
+
+    def _on_thumbnail_ready(self, url, image):
+        # Bu arada başka bir videoya geçildiyse eski küçük resmi gösterme
+        if url == self.pending_thumb_url:
+            self.thumb_label.setPixmap(QPixmap.fromImage(image))
+
+    def start_download(self):
+        url = self.url_input.text().strip()
+        if not url:
+            self.show_error("Lütfen bir video URL’si giriniz.")
+            return
+        job = self._make_job(url)
+        if job is None:
+            return
+        if job.is_playlist:
+            # Girdiler bulundukça toplu indirme kuyruğunda paralel iner
+            self._submit_batch([job], "Oynatma listesi taranıyor...")
             return
 
         self.status_label.setText("İndirme başlatılıyor...")
@@ -415,15 +693,26 @@ class DownloaderApp(QWidget):
         self.download_btn.setEnabled(False)
         self.progress_bar.setValue(0)
 
+        self.job_store.add(job)
+        # Bilgi alındıysa tam hali disk önbelleğinde; indirme iş parçacığı oradan okur
         self.dl_thread = DownloadThread(
-            url, path, fmt, quality, is_playlist, download_type, subtitle, sub_lang,
-            clip_enabled, clip_start, clip_end
+            job, None, self.settings.get("progress_emit_hz", 4), self.job_store,
+            self.settings.get("connections_per_file", 4),
+            self.info_cache if self.info_cache.ttl > 0 else None
         )
         self.dl_thread.progress.connect(self.progress_bar.setValue)
         self.dl_thread.done.connect(self.download_done)
         self.dl_thread.speed_eta.connect(self.update_speed_eta) 
+        # Son işlem (ffmpeg) durdurulamaz; indirme bitince iptal kapanır
+        self.dl_thread.downloaded.connect(lambda: self.stop_btn.setEnabled(False))
+        self.stop_btn.setEnabled(True)
         self.dl_thread.start()
 
+    def cancel_download(self):
+        self.stop_btn.setEnabled(False)
+        self.status_label.setText("İndirme iptal ediliyor...")
+        self.dl_thread.job.cancel_token.cancel()
+
     def update_speed_eta(self, speed, eta):
         speed_str = f"{speed/1024/1024:.2f} MB/s" if speed else "-"
         if eta:
@@ -431,38 +720,191 @@ class DownloaderApp(QWidget):
             eta_str = f"{m} dk {s} sn"
         else:
             eta_str = "-"
-            self.speed_label.setText(f"Hız: {speed_str} | Kalan: {eta_str}")
+        self.speed_label.setText(f"Hız: {speed_str} | Kalan: {eta_str}")
+
+    def _on_batch_progress(self, percent, speed, eta):
+        # Tekli indirme sürüyorsa çubuk onun ilerlemesini gösterir
+        if self.download_btn.isEnabled():
+            self.progress_bar.setValue(percent)
+            self.update_speed_eta(speed, eta)
 
 
 
     def start_batch_download(self):
-        links = [line.strip() for line in self.multi_links_text.toPlainText().split('\n') if line.strip()]
+        text = self.multi_links_text.toPlainText()
+        if text.count('\n') >= IMPORT_THRESHOLD:
+            # Binlerce satır GUI iş parçacığında bölünmez; ön çözümleme de yapılmaz
+            template = self._make_job("")
+            if template is not None:
+                self._start_import(template, text=text)
+            return
+        links = [line.strip() for line in text.split('\n') if line.strip()]
         if not links:
             self.show_error("Çoklu indirme için en az bir Youtube linki girmelisiniz.")
             return
-        self.status_label.setText("Toplu indirme başlatılıyor...")
-        self.batch_queue = links
-        self._process_next_in_queue()
-
-    def _process_next_in_queue(self):
-        if not hasattr(self, "batch_queue") or not self.batch_queue:
-            self.status_label.setText("Tüm indirmeler tamamlandı.")
+        template = self._make_job("")
+        if template is None:
+            return
+        if template.is_playlist:
+            # Playlist'ler taranırken çözülür; burada yalnızca aynı bağlantılar elenir
+            unique = {}
+            for url in links:
+                unique.setdefault(playlist_key(url), url)
+            self._submit_batch([template.with_url(url) for url in unique.values()], "Toplu indirme başlatılıyor...")
+            return
+        # Ölü, gizli ve tekrar eden bağlantılar indirme başlamadan bulunur
+        self.batch_download_btn.setEnabled(False)
+        self.status_label.setText(f"Bağlantılar kontrol ediliyor (0/{len(links)})...")
+        thread = BatchResolveThread(links, self.info_cache if self.info_cache.ttl > 0 else None)
+        thread.progress.connect(
+            lambda done, total: self.status_label.setText(f"Bağlantılar kontrol ediliyor ({done}/{total})...")
+        )
+        thread.resolved.connect(
+            lambda resolved, failed, duplicates, template=template:
+            self._on_batch_resolved(template, resolved, failed, duplicates)
+        )
+        thread.finished.connect(lambda: self.batch_download_btn.setEnabled(True))
+        thread.finished.connect(lambda thread=thread: self.info_threads.discard(thread))
+        self.info_threads.add(thread)
+        thread.start()
+
+    def _on_batch_resolved(self, template, resolved, failed, duplicates):
+        for url, record in resolved:
+            self.prefetched.put(url, record)
+        if failed:
+            lines = [f"{url}\n    {error}" for url, error in failed[:10]]
+            if len(failed) > 10:
+                lines.append(f"... ve {len(failed) - 10} bağlantı daha")
+            report = f"{len(failed)} bağlantı çözümlenemedi:\n\n" + "\n".join(lines)
+            if not resolved:
+                self.status_label.setText("Hiçbir bağlantı indirilemiyor.")
+                QMessageBox.critical(self, "Bağlantı Hatası", report)
+                return
+            answer = QMessageBox.question(
+                self, "Bağlantı Hatası",
+                report + f"\n\nKalan {len(resolved)} video indirilsin mi?",
+                QMessageBox.Yes | QMessageBox.No
+            )
+            if answer != QMessageBox.Yes:
+                self.status_label.setText("Toplu indirme iptal edildi.")
+                return
+        jobs = []
+        for url, record in resolved:
+            job = template.with_url(url)
+            job.size_hint = size_hint(job, record)
+            jobs.append(job)
+        status = "Toplu indirme başlatılıyor..."
+        if duplicates:
+            status += f" ({len(duplicates)} tekrar eden bağlantı atlandı)"
+        self._submit_batch(jobs, status)
+
+    def _submit_batch(self, jobs, status):
+        if not self.scheduler.is_busy():
+            self.batch_total = self.batch_finished = self.batch_failed = self.batch_cancelled = 0
+        self.status_label.setText(status)
+        self.scheduler.submit(jobs)
+
+    def import_file_clicked(self):
+        paths, _ = QFileDialog.getOpenFileNames(
+            self, "URL listesi seçin", "",
+            "URL listeleri (*.txt *.csv *.tsv *.jsonl *.ndjson);;Tüm dosyalar (*)"
+        )
+        if not paths:
+            return
+        template = self._make_job("")
+        if template is not None:
+            self._start_import(template, paths=paths)
+
+    def _start_import(self, template, paths=(), text=""):
+        self.batch_download_btn.setEnabled(False)
+        self.import_btn.setEnabled(False)
+        self.status_label.setText("İçe aktarılıyor...")
+        thread = ImportThread(self.job_store, template, paths, text)
+        thread.progress.connect(self._on_import_progress)
+        thread.imported.connect(self._on_imported)
+        thread.error.connect(lambda message: self.show_error(f"Liste okunamadı: {message}"))
+        thread.finished.connect(lambda: self.batch_download_btn.setEnabled(True))
+        thread.finished.connect(lambda: self.import_btn.setEnabled(True))
+        thread.finished.connect(lambda thread=thread: self.info_threads.discard(thread))
+        self.info_threads.add(thread)
+        thread.start()
+
+    def _on_import_progress(self, lines, done, total):
+        percent = f" (%{done * 100 // total})" if total else ""
+        self.status_label.setText(f"İçe aktarılıyor: {lines} satır{percent}")
+
+    def _on_imported(self, batch, stats):
+        if batch is None:
+            self.status_label.setText("İçe aktarma iptal edildi.")
+            return
+        if not stats["added"]:
+            self.status_label.setText(f"İndirilecek yeni bağlantı yok ({describe(stats)}).")
             return
-        url = self.batch_queue.pop(0)
-        self.url_input.setText(url)
-        self.start_download()
-        QTimer.singleShot(300, lambda: None)
+        if not self.scheduler.is_busy():
+            self.batch_total = self.batch_finished = self.batch_failed = self.batch_cancelled = 0
+        self.status_label.setText(f"İçe aktarıldı: {describe(stats)}")
+        self.scheduler.submit_feed(BatchFeed(self.job_store, batch))
+
+    def _on_batch_jobs_added(self, count):
+        self.batch_total += count
+
+    def resume_unfinished_jobs(self):
+        jobs = self.job_store.unfinished()
+        batches = self.job_store.queued_batches()
+        count = len(jobs) + sum(n for _, n in batches)
+        if not count:
+            return
+        answer = QMessageBox.question(
+            self, "Yarım Kalan İndirmeler",
+            f"Önceki oturumdan yarım kalan {count} indirme bulundu.\n"
+            "Kaldığı yerden devam edilsin mi?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if answer != QMessageBox.Yes:
+            for job in jobs:
+                self.job_store.set_state(job, "cancelled")
+            for batch, _ in batches:
+                self.job_store.cancel_batch(batch)
+            return
+        self._submit_batch(jobs, f"Yarım kalan {count} indirme devam ettiriliyor...")
+        for batch, _ in batches:
+            self.scheduler.submit_feed(BatchFeed(self.job_store, batch))
+
+    def _on_batch_job_done(self, job, message, file_path, video_title):
+        self.batch_finished += 1
+        if file_path:
+            self.add_to_history(file_path)
+        elif job.cancel_token.reason == "cancel":
+            self.batch_cancelled += 1
+        else:
+            self.batch_failed += 1
+        self.status_label.setText(
+            f"Toplu indirme: {self.batch_finished}/{self.batch_total} tamamlandı"
+            + (f" ({self.batch_failed} hata)" if self.batch_failed else "")
+            + (f" ({self.batch_cancelled} iptal)" if self.batch_cancelled else "")
+        )
+
+    def _on_batch_job_paused(self, job):
+        # Devam ettirilince jobs_added ile yeniden sayılır
+        self.batch_total -= 1
+        self.status_label.setText(f"Duraklatıldı: {job.url}")
+
+    def _on_batch_finished(self):
+        succeeded = self.batch_finished - self.batch_failed - self.batch_cancelled
+        msg = f"Tüm indirmeler tamamlandı. ({succeeded}/{self.batch_total} başarılı)"
+        if self.scheduler.paused:
+            msg += f"\n{len(self.scheduler.paused)} indirme duraklatıldı; kuyruktan devam ettirilebilir."
+        if AUDIO_STATS.summary():
+            msg += "\n" + AUDIO_STATS.summary()
+        self.status_label.setText(msg)
 
     def download_done(self, message, file_path, video_title):
         self.status_label.setText(message)
         self.download_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
         if file_path:
             self.add_to_history(file_path)
             QMessageBox.information(self, "İndirme Bitti", f"'{video_title}' başarıyla indirildi!\n\n{file_path}")
-        if hasattr(self, "batch_queue") and self.batch_queue:
-            QTimer.singleShot(1000, self._process_next_in_queue)
-        else:
-            self.batch_queue = []
 
     def add_to_history(self, file_path):
         if ";" in file_path:
@@ -485,6 +927,38 @@ class DownloaderApp(QWidget):
             item.setToolTip(file_)
             self.history_list.addItem(item)
 
+    def refresh_queue(self):
+        items = self.scheduler.snapshot()
+        self.queue_list.clear()
+        for job, state in items[:QUEUE_VIEW_LIMIT]:
+            item = QListWidgetItem(f"{QUEUE_STATES[state]}  {job.url}")
+            item.setToolTip(job.url)
+            item.setData(Qt.UserRole, (job.id, state))
+            self.queue_list.addItem(item)
+        if len(items) > QUEUE_VIEW_LIMIT:
+            self.queue_list.addItem(QListWidgetItem(f"... ve {len(items) - QUEUE_VIEW_LIMIT} iş daha"))
+        self.queue_label.setVisible(bool(items))
+        self.queue_list.setVisible(bool(items))
+
+    def _show_queue_menu(self, pos):
+        item = self.queue_list.itemAt(pos)
+        if item is None or not item.data(Qt.UserRole):
+            return
+        job_id, state = item.data(Qt.UserRole)
+        menu = QMenu(self)
+        if state == "paused":
+            menu.addAction("Devam Et", lambda: self.scheduler.resume(job_id))
+        elif state in ("running", "queued"):
+            # Çalışan iş duraklatılınca yuvası sıradaki (en öncelikli) işe geçer
+            menu.addAction("Duraklat", lambda: self.scheduler.pause(job_id))
+        if state == "queued":
+            menu.addAction("En Öne Al", lambda: self.scheduler.move(job_id, True))
+            menu.addAction("En Sona Al", lambda: self.scheduler.move(job_id, False))
+        if state != "processing":
+            menu.addAction("İptal Et", lambda: self.scheduler.cancel(job_id))
+        if not menu.isEmpty():
+            menu.exec_(self.queue_list.viewport().mapToGlobal(pos))
+
     def open_history_file(self, item):
         file_path = item.toolTip()
         if os.path.exists(file_path):
@@ -502,21 +976,28 @@ class DownloaderApp(QWidget):
         self.refresh_history()
         QMessageBox.information(self, "Geçmiş Temizlendi", "İndirme geçmişi başarıyla temizlendi.")
 
+    def clear_cache_clicked(self):
+        self.info_cache.clear()
+        self.thumb_cache.clear()
+        self.prefetched.clear()
+        QMessageBox.information(self, "Önbellek Temizlendi", "Video bilgisi önbelleği temizlendi.")
+
+    def show_stats(self):
+        QMessageBox.information(
+            self, "İstatistikler", METRICS.summary() or "Bu oturumda henüz ölçüm yok."
+        )
+
     def show_about(self):
         QMessageBox.information(self, "Hakkında", "easyytd v1.0\nYouTube Video, Müzik ve Shorts İndirici\nYigithan Ozturk\nhttps://github.com/YigithanOzturk")
 
     def check_for_update(self):
-        
-        try:
-            version_url = "https://raw.githubusercontent.com/YigithanOzturk/easyytd/main/VERSION"
-            response = requests.get(version_url, timeout=3)
-            if response.status_code == 200:
-                latest_version = response.text.strip()
-                local_version = "1.0"
-                if local_version != latest_version:
-                    QMessageBox.information(self, "Yeni Sürüm Mevcut", f"Yeni sürüm ({latest_version}) mevcut! Github'dan indiriniz.")
-        except Exception:
-            pass
+        self.update_thread = UpdateCheckThread()
+        self.update_thread.update_available.connect(
+            lambda latest_version: QMessageBox.information(
+                self, "Yeni Sürüm Mevcut", f"Yeni sürüm ({latest_version}) mevcut! Github'dan indiriniz."
+            )
+        )
+        self.update_thread.start()
 
     def clipboard_auto_paste(self):
         clipboard = QApplication.clipboard()
@@ -528,8 +1009,8 @@ class DownloaderApp(QWidget):
         if event.mimeData().hasText():
             event.acceptProposedAction()
     def dropEvent(self, event):
-        text = event.mimeData().text()
-        if "youtube.com" in text or "youtu.be" in text:
+        text = event.mimeData().text().strip()
+        if looks_like_url(text):
             self.url_input.setText(text)
 
  
@@ -0,0 +1,167 @@
+import io
+import os
+import csv
+import sys
+import json
+import itertools
+
+from utils import looks_like_url, canonical_id, playlist_key
+
+# JSON satırlarında URL'nin arandığı anahtarlar (yt-dlp --dump-json çıktısı dahil)
+URL_KEYS = ("url", "webpage_url", "original_url", "link")
+# JobStore'a tek işlemde yazılan satır sayısı; ilerleme de bu aralıkla bildirilir
+IMPORT_CHUNK = 500
+_DELIMITERS = {".csv": ",", ".tsv": "\t"}
+
+
+def _counted(f, stats):
+    # Satırlar okundukça bayt (metinde karakter) sayılır; dosya tek seferde belleğe alınmaz
+    for raw in f:
+        stats["bytes"] += len(raw)
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8", errors="replace")
+        yield raw.lstrip("\ufeff")
+
+
+def _from_line(line):
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if line.startswith("{"):
+        # JSONL: {"url": ...} ya da yt-dlp bilgi sözlüğü
+        try:
+            obj = json.loads(line)
+        except ValueError:
+            return line
+        for key in URL_KEYS:
+            value = obj.get(key) if isinstance(obj, dict) else None
+            if isinstance(value, str) and value.strip():
+                return value.strip()
+        return line
+    # URL'lerde virgül ve noktalı virgül geçebilir; yalnızca boşlukla ayrılır
+    fields = line.split()
+    return next((field for field in fields if looks_like_url(field)), fields[0])
+
+
+def _sniff(line):
+    # Uzantısız girdi (stdin, yapıştırma) yalnızca CSV başlığıyla ya da tırnakla başlıyorsa CSV sayılır
+    line = line.strip()
+    if line.startswith('"') or (not line.startswith("{") and not any(looks_like_url(f) for f in line.split())):
+        for delimiter in ("\t", ","):
+            if delimiter in line:
+                return delimiter
+    return None
+
+
+def _candidates(lines, delimiter):
+    if delimiter is None:
+        # İlk dolu satıra bakılır; okunan satırlar akışa geri eklenir
+        head = []
+        for line in lines:
+            head.append(line)
+            if line.strip() and not line.lstrip().startswith("#"):
+                delimiter = _sniff(line)
+                break
+        lines = itertools.chain(head, lines)
+    if not delimiter:
+        for line in lines:
+            yield _from_line(line)
+        return
+    first = True
+    for row in csv.reader(lines, delimiter=delimiter):
+        cells = [cell.strip() for cell in row if cell.strip()]
+        if not cells or cells[0].startswith("#"):
+            continue
+        url = next((cell for cell in cells if looks_like_url(cell)), None)
+        if url is None and first:
+            # URL içermeyen ilk satır başlıktır
+            first = False
+            continue
+        first = False
+        yield url or cells[0]
+
+
+def import_urls(store, template, paths=(), text="", on_progress=None, should_stop=None):
+    """Metin, CSV/TSV ve JSONL URL listelerini akış halinde JobStore'a aktarır.
+
+    Satırlar okundukça doğrulanır; aynı video zaten kuyruktaysa ya da
+    indirilmişse atlanır, kalanlar IMPORT_CHUNK'lık işlemlerle yeni bir
+    gruba yazılır. Bellek kullanımı dosya boyutundan bağımsızdır; işler
+    jobstore.BatchFeed ile kuyruğa parça parça alınır.
+    `paths` içinde '-' stdin'dir. Dönüş: (grup, istatistikler); `should_stop`
+    True dönerse yazılanlar iptal edilir ve grup None olur.
+    """
+    stats = {
+        "lines": 0, "added": 0, "duplicate": 0, "queued": 0, "downloaded": 0, "invalid": 0,
+        "bytes": 0, "size": len(text),
+    }
+    sources = []
+    for path in paths:
+        if path == "-":
+            sources.append((sys.stdin.buffer, None))
+        else:
+            stats["size"] += os.path.getsize(path)
+            sources.append((path, _DELIMITERS.get(os.path.splitext(path)[1].lower())))
+    if text:
+        sources.append((io.StringIO(text), None))
+
+    batch = store.new_batch()
+    pending = []
+    keys = set()
+
+    def flush():
+        if pending:
+            store.add_many(pending, batch)
+            stats["added"] += len(pending)
+            pending.clear()
+        keys.clear()
+
+    for source, delimiter in sources:
+        f = open(source, "rb") if isinstance(source, str) else source
+        try:
+            for url in _candidates(_counted(f, stats), delimiter):
+                if url is None:
+                    continue
+                stats["lines"] += 1
+                if stats["lines"] % IMPORT_CHUNK == 0:
+                    if should_stop and should_stop():
+                        store.cancel_batch(batch)
+                        return None, stats
+                    if on_progress:
+                        on_progress(stats)
+                if not looks_like_url(url):
+                    stats["invalid"] += 1
+                    continue
+                # Girdide tekrar edenler ("duplicate") JobStore'daki eski işlerden ayrı sayılır
+                key = playlist_key(url) if template.is_playlist else canonical_id(url)
+                known = "duplicate" if key in keys or store.known(key, batch=batch) else store.known(key)
+                if known == "downloaded" and template.is_playlist:
+                    # Bitmiş bir playlist'e sonradan girdi eklenmiş olabilir; yeniden taranır
+                    known = None
+                if known:
+                    stats[known] += 1
+                    continue
+                keys.add(key)
+                pending.append(template.with_url(url))
+                if len(pending) >= IMPORT_CHUNK:
+                    flush()
+        finally:
+            if f is not source:
+                f.close()
+    flush()
+    if on_progress:
+        on_progress(stats)
+    return batch, stats
+
+
+def describe(stats):
+    parts = [f"{stats['added']} yeni"]
+    if stats["duplicate"]:
+        parts.append(f"{stats['duplicate']} tekrar")
+    if stats["queued"]:
+        parts.append(f"{stats['queued']} zaten kuyrukta")
+    if stats["downloaded"]:
+        parts.append(f"{stats['downloaded']} zaten indirilmiş")
+    if stats["invalid"]:
+        parts.append(f"{stats['invalid']} geçersiz")
+    return ", ".join(parts)
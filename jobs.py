@@ -0,0 +1,189 @@
+from urllib.parse import urlparse
+
+# Aynı CDN'e giden kısa/alternatif alan adları tek bir host sayılır
+HOST_ALIASES = {
+    "youtu.be": "youtube.com",
+    "music.youtube.com": "youtube.com",
+    "vm.tiktok.com": "tiktok.com",
+    "x.com": "twitter.com",
+}
+
+
+def host_key(url):
+    if "://" not in url:
+        # Şemasız "alan.adi/yol" girdileri de host'una göre sınırlansın
+        url = "https://" + url.strip()
+    try:
+        host = (urlparse(url).hostname or "").lower()
+    except Exception:
+        return ""
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    return HOST_ALIASES.get(host, host)
+
+
+class CancelToken:
+    """Çalışan bir işi durdurma isteği; indirme kancalarında yoklanır.
+
+    "cancel" yarım dosyaları siler, "pause" onları korur ve iş sonra
+    kaldığı yerden devam eder.
+    """
+
+    def __init__(self):
+        self.reason = None
+
+    def cancel(self):
+        self.reason = "cancel"
+
+    def pause(self):
+        # İptal, duraklatmanın önüne geçer
+        if self.reason is None:
+            self.reason = "pause"
+
+    def check(self):
+        if self.reason:
+            from cancel import JobStopped
+
+            raise JobStopped(self.reason)
+
+
+class DownloadJob:
+    _next_id = 1
+
+    def __init__(
+        self, url, download_path, fmt, quality, is_playlist, download_type, subtitle, sub_lang,
+        clip_enabled=False, clip_start="", clip_end="", clip_mode="fast", sync=False
+    ):
+        self.id = DownloadJob._next_id
+        DownloadJob._next_id += 1
+        self.url = url
+        self.download_path = download_path
+        self.fmt = fmt
+        self.quality = quality
+        self.is_playlist = is_playlist
+        self.download_type = download_type
+        self.subtitle = subtitle
+        self.sub_lang = sub_lang
+        self.clip_enabled = clip_enabled
+        self.clip_start = clip_start
+        self.clip_end = clip_end
+        self.clip_mode = clip_mode
+        # Playlist/kanal senkronizasyonu: yalnızca arşivde olmayan girdiler indirilir
+        self.sync = sync
+        self.host = host_key(url)
+        # Kalıcı iş kaydı (JobStore) ve devam ederken zorlanacak format
+        self.store_id = None
+        self.resume_format = None
+        # Kuyrukta büyük öncelik önce başlar; eşitlikte ekleme sırası
+        self.priority = 0
+        # Önceden çözümlemeden gelen tahmini boyut (bayt); 0 = bilinmiyor
+        self.size_hint = 0
+        self.cancel_token = CancelToken()
+        # Duraklatılan işin diskte bıraktığı yarım dosyalar; iptalde silinir
+        self.partial_files = ()
+
+    def to_dict(self):
+        return {
+            "url": self.url,
+            "download_path": self.download_path,
+            "fmt": self.fmt,
+            "quality": self.quality,
+            "is_playlist": self.is_playlist,
+            "download_type": self.download_type,
+            "subtitle": self.subtitle,
+            "sub_lang": self.sub_lang,
+            "clip_enabled": self.clip_enabled,
+            "clip_start": self.clip_start,
+            "clip_end": self.clip_end,
+            "clip_mode": self.clip_mode,
+            "sync": self.sync,
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(**d)
+
+    def with_url(self, url):
+        # Aynı seçeneklerle başka bir URL için yeni iş
+        return DownloadJob(
+            url, self.download_path, self.fmt, self.quality, self.is_playlist,
+            self.download_type, self.subtitle, self.sub_lang,
+            self.clip_enabled, self.clip_start, self.clip_end, self.clip_mode, self.sync
+        )
+
+    def entry_job(self, url):
+        # Playlist'ten açılan tek video; senkronizasyon playlist taranırken yapıldı
+        job = self.with_url(url)
+        job.is_playlist = False
+        job.sync = False
+        return job
+
+
+class JobQueue:
+    """Bekleyen işleri tutar, host başına eşzamanlılık sınırını uygular."""
+
+    def __init__(self, per_host_limit=2):
+        self.per_host_limit = max(1, int(per_host_limit))
+        self.pending = []
+        self.running = {}
+        self._host_counts = {}
+
+    def extend(self, jobs):
+        # Birlikte eklenenlerde büyük dosyalar önce başlar; sonda tek başına uzun
+        # süren bir indirme kalmaz. Boyutu bilinmeyenler sıralarını korur, sona geçer
+        self.pending.extend(sorted(jobs, key=lambda job: -job.size_hint))
+        self._reorder()
+
+    def _reorder(self):
+        # Kararlı sıralama: aynı öncelikte ekleme sırası korunur, sıralı listede O(n)
+        self.pending.sort(key=lambda job: -job.priority)
+
+    def find(self, job_id):
+        return next((job for job in self.pending if job.id == job_id), None)
+
+    def remove(self, job_id):
+        job = self.find(job_id)
+        if job is not None:
+            self.pending.remove(job)
+        return job
+
+    def set_priority(self, job_id, priority):
+        job = self.find(job_id)
+        if job is None:
+            return False
+        job.priority = priority
+        self._reorder()
+        return True
+
+    def move(self, job_id, front=True):
+        # Öne/sona almak, önceliği kuyruktaki en yüksek/en düşük değerin ötesine taşır
+        if not self.pending:
+            return False
+        priorities = [job.priority for job in self.pending]
+        return self.set_priority(job_id, max(priorities) + 1 if front else min(priorities) - 1)
+
+    def next_ready(self):
+        # Sıradaki ilk uygun iş; dolu host'lara ait işler atlanır ama sırası korunur
+        for i, job in enumerate(self.pending):
+            if self._host_counts.get(job.host, 0) < self.per_host_limit:
+                del self.pending[i]
+                self.running[job.id] = job
+                self._host_counts[job.host] = self._host_counts.get(job.host, 0) + 1
+                return job
+        return None
+
+    def mark_done(self, job):
+        if self.running.pop(job.id, None) is None:
+            return
+        count = self._host_counts.get(job.host, 1) - 1
+        if count > 0:
+            self._host_counts[job.host] = count
+        else:
+            self._host_counts.pop(job.host, None)
+
+    def running_count(self):
+        return len(self.running)
+
+    def is_idle(self):
+        return not self.pending and not self.running
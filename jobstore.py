@@ -0,0 +1,241 @@
+import json
+import time
+import sqlite3
+import threading
+
+from jobs import DownloadJob
+from utils import canonical_id, playlist_key
+
+# Yeniden başlatmada devam ettirilecek durumlar; "processing" işlerde
+# yt-dlp indirilmiş dosyayı bulur, yalnızca son işlem tekrarlanır;
+# "paused" işlerin yarım dosyaları bilerek korunur
+UNFINISHED_STATES = ("queued", "running", "processing", "paused")
+_UNFINISHED_SQL = ", ".join("?" * len(UNFINISHED_STATES))
+
+
+def job_key(job):
+    # Playlist işleri liste kimliğiyle, diğerleri videonun kanonik kimliğiyle anahtarlanır
+    return playlist_key(job.url) if job.is_playlist else canonical_id(job.url)
+
+
+class JobStore:
+    """İndirme işlerini SQLite'ta saklar; çökme/kapanma sonrası kuyruk kaybolmaz."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # WAL: her durum değişikliği ayrı, kısa ve çökmeye dayanıklı bir yazma
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                options TEXT NOT NULL,
+                state TEXT NOT NULL,
+                format_id TEXT,
+                partial_path TEXT,
+                files TEXT,
+                error TEXT,
+                created REAL NOT NULL,
+                updated REAL NOT NULL
+            )"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs(state)")
+        # Eski veritabanlarına sonradan eklenen sütunlar: kanonik video anahtarı, içe aktarma
+        # grubu, girdinin açıldığı playlist işi ve playlist'in tarama imleci (verilen girdi sayısı)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (("key", "TEXT"), ("batch", "INTEGER"), ("parent", "INTEGER"), ("cursor", "INTEGER")):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS jobs_key ON jobs(key)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS jobs_batch ON jobs(batch, state, id)")
+        # İndirilmiş videoların kimlikleri ("youtube abc123"); birincil anahtar aramayı dizinli yapar
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS archive (id TEXT PRIMARY KEY, added REAL NOT NULL) WITHOUT ROWID"
+        )
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self.conn.execute(sql, params)
+
+    def add(self, job):
+        now = time.time()
+        cur = self._execute(
+            "INSERT INTO jobs (url, options, state, key, created, updated) VALUES (?, ?, 'queued', ?, ?, ?)",
+            (job.url, json.dumps(job.to_dict()), job_key(job), now, now)
+        )
+        job.store_id = cur.lastrowid
+        return job
+
+    def add_many(self, jobs, batch=None, parent=None):
+        # `parent` (playlist işi) verilirse girdiler ona bağlanır, imleci aynı işlemde ilerler
+        parent_id = parent.store_id if parent is not None else None
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                now = time.time()
+                for job in jobs:
+                    cur = self.conn.execute(
+                        "INSERT INTO jobs (url, options, state, key, batch, parent, created, updated) "
+                        "VALUES (?, ?, 'queued', ?, ?, ?, ?, ?)",
+                        (job.url, json.dumps(job.to_dict()), job_key(job), batch, parent_id, now, now)
+                    )
+                    job.store_id = cur.lastrowid
+                if parent_id is not None:
+                    self.conn.execute(
+                        "UPDATE jobs SET cursor = COALESCE(cursor, 0) + ?, updated = ? WHERE id = ?",
+                        (len(jobs), now, parent_id)
+                    )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return jobs
+
+    def set_state(self, job, state, files=None, error=None):
+        if job.store_id is None:
+            return
+        self._execute(
+            "UPDATE jobs SET state = ?, files = COALESCE(?, files), error = ?, updated = ? WHERE id = ?",
+            (state, json.dumps(files) if files is not None else None, error, time.time(), job.store_id)
+        )
+
+    def update_partial(self, job, format_id, partial_path):
+        if job.store_id is None:
+            return
+        self._execute(
+            "UPDATE jobs SET format_id = ?, partial_path = ?, updated = ? WHERE id = ?",
+            (format_id, partial_path, time.time(), job.store_id)
+        )
+
+    def unfinished(self):
+        # İçe aktarılan grupların bekleyen işleri hariç; onlar queued_batches() ile parça parça yüklenir
+        rows = self._execute(
+            f"SELECT id, options, format_id FROM jobs WHERE state IN ({_UNFINISHED_SQL}) "
+            "AND NOT (batch IS NOT NULL AND state = 'queued') ORDER BY id",
+            UNFINISHED_STATES
+        ).fetchall()
+        return self._jobs(rows)
+
+    def queued_batches(self):
+        """Bekleyen işi kalmış içe aktarma grupları: [(grup, iş sayısı)]."""
+        return self._execute(
+            "SELECT batch, COUNT(*) FROM jobs WHERE batch IS NOT NULL AND state = 'queued' GROUP BY batch ORDER BY batch"
+        ).fetchall()
+
+    def _jobs(self, rows):
+        jobs = []
+        for store_id, options, format_id in rows:
+            try:
+                job = DownloadJob.from_dict(json.loads(options))
+            except (ValueError, TypeError, KeyError):
+                continue
+            job.store_id = store_id
+            # Aynı format seçilirse yt-dlp .part dosyasına HTTP Range ile devam eder
+            job.resume_format = format_id
+            jobs.append(job)
+        return jobs
+
+    def known(self, key, parent=None, batch=None):
+        """job_key anahtarlı video kuyrukta ise "queued", indirilmişse "downloaded", değilse None.
+
+        `parent` (playlist işinin store_id'si) ya da `batch` (içe aktarma grubu)
+        verilirse yalnızca oradan daha önce açılmış işe bakılır; durumu ne olursa
+        olsun "queued" döner.
+        """
+        if parent is not None or batch is not None:
+            column, value = ("parent", parent) if parent is not None else ("batch", batch)
+            row = self._execute(f"SELECT 1 FROM jobs WHERE key = ? AND {column} = ? LIMIT 1", (key, value)).fetchone()
+            return "queued" if row else None
+        row = self._execute(
+            f"SELECT state IN ({_UNFINISHED_SQL}) FROM jobs WHERE key = ? AND (state = 'done' OR state IN ({_UNFINISHED_SQL})) "
+            "ORDER BY 1 DESC LIMIT 1",
+            (*UNFINISHED_STATES, key, *UNFINISHED_STATES)
+        ).fetchone()
+        if row:
+            return "queued" if row[0] else "downloaded"
+        # Arşiv yt-dlp kimliklerini tutar ("youtube X"); yalnızca YouTube anahtarları çevrilebilir
+        if key.startswith("youtube:") and self._execute(
+            "SELECT 1 FROM archive WHERE id = ?", ("youtube " + key[len("youtube:"):],)
+        ).fetchone():
+            return "downloaded"
+        return None
+
+    def playlist_cursor(self, job):
+        # Playlist'ten önceki çalıştırmalarda verilmiş girdi sayısı
+        if job.store_id is None:
+            return 0
+        row = self._execute("SELECT COALESCE(cursor, 0) FROM jobs WHERE id = ?", (job.store_id,)).fetchone()
+        return row[0] if row else 0
+
+    def new_batch(self):
+        return self._execute("SELECT COALESCE(MAX(batch), 0) + 1 FROM jobs").fetchone()[0]
+
+    def queued_in_batch(self, batch, after=0, limit=200):
+        rows = self._execute(
+            "SELECT id, options, format_id FROM jobs WHERE batch = ? AND state = 'queued' AND id > ? "
+            "ORDER BY id LIMIT ?",
+            (batch, after, limit)
+        ).fetchall()
+        return self._jobs(rows)
+
+    def cancel_batch(self, batch):
+        self._execute(
+            "UPDATE jobs SET state = 'cancelled', updated = ? WHERE batch = ? AND state = 'queued'",
+            (time.time(), batch)
+        )
+
+    def prune(self, max_age=7 * 24 * 3600):
+        self._execute(
+            f"DELETE FROM jobs WHERE state NOT IN ({_UNFINISHED_SQL}) AND updated < ?",
+            (*UNFINISHED_STATES, time.time() - max_age)
+        )
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+class BatchFeed:
+    """İçe aktarılmış bir grubun bekleyen işlerini sayfa sayfa okur.
+
+    Kuyruk tüm grubu bellekte tutmaz; yuvalar boşaldıkça take() ile
+    sıradaki işler JobStore'dan yüklenir.
+    """
+
+    def __init__(self, store, batch):
+        self.store = store
+        self.batch = batch
+        self.cursor = 0
+
+    def take(self, limit):
+        jobs = self.store.queued_in_batch(self.batch, self.cursor, limit)
+        if jobs:
+            self.cursor = jobs[-1].store_id
+        return jobs
+
+
+class DownloadArchive:
+    """yt-dlp'nin `download_archive` seçeneğine verilen, JobStore tabanlı arşiv.
+
+    yt-dlp yalnızca `in` ve `add()` kullanır. `check=False` iken arşive
+    yazılır ama hiçbir video atlanmaz; normal indirmeler de sonraki
+    senkronizasyonlar için kaydedilmiş olur. `record=False` ise yazmaz.
+    """
+
+    def __init__(self, store, check=True, record=True):
+        self.store = store
+        self.check = check
+        self.record = record
+
+    def __contains__(self, vid_id):
+        if not self.check:
+            return False
+        return self.store._execute("SELECT 1 FROM archive WHERE id = ?", (vid_id,)).fetchone() is not None
+
+    def add(self, vid_id):
+        if not self.record:
+            return
+        self.store._execute("INSERT OR IGNORE INTO archive (id, added) VALUES (?, ?)", (vid_id, time.time()))
@@ -1,12 +1,43 @@
-from PyQt5.QtWidgets import QApplication
-from gui import DownloaderApp
+import time
+_START = time.perf_counter()
+
+import os
 import sys
 
-def main():
-    app = QApplication(sys.argv)
+
+def report_startup(stage_times):
+    # --startup-time: soğuk açılış süresini ölçüp çıkar (regresyon takibi için)
+    parts = " | ".join(f"{name}: {t * 1000:.0f} ms" for name, t in stage_times)
+    print(f"Açılış süresi -> {parts}", file=sys.stderr)
+
+
+def run_gui():
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QTimer
+    from gui import DownloaderApp
+
+    measure = "--startup-time" in sys.argv or os.environ.get("EASYYTD_STARTUP_TIME") == "1"
+    argv = [a for a in sys.argv if a != "--startup-time"]
+    stages = [("içe aktarma", time.perf_counter() - _START)]
+    app = QApplication(argv)
     win = DownloaderApp()
+    stages.append(("pencere oluşturma", time.perf_counter() - _START))
     win.show()
-    sys.exit(app.exec_())
+    if measure:
+        def first_frame():
+            stages.append(("ilk çizim", time.perf_counter() - _START))
+            report_startup(stages)
+            app.quit()
+        QTimer.singleShot(0, first_frame)
+    return app.exec_()
+
+
+def main():
+    # "download" alt komutu: PyQt yüklenmeden, arayüzsüz indirme
+    if sys.argv[1:2] == ["download"]:
+        from cli import main as cli_main
+        return cli_main(sys.argv[2:])
+    return run_gui()
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,147 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+from utils import format_bytes
+
+# Span türleri ve süresinin neye bağlı olduğu (yavaş bir toplu indirmenin
+# ağ, CPU ya da disk kaynaklı olduğunu ayırmak için)
+KINDS = {
+    "extract": ("Bilgi çözümleme", "ağ"),
+    "download": ("İndirme", "ağ"),
+    "merge": ("Birleştirme", "disk"),
+    "remux": ("Kap dönüştürme", "disk"),
+    "clip": ("Kesim", "disk"),
+    "transcode": ("Yeniden kodlama", "CPU"),
+}
+
+
+class MetricsRecorder:
+    """İşlerin zaman aralıklarını (span) toplar ve dışa aktarır.
+
+    Her span JSON satırı olarak `log_path`'e eklenir; `textfile` verilirse
+    türe göre toplamlar Prometheus textfile biçiminde yazılır. Bellekte
+    yalnızca tür başına toplamlar tutulur.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.log_path = None
+        self.textfile = None
+        self.totals = {}
+
+    def configure(self, log_path=None, textfile=None):
+        with self._lock:
+            self.log_path = log_path or None
+            self.textfile = textfile or None
+
+    def record(self, job, kind, seconds, nbytes=None, error=None, **fields):
+        seconds = max(0.0, seconds)
+        span = {
+            "ts": round(time.time(), 3),
+            "job": getattr(job, "store_id", None) or getattr(job, "id", None),
+            "url": getattr(job, "url", None),
+            "kind": kind,
+            "seconds": round(seconds, 4),
+            "bytes": nbytes,
+            "throughput": round(nbytes / seconds) if nbytes and seconds > 0 and not error else None,
+            "error": error,
+        }
+        span.update((k, v) for k, v in fields.items() if v is not None)
+        with self._lock:
+            total = self.totals.setdefault(kind, {"count": 0, "seconds": 0.0, "bytes": 0, "errors": 0})
+            total["count"] += 1
+            total["seconds"] += seconds
+            # Hatalı span'lerin baytı hız ortalamasını bozmasın
+            total["bytes"] += 0 if error else nbytes or 0
+            total["errors"] += 1 if error else 0
+            if self.log_path:
+                try:
+                    with open(self.log_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(span, ensure_ascii=False) + "\n")
+                except OSError:
+                    pass
+            if self.textfile:
+                self._write_textfile()
+        return span
+
+    def _write_textfile(self):
+        lines = []
+        for name, key, help_text in (
+            ("easyytd_span_seconds_total", "seconds", "Time spent per span kind"),
+            ("easyytd_span_bytes_total", "bytes", "Bytes processed per span kind"),
+            ("easyytd_spans_total", "count", "Number of spans per kind"),
+            ("easyytd_span_errors_total", "errors", "Failed spans per kind"),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for kind, total in sorted(self.totals.items()):
+                lines.append(f'{name}{{kind="{kind}"}} {total[key]}')
+        # node_exporter yarım dosya okumasın diye atomik yazılır
+        tmp = f"{self.textfile}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            os.replace(tmp, self.textfile)
+        except OSError:
+            pass
+
+    def summary(self):
+        with self._lock:
+            totals = {kind: dict(total) for kind, total in self.totals.items()}
+        if not totals:
+            return None
+        lines = []
+        bound = {}
+        for kind, total in sorted(totals.items(), key=lambda kv: -kv[1]["seconds"]):
+            label, resource = KINDS.get(kind, (kind, "diğer"))
+            bound[resource] = bound.get(resource, 0.0) + total["seconds"]
+            line = f"{label}: {total['count']} kez, {total['seconds']:.1f} sn"
+            if total["bytes"]:
+                line += f", {format_bytes(total['bytes'])}"
+                if total["seconds"] > 0:
+                    line += f" ({format_bytes(total['bytes'] / total['seconds'])}/s)"
+            if total["errors"]:
+                line += f", {total['errors']} hata"
+            lines.append(line)
+        all_seconds = sum(bound.values())
+        if all_seconds > 0:
+            shares = sorted(bound.items(), key=lambda kv: -kv[1])
+            lines.append("Süre dağılımı: " + ", ".join(f"{r} %{s / all_seconds * 100:.0f}" for r, s in shares))
+        return "\n".join(lines)
+
+
+METRICS = MetricsRecorder()
+
+
+class JobMetrics:
+    """Tek bir işin span'lerini METRICS'e bağlar."""
+
+    def __init__(self, job, recorder=METRICS):
+        self.job = job
+        self.recorder = recorder
+
+    def add(self, kind, seconds, nbytes=None, error=None, **fields):
+        return self.recorder.record(self.job, kind, seconds, nbytes, error, **fields)
+
+    @contextmanager
+    def span(self, kind, nbytes=None, **fields):
+        # Bloğun içinde alanlar (ör. cpu) güncellenebilir; hata da kaydedilir
+        fields = dict(fields, nbytes=nbytes)
+        started = time.perf_counter()
+        try:
+            yield fields
+        except BaseException as e:
+            fields["error"] = str(e) or type(e).__name__
+            raise
+        finally:
+            self.add(kind, time.perf_counter() - started, **fields)
+
+
+def file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
@@ -0,0 +1,21 @@
+import threading
+
+_session = None
+_lock = threading.Lock()
+
+
+def get_session():
+    # Tüm küçük HTTP istekleri (küçük resim, sürüm kontrolü vb.) aynı bağlantı havuzunu kullanır
+    global _session
+    with _lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["User-Agent"] = "easyytd"
+            _session = session
+        return _session
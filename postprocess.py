@@ -0,0 +1,236 @@
+import os
+import time
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# faststart (moov atomunu başa taşıma) yalnızca bu kaplarda anlamlı
+MP4_FAMILY = ("mp4", "m4a", "mov")
+
+# Ses kodeği -> yeniden kodlamadan kopyalanabileceği kap
+PASSTHROUGH_EXT = {"aac": "m4a", "alac": "m4a", "opus": "ogg", "vorbis": "ogg"}
+_CODEC_PREFIXES = (
+    ("mp4a", "aac"), ("aac", "aac"), ("alac", "alac"), ("opus", "opus"),
+    ("vorbis", "vorbis"), ("mp3", "mp3"), ("flac", "flac"),
+)
+# Henüz ölçüm yokken: libmp3lame 192k, ortam saniyesi başına CPU saniyesi
+DEFAULT_TRANSCODE_COST = 0.03
+
+
+class AudioStats:
+    """Ses kopyalamayla (passthrough) kazanılan CPU süresini izler.
+
+    Kazanç, bu oturumda ölçülen gerçek mp3 kodlama maliyetiyle (CPU sn /
+    ortam sn) tahmin edilir; ölçüm yoksa DEFAULT_TRANSCODE_COST kullanılır.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.copied = 0
+        self.copied_seconds = 0.0
+        self.transcoded = 0
+        self.transcoded_seconds = 0.0
+        self.transcode_cpu = 0.0
+
+    def add_copy(self, media_seconds):
+        with self._lock:
+            self.copied += 1
+            self.copied_seconds += media_seconds or 0.0
+
+    def add_transcode(self, media_seconds, cpu_seconds):
+        with self._lock:
+            self.transcoded += 1
+            self.transcoded_seconds += media_seconds or 0.0
+            self.transcode_cpu += cpu_seconds
+
+    def transcode_cost(self):
+        if self.transcoded_seconds > 0:
+            return self.transcode_cpu / self.transcoded_seconds
+        return DEFAULT_TRANSCODE_COST
+
+    def saved_cpu(self):
+        return self.copied_seconds * self.transcode_cost()
+
+    def summary(self):
+        if not self.copied:
+            return None
+        return (
+            f"Ses: {self.copied} dosya kodlanmadan kopyalandı, {self.transcoded} dosya kodlandı; "
+            f"~{self.saved_cpu():.1f} sn CPU tasarrufu"
+        )
+
+
+AUDIO_STATS = AudioStats()
+
+
+class PostProcessPlan:
+    """Bir iş için gereken tüm ffmpeg adımlarını tek komutta toplar."""
+
+    def __init__(self, source, output, command, kind="remux"):
+        self.source = source
+        self.output = output
+        self.command = command
+        # Zamanlama kaydındaki türü: remux, clip veya transcode
+        self.kind = kind
+        # Ses işinde ortam süresi (CPU maliyetini ölçmek için); `audio_copy` ise ses kodlanmadan kopyalanır
+        self.media_seconds = None
+        self.audio_copy = False
+        # run_plan sonrası ffmpeg'in harcadığı CPU süresi
+        self.cpu_seconds = None
+        # Kodlama, ses dönüşümü ve kesim atlanamaz; başarısızsa iş hata sayılır.
+        # Kap dönüşümü, faststart ve altyazı gömme isteğe bağlıdır
+        self.required = False
+
+    @property
+    def temp_output(self):
+        base, ext = os.path.splitext(self.output)
+        return f"{base}.pp{ext}"
+
+
+def plan_postprocess(
+    source, target_ext=None, faststart=False, clip=None, subtitles=(),
+    audio_only=False, audio_codec=None, audio_bitrate=None, accurate=False, subtitle_start=0
+):
+    """Yapılacak bir şey yoksa None döner; dosya o haliyle kullanılabilir.
+
+    `accurate` ile kesilen görüntü kopyalanmaz, yeniden kodlanır; kesim
+    anahtar kareye değil tam istenen zamana denk gelir. `subtitle_start`,
+    yalnızca bir aralığı indirilmiş kaynakta aralığın başlangıcıdır; tam
+    uzunluktaki altyazılar o ana kaydırılır.
+    """
+    base, ext = os.path.splitext(source)
+    ext = ext.lstrip(".").lower()
+    target_ext = (target_ext or ext).lower()
+    faststart = faststart and target_ext in MP4_FAMILY
+    subtitles = [s for s in subtitles if s and os.path.exists(s)] if not audio_only else []
+
+    if target_ext == ext and not (faststart or clip or subtitles or audio_codec):
+        return None
+
+    cmd = ["ffmpeg", "-y", "-loglevel", "error"]
+    if clip:
+        # Giriş öncesi -ss: ffmpeg yalnızca gereken kısmı okur
+        start, end = clip
+        cmd += ["-ss", str(start)]
+        subtitle_start = start
+    cmd += ["-i", source]
+    for sub in subtitles:
+        # -ss her girişe ayrı uygulanır; altyazılar da görüntüyle aynı ana sıfırlanır
+        if subtitle_start:
+            cmd += ["-ss", str(subtitle_start)]
+        cmd += ["-i", sub]
+    if clip and end != float("inf"):
+        cmd += ["-t", str(end - start)]
+
+    if audio_only:
+        cmd += ["-map", "0:a", "-vn"]
+    else:
+        cmd += ["-map", "0:v?", "-map", "0:a?"]
+        if not (clip and accurate):
+            cmd += ["-c:v", "copy"]
+    cmd += ["-c:a", audio_codec or "copy"]
+    if audio_bitrate:
+        cmd += ["-b:a", audio_bitrate]
+
+    for i in range(len(subtitles)):
+        cmd += ["-map", f"{i + 1}:s"]
+    if subtitles:
+        cmd += ["-c:s", "mov_text" if target_ext in MP4_FAMILY else "copy"]
+
+    if faststart:
+        cmd += ["-movflags", "+faststart"]
+
+    kind = "transcode" if audio_codec or (clip and accurate) else "clip" if clip else "remux"
+    plan = PostProcessPlan(source, f"{base}.{target_ext}", cmd, kind)
+    plan.command.append(plan.temp_output)
+    plan.required = bool(audio_codec or clip or audio_only)
+    return plan
+
+
+def audio_codec_name(acodec):
+    acodec = (acodec or "").lower()
+    for prefix, name in _CODEC_PREFIXES:
+        if acodec.startswith(prefix):
+            return name
+    return None
+
+
+def plan_audio(source, fmt, acodec, duration=None, clip=None):
+    """Yalnızca ses çıktısı: hedef izin veriyorsa kodeği kopyalar, yoksa mp3'e kodlar.
+
+    mp3 seçiliyse yalnızca zaten mp3 olan ses kopyalanır; mkv'de her kodek
+    mka'ya, diğer hedeflerde AAC m4a'ya, Opus/Vorbis ogg'ye kopyalanır.
+    """
+    codec = audio_codec_name(acodec)
+    if fmt == "mp3":
+        target = "mp3" if codec == "mp3" else None
+    elif fmt == "mkv":
+        target = "mka" if codec else None
+    else:
+        target = PASSTHROUGH_EXT.get(codec, "mka" if codec else None)
+
+    if clip:
+        start, end = clip
+        if duration:
+            end = min(end, duration)
+        duration = end - start if end != float("inf") else None
+
+    if target is None:
+        plan = plan_postprocess(
+            source, "mp3", clip=clip, audio_only=True, audio_codec="libmp3lame", audio_bitrate="192k"
+        )
+        plan.media_seconds = duration
+        return plan
+    plan = plan_postprocess(source, target, clip=clip, audio_only=True)
+    if plan is not None:
+        # Sayım run_plan'de, ffmpeg başarıyla bittikten sonra yapılır
+        plan.media_seconds = duration
+        plan.audio_copy = True
+    return plan
+
+
+def _run_measured(cmd):
+    # Çocuk sürecin CPU süresi; wait4 olmayan sistemlerde (Windows) duvar saati
+    started = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    stderr = proc.stderr.read()
+    proc.stderr.close()
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        cpu = usage.ru_utime + usage.ru_stime
+    else:
+        proc.wait()
+        cpu = time.perf_counter() - started
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=stderr)
+    return cpu
+
+
+def run_plan(plan):
+    try:
+        cpu = plan.cpu_seconds = _run_measured(plan.command)
+    except Exception:
+        if os.path.exists(plan.temp_output):
+            os.remove(plan.temp_output)
+        raise
+    if plan.audio_copy:
+        AUDIO_STATS.add_copy(plan.media_seconds)
+    elif plan.media_seconds is not None:
+        AUDIO_STATS.add_transcode(plan.media_seconds, cpu)
+    os.replace(plan.temp_output, plan.output)
+    if plan.output != plan.source and os.path.exists(plan.source):
+        os.remove(plan.source)
+    return plan.output
+
+
+def postprocess_pool():
+    # ffmpeg işleri indirme yuvalarından ayrı, çekirdek sayısı kadar eşzamanlı çalışır
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 2, thread_name_prefix="postprocess")
+        return _pool
@@ -0,0 +1,77 @@
+import time
+from collections import deque
+
+
+class RateEstimator:
+    """Son `window` saniyedeki örneklerden kayan pencereli hız hesaplar."""
+
+    def __init__(self, window=5.0):
+        self.window = window
+        self.samples = deque()
+
+    def add(self, total_bytes, now=None):
+        now = time.monotonic() if now is None else now
+        self.samples.append((now, total_bytes))
+        while len(self.samples) > 2 and now - self.samples[0][0] > self.window:
+            self.samples.popleft()
+
+    def rate(self):
+        if len(self.samples) < 2:
+            return 0.0
+        (t0, b0), (t1, b1) = self.samples[0], self.samples[-1]
+        if t1 <= t0:
+            return 0.0
+        return max(0.0, (b1 - b0) / (t1 - t0))
+
+    def reset(self):
+        self.samples.clear()
+
+
+class ProgressTracker:
+    """yt-dlp ilerleme olaylarını bayt bazında toplar ve yayın sıklığını sınırlar.
+
+    Bir işte birden fazla akış (video + ses, playlist girdileri) olabilir;
+    her biri dosya adına göre ayrı tutulur ve toplamı raporlanır.
+    """
+
+    def __init__(self, emit_hz=4, window=5.0):
+        self.min_interval = 1.0 / emit_hz if emit_hz > 0 else 0.0
+        self.streams = {}
+        self.estimator = RateEstimator(window)
+        self._last_emit = 0.0
+
+    def update(self, d):
+        key = d.get('filename') or d.get('tmpfilename') or ''
+        done = d.get('downloaded_bytes') or 0
+        total = d.get('total_bytes') or d.get('total_bytes_estimate') or 0
+        if d.get('status') == 'finished':
+            done = total = max(done, total)
+        self.streams[key] = (done, max(total, done))
+        self.estimator.add(self.downloaded)
+
+    @property
+    def downloaded(self):
+        return sum(done for done, _ in self.streams.values())
+
+    @property
+    def total(self):
+        return sum(total for _, total in self.streams.values())
+
+    def percent(self):
+        total = self.total
+        return int(self.downloaded * 100 / total) if total else 0
+
+    def speed(self):
+        return self.estimator.rate()
+
+    def eta(self):
+        speed = self.speed()
+        remaining = self.total - self.downloaded
+        return int(remaining / speed) if speed > 0 and remaining > 0 else 0
+
+    def should_emit(self, force=False):
+        now = time.monotonic()
+        if force or now - self._last_emit >= self.min_interval:
+            self._last_emit = now
+            return True
+        return False
@@ -0,0 +1,242 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from downloader import DownloadThread, PlaylistExpandThread
+from engine import FEED_WINDOW
+from jobs import CancelToken, JobQueue
+
+
+class DownloadScheduler(QObject):
+    """Toplu indirme işlerini sınırlı sayıda DownloadThread ile paralel yürütür.
+
+    Playlist işleri kuyruğa girmez; PlaylistExpandThread girdileri buldukça
+    tekil işler kuyruğa eklenir ve boş yuvalarda hemen başlar. İçe aktarılan
+    büyük gruplar (submit_feed) kuyruğa FEED_WINDOW'luk parçalarla alınır.
+
+    İşler tek tek iptal edilebilir, duraklatılabilir ve kuyrukta öne/sona
+    alınabilir. Çalışan iş, ilerleme kancasındaki CancelToken ile durur;
+    duraklatılan işin yuvası boşalır, resume() ile kaldığı yerden devam eder.
+    """
+
+    # İndirme kuyruğuna eklenen iş sayısı (playlist girdileri dahil)
+    jobs_added = pyqtSignal(int)
+    job_started = pyqtSignal(object)
+    job_done = pyqtSignal(object, str, str, str)
+    # Duraklatılan iş toplamdan düşer; devam ettirilince jobs_added ile geri gelir
+    job_paused = pyqtSignal(object)
+    # Kuyruk görünümünü yenilemek için: ekleme, başlama, bitiş, sıra değişikliği
+    queue_changed = pyqtSignal()
+    all_done = pyqtSignal()
+    # yüzde, toplam hız, kalan süre (tüm aktif işler)
+    aggregate_progress = pyqtSignal(int, float, int)
+
+    def __init__(self, max_workers=3, per_host_limit=2, progress_hz=4, store=None, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.max_workers = max(1, int(max_workers))
+        self.progress_hz = progress_hz
+        # Dosya başına paralel bağlantı
+        self.connections = 1
+        # Önceden çözülmüş bilgiler (MetadataCache)
+        self.cache = None
+        self.queue = JobQueue(per_host_limit)
+        self.threads = {}
+        self.expanders = {}
+        # İndirmesi bitmiş, son işlemi süren işler (son işlem durdurulamaz)
+        self.processing = {}
+        self.job_bytes = {}
+        # Duraklatılmış işler, eklenme sırasıyla
+        self.paused = {}
+        # İçe aktarılan gruplar (jobstore.BatchFeed); işler JobStore'dan yüklenir
+        self.feeds = []
+
+    def configure(self, max_workers, per_host_limit):
+        self.max_workers = max(1, int(max_workers))
+        self.queue.per_host_limit = max(1, int(per_host_limit))
+        self._fill_slots()
+
+    def submit(self, jobs):
+        if self.store:
+            # Devam ettirilen işler zaten kayıtlı
+            self.store.add_many([job for job in jobs if job.store_id is None])
+        videos = [job for job in jobs if not job.is_playlist]
+        for job in jobs:
+            if job.is_playlist:
+                self._expand(job)
+        self._enqueue(videos)
+
+    def submit_feed(self, feed):
+        self.feeds.append(feed)
+        self._fill_slots()
+        self.queue_changed.emit()
+        self._check_idle()
+
+    def cancel(self, job_id):
+        """Bekleyen, çalışan veya duraklatılmış işi iptal eder; yarım dosyalar silinir."""
+        job = self.queue.remove(job_id) or self.paused.pop(job_id, None)
+        if job is not None:
+            job.cancel_token.cancel()
+            if job.partial_files:
+                from cancel import remove_partials
+
+                # Duraklatılırken korunan yarım dosyalar
+                remove_partials(job.partial_files)
+            if self.store:
+                self.store.set_state(job, "cancelled")
+            self.job_done.emit(job, "İndirme iptal edildi.", "", "")
+            self.queue_changed.emit()
+            self._check_idle()
+            return True
+        job = self.queue.running.get(job_id)
+        if job is None:
+            return False
+        # DownloadThread kancada durur, job_done her zamanki yoldan gelir
+        job.cancel_token.cancel()
+        return True
+
+    def pause(self, job_id):
+        """İşi durdurur, yarım dosyaları korur; yuvası başka işe geçer."""
+        job = self.queue.remove(job_id)
+        if job is not None:
+            self._paused(job)
+            return True
+        job = self.queue.running.get(job_id)
+        if job is None:
+            return False
+        job.cancel_token.pause()
+        return True
+
+    def resume(self, job_id):
+        job = self.paused.pop(job_id, None)
+        if job is None:
+            return False
+        job.cancel_token = CancelToken()
+        if self.store:
+            self.store.set_state(job, "queued")
+        self._enqueue([job])
+        return True
+
+    def move(self, job_id, front=True):
+        # Yalnızca bekleyen işlerin sırası değişir; çalışanlar yerinde kalır
+        if not self.queue.move(job_id, front):
+            return False
+        self.queue_changed.emit()
+        return True
+
+    def snapshot(self):
+        """Kuyruk görünümü için (iş, durum) çiftleri: çalışan, bekleyen, duraklatılmış."""
+        items = [(job, "running") for job in self.queue.running.values()]
+        items += [(job, "processing") for job in self.processing.values()]
+        items += [(job, "queued") for job in self.queue.pending]
+        items += [(job, "paused") for job in self.paused.values()]
+        return items
+
+    def is_busy(self):
+        return bool(self.expanders or self.processing or self.feeds) or not self.queue.is_idle()
+
+    def _enqueue(self, jobs):
+        if not jobs:
+            return
+        self.queue.extend(jobs)
+        self.jobs_added.emit(len(jobs))
+        self._fill_slots()
+        self.queue_changed.emit()
+
+    def _paused(self, job):
+        self.paused[job.id] = job
+        if self.store:
+            self.store.set_state(job, "paused")
+        self.job_paused.emit(job)
+        self.queue_changed.emit()
+        self._check_idle()
+
+    def _expand(self, job):
+        thread = PlaylistExpandThread(job, self.store)
+        thread.entries_found.connect(self._on_entries)
+        thread.error.connect(lambda msg, job=job: self._on_expand_error(job, msg))
+        thread.finished.connect(lambda job_id=job.id: self._on_expanded(job_id))
+        self.expanders[job.id] = thread
+        thread.start()
+
+    def _on_entries(self, jobs):
+        # Girdiler expand_playlist içinde playlist işine bağlı olarak kaydedildi
+        self._enqueue(jobs)
+
+    def _on_expand_error(self, job, message):
+        # Taranamayan playlist, başarısız bir iş olarak sayılır
+        self.jobs_added.emit(1)
+        self.job_done.emit(job, f"Hata: {message}", "", "")
+
+    def _on_expanded(self, job_id):
+        self.expanders.pop(job_id, None)
+        self._check_idle()
+
+    def _check_idle(self):
+        if not self.is_busy():
+            self.all_done.emit()
+
+    def _refill(self):
+        # Bellekte en fazla FEED_WINDOW bekleyen iş; gerisi JobStore'da sırasını bekler
+        while self.feeds and len(self.queue.pending) < FEED_WINDOW:
+            jobs = self.feeds[0].take(FEED_WINDOW)
+            if not jobs:
+                self.feeds.pop(0)
+                continue
+            for job in jobs:
+                if job.is_playlist:
+                    self._expand(job)
+            videos = [job for job in jobs if not job.is_playlist]
+            self.queue.extend(videos)
+            self.jobs_added.emit(len(videos))
+
+    def _fill_slots(self):
+        self._refill()
+        while self.queue.running_count() < self.max_workers:
+            job = self.queue.next_ready()
+            if job is None:
+                break
+            self._start(job)
+
+    def _start(self, job):
+        thread = DownloadThread(
+            job, progress_hz=self.progress_hz, store=self.store, connections=self.connections, cache=self.cache
+        )
+        thread.bytes_progress.connect(
+            lambda done, total, speed, job_id=job.id: self._on_bytes(job_id, done, total, speed)
+        )
+        thread.downloaded.connect(lambda job=job: self._on_downloaded(job))
+        thread.done.connect(lambda msg, path, title, job=job: self._on_done(job, msg, path, title))
+        # Referans, iş parçacığı tamamen bitene kadar tutulur
+        thread.finished.connect(lambda job_id=job.id: self.threads.pop(job_id, None))
+        self.threads[job.id] = thread
+        self.job_started.emit(job)
+        thread.start()
+
+    def _on_bytes(self, job_id, done, total, speed):
+        self.job_bytes[job_id] = (done, total, speed)
+        done = sum(b[0] for b in self.job_bytes.values())
+        total = sum(b[1] for b in self.job_bytes.values())
+        speed = sum(b[2] for b in self.job_bytes.values())
+        percent = int(done * 100 / total) if total else 0
+        eta = int((total - done) / speed) if speed > 0 and total > done else 0
+        self.aggregate_progress.emit(percent, speed, eta)
+
+    def _on_downloaded(self, job):
+        # ffmpeg son işlemi havuzda sürerken sıradaki indirme başlasın
+        self.processing[job.id] = job
+        self.queue.mark_done(job)
+        self._fill_slots()
+        self.queue_changed.emit()
+
+    def _on_done(self, job, message, file_path, title):
+        self.job_bytes.pop(job.id, None)
+        self.processing.pop(job.id, None)
+        self.queue.mark_done(job)
+        if job.cancel_token.reason == "pause" and not file_path:
+            # DownloadTask durumu "paused" olarak yazdı; yuva sıradakine geçer
+            self.paused[job.id] = job
+            self.job_paused.emit(job)
+        else:
+            self.job_done.emit(job, message, file_path, title)
+        self._fill_slots()
+        self.queue_changed.emit()
+        self._check_idle()
@@ -0,0 +1,318 @@
+import os
+import re
+import json
+import time
+import inspect
+import threading
+
+import yt_dlp
+from yt_dlp.downloader.common import FileDownloader
+from yt_dlp.downloader.http import HttpFD
+from yt_dlp.networking import Request
+from yt_dlp.networking.exceptions import HTTPError
+from yt_dlp.utils import determine_protocol
+from yt_dlp.utils.networking import HTTPHeaderDict
+
+# CDN'ler tek istekte büyük aralıkları yavaşlatabiliyor (YouTube ~10 MB)
+DEFAULT_CHUNK = 10 * 1024 * 1024
+MIN_CHUNK = 1024 * 1024
+READ_SIZE = 256 * 1024
+_CONTENT_RANGE_RE = re.compile(r"bytes (\d+)-(\d+)/(\d+)")
+# Kullanılan yt-dlp iç yardımcıları; kurulu sürümde yoksa parçalı ve eşzamanlı
+# indirme kapanır, yt-dlp'nin kendi yolu kullanılır
+SEGMENTED_SUPPORTED = all(hasattr(FileDownloader, name) for name in ('_hook_progress', '_get_impersonate_target')) \
+    and all(hasattr(yt_dlp.YoutubeDL, name) for name in ('_copy_infodict', '_calc_headers'))
+PARALLEL_SUPPORTED = list(inspect.signature(yt_dlp.YoutubeDL.dl).parameters)[:5] == \
+    ['self', 'name', 'info', 'subtitle', 'test']
+
+
+class SegmentedHttpFD(FileDownloader):
+    """Tek bir HTTP dosyasını paralel Range istekleriyle indirir.
+
+    Parçalar doğrudan .part dosyasındaki yerlerine yazılır; birleştirme için
+    ek kopya yapılmaz. Parça sınırları ve tamamlananlar `.segments` dosyasında tutulur,
+    yarıda kalan indirme yalnızca eksik parçalarla devam eder.
+    Sunucu Range desteklemiyorsa normal HttpFD'ye düşer.
+    """
+
+    @staticmethod
+    def supports(info, params):
+        if info.get('fragments') or info.get('section_start') or info.get('section_end'):
+            return False
+        if info.get('request_data') or info.get('is_live') or params.get('external_downloader'):
+            return False
+        return determine_protocol(info) in ('http', 'https')
+
+    def real_download(self, filename, info_dict):
+        url = info_dict['url']
+        headers = HTTPHeaderDict({'Accept-Encoding': 'identity'}, info_dict.get('http_headers'))
+        extensions = {}
+        impersonate_target = self._get_impersonate_target(info_dict)
+        if impersonate_target is not None:
+            extensions['impersonate'] = impersonate_target
+
+        total = self._probe(url, headers, extensions)
+        if not total or total < 2 * MIN_CHUNK:
+            return self._fallback(filename, info_dict)
+
+        connections = max(1, int(self.params.get('concurrent_fragment_downloads') or 1))
+        limit = (
+            self.params.get('http_chunk_size')
+            or (info_dict.get('downloader_options') or {}).get('http_chunk_size')
+            or DEFAULT_CHUNK
+        )
+        chunk = max(MIN_CHUNK, min(-(-total // connections), limit))
+
+        tmpfilename = self.temp_name(filename)
+        state_file = tmpfilename + '.segments'
+        chunks, done = self._resume_plan(tmpfilename, state_file, total, chunk)
+        if chunks is None:
+            # Dosya bir kez tam boyuta açılır, parçalar yerlerine yazılır
+            chunks, done = self._split(0, total, chunk), set()
+            with open(tmpfilename, 'wb') as f:
+                f.truncate(total)
+        # Durum hemen yazılır: durum dosyası olmayan .part her zaman başka bir indiricinindir
+        self._save_state(state_file, total, chunks, done)
+
+        lock = threading.Lock()
+        todo = [i for i in range(len(chunks)) if i not in done]
+        resumed = sum(chunks[i][1] - chunks[i][0] + 1 for i in done)
+        progress = {
+            'downloaded': resumed,
+            'start': time.time(),
+            'error': None,
+        }
+
+        def report():
+            elapsed = time.time() - progress['start']
+            speed = (progress['downloaded'] - resumed) / elapsed if elapsed > 0 else None
+            self._hook_progress({
+                'status': 'downloading',
+                'downloaded_bytes': progress['downloaded'],
+                'total_bytes': total,
+                'filename': filename,
+                'tmpfilename': tmpfilename,
+                'elapsed': elapsed,
+                'speed': speed,
+                'eta': (total - progress['downloaded']) / speed if speed else None,
+            }, info_dict)
+
+        def worker():
+            with open(tmpfilename, 'r+b') as f:
+                while True:
+                    with lock:
+                        if not todo or progress['error']:
+                            return
+                        index = todo.pop(0)
+                    try:
+                        self._fetch_chunk(url, headers, extensions, chunks[index], f, lock, progress, report)
+                    except Exception as e:
+                        with lock:
+                            progress['error'] = progress['error'] or e
+                        return
+                    with lock:
+                        done.add(index)
+                        self._save_state(state_file, total, chunks, done)
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(min(connections, len(todo)))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        if progress['error']:
+            raise progress['error']
+
+        self.try_remove(state_file)
+        self.try_rename(tmpfilename, filename)
+        self._hook_progress({
+            'status': 'finished',
+            'downloaded_bytes': total,
+            'total_bytes': total,
+            'filename': filename,
+            'elapsed': time.time() - progress['start'],
+        }, info_dict)
+        return True
+
+    def _probe(self, url, headers, extensions):
+        # 0-0 aralığı istenir: 206 + Content-Range varsa toplam boyut bilinir
+        request = Request(url, headers=HTTPHeaderDict(headers, {'Range': 'bytes=0-0'}), extensions=extensions)
+        try:
+            response = self.ydl.urlopen(request)
+        except Exception:
+            return None
+        try:
+            if response.status != 206:
+                return None
+            m = _CONTENT_RANGE_RE.match(response.headers.get('Content-Range') or '')
+            return int(m.group(3)) if m else None
+        finally:
+            response.close()
+
+    def _fetch_chunk(self, url, headers, extensions, chunk, f, lock, progress, report):
+        start, end = chunk
+        pos = start
+        retries = self.params.get('retries', 10)
+        attempt = 0
+        while pos <= end:
+            request = Request(
+                url, headers=HTTPHeaderDict(headers, {'Range': f'bytes={pos}-{end}'}), extensions=extensions
+            )
+            try:
+                response = self.ydl.urlopen(request)
+                try:
+                    m = _CONTENT_RANGE_RE.match(response.headers.get('Content-Range') or '')
+                    if response.status != 206 or not m or int(m.group(1)) != pos:
+                        raise yt_dlp.utils.DownloadError('Sunucu parçalı indirmeyi desteklemiyor')
+                    f.seek(pos)
+                    while pos <= end:
+                        data = response.read(min(READ_SIZE, end - pos + 1))
+                        if not data:
+                            break
+                        f.write(data)
+                        pos += len(data)
+                        with lock:
+                            progress['downloaded'] += len(data)
+                            report()
+                finally:
+                    response.close()
+            except (yt_dlp.utils.DownloadError, yt_dlp.utils.DownloadCancelled):
+                # Durdurma isteği report() içinden gelir; yeniden denenmez
+                raise
+            except Exception as e:
+                attempt += 1
+                # 4xx (süresi dolmuş bağlantı vb.) tekrar denemekle düzelmez
+                if attempt > retries or (isinstance(e, HTTPError) and e.status < 500):
+                    raise
+                time.sleep(min(0.5 * attempt, 5))
+                continue
+            if pos <= end:
+                # Bağlantı erken kapandı; kalan kısım için yeniden iste
+                attempt += 1
+                if attempt > retries:
+                    raise yt_dlp.utils.ContentTooShortError(pos - start, end - start + 1)
+
+    def _fallback(self, filename, info_dict):
+        fd = HttpFD(self.ydl, self.params)
+        fd._progress_hooks = self._progress_hooks
+        return fd.real_download(filename, info_dict)
+
+    @staticmethod
+    def _split(start, total, chunk):
+        return [(pos, min(pos + chunk, total) - 1) for pos in range(start, total, chunk)]
+
+    def _resume_plan(self, tmpfilename, state_file, total, chunk):
+        # (parçalar, bitenler); devam edilemiyorsa (None, None)
+        if not self.params.get('continuedl', True) or not os.path.isfile(tmpfilename):
+            return None, None
+        size = os.path.getsize(tmpfilename)
+        state = self._load_state(state_file, total)
+        if state is not None:
+            if size != total:
+                return None, None
+            # Parça sınırları durum dosyasından gelir; bağlantı sayısı değişse de geçerlidir
+            return state
+        if not 0 < size < total:
+            return None, None
+        # Durum dosyası yok: .part tek bağlantılı bir indirmeden (HttpFD) kalmıştır;
+        # baştaki kısım bitmiş bir parça sayılır, kalan aralık bölünür
+        with open(tmpfilename, 'r+b') as f:
+            f.truncate(total)
+        return [(0, size - 1)] + self._split(size, total, chunk), {0}
+
+    @staticmethod
+    def _load_state(path, total):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('total') != total:
+                return None
+            chunks = [(int(start), int(end)) for start, end in state['chunks']]
+            done = {int(i) for i in state.get('done') or [] if 0 <= int(i) < len(chunks)}
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return None
+        # Parçalar dosyayı boşluksuz ve çakışmasız kaplamalı
+        if not chunks or chunks[0][0] != 0 or chunks[-1][1] != total - 1 \
+                or any(start > end for start, end in chunks) \
+                or any(start != prev[1] + 1 for prev, (start, _) in zip(chunks, chunks[1:])):
+            return None
+        return chunks, done
+
+    @staticmethod
+    def _save_state(path, total, chunks, done):
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'total': total, 'chunks': chunks, 'done': sorted(done)}, f)
+        except OSError:
+            pass
+
+
+class ParallelYoutubeDL(yt_dlp.YoutubeDL):
+    """Tek video içindeki indirmeleri paralelleştiren YoutubeDL.
+
+    - `concurrent_fragment_downloads` > 1 ise düz HTTP formatları da parçalı
+      indirilir; DASH/HLS'de aynı ayar yt-dlp'nin kendi parça indiricisine gider.
+    - Birleştirilecek formatlar (bestvideo+bestaudio) sırayla değil aynı anda
+      iner; birleştirme hepsi bitince yapılır.
+    """
+
+    # process_info içinde birleştirilecek formatlar için arka plan indirmeleri
+    _stream_jobs = None
+    _streams_left = 0
+
+    def process_info(self, info_dict):
+        formats = info_dict.get('requested_formats') or []
+        self._stream_jobs = [] if len(formats) > 1 and PARALLEL_SUPPORTED else None
+        self._streams_left = len(formats)
+        try:
+            return super().process_info(info_dict)
+        finally:
+            # Erken dönüş/hata durumunda da yarım kalan iş parçacığı bırakma
+            for thread, _ in self._stream_jobs or []:
+                thread.join()
+            self._stream_jobs = None
+
+    def dl(self, name, info, subtitle=False, test=False, **kwargs):
+        jobs = self._stream_jobs
+        if kwargs or not PARALLEL_SUPPORTED:
+            return super().dl(name, info, subtitle, test, **kwargs)
+        if jobs is None or subtitle or test or info.get('requested_formats'):
+            return self._dl_one(name, info, subtitle, test)
+
+        # Son format dışındakiler arka planda başlar; sonuçları son formatla toplanır
+        self._streams_left -= 1
+        if self._streams_left > 0:
+            outcome = {}
+
+            def run():
+                try:
+                    outcome['value'] = self._dl_one(name, info)
+                except BaseException as e:
+                    outcome['error'] = e
+
+            thread = threading.Thread(target=run, daemon=True)
+            jobs.append((thread, outcome))
+            thread.start()
+            return True, True
+
+        success, real_download = self._dl_one(name, info)
+        for thread, outcome in jobs:
+            thread.join()
+            if 'error' in outcome:
+                raise outcome['error']
+            success = success and outcome['value'][0]
+            real_download = real_download or outcome['value'][1]
+        jobs.clear()
+        return success, real_download
+
+    def _dl_one(self, name, info, subtitle=False, test=False):
+        connections = self.params.get('concurrent_fragment_downloads') or 1
+        if connections > 1 and SEGMENTED_SUPPORTED and not subtitle and not test and name != '-' \
+                and info.get('url') and SegmentedHttpFD.supports(info, self.params):
+            fd = SegmentedHttpFD(self, self.params)
+            for ph in self._progress_hooks:
+                fd.add_progress_hook(ph)
+            new_info = self._copy_infodict(info)
+            if new_info.get('http_headers') is None:
+                new_info['http_headers'] = self._calc_headers(new_info)
+            return fd.download(name, new_info, subtitle)
+        return super().dl(name, info, subtitle, test)
@@ -3,13 +3,25 @@ import json
 
 SETTINGS_FILE = "settings.json"
 HISTORY_FILE = "history.json"
+CACHE_DIR = "cache"
+JOBS_DB = "jobs.db"
+METRICS_FILE = "metrics.jsonl"
 DEFAULT_SETTINGS = {
     "dark_mode": False,
     "default_download_path": os.path.expanduser("~"),
     "default_format": "mp4",
     "default_quality": "1080p (?? MB) [mp4]",
     "default_sub_lang": "Otomatik",
-    "language": "Türkçe"
+    "language": "Türkçe",
+    "max_concurrent_downloads": 3,
+    "per_host_limit": 2,
+    "info_cache_ttl": 3600,
+    "info_cache_max_mb": 50,
+    "progress_emit_hz": 4,
+    "thumb_cache_max_mb": 20,
+    "connections_per_file": 4,
+    "metrics_log": True,
+    "metrics_textfile": ""
 }
 
 def load_settings():
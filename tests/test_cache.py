@@ -0,0 +1,85 @@
+import time
+
+import cache
+from cache import MetadataCache, RecordCache, url_expiry, EXPIRE_MARGIN
+from videoinfo import VideoInfo
+
+URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+def make_info(expire=None):
+    stream = "https://rr1.googlevideo.com/videoplayback?itag=18"
+    if expire:
+        stream += f"&expire={int(expire)}"
+    return {
+        "id": "dQw4w9WgXcQ", "title": "Başlık", "webpage_url": URL, "duration": 212,
+        "formats": [{"format_id": "18", "ext": "mp4", "url": stream}, {"format_id": "sb0", "ext": "mhtml"}],
+        "thumbnails": [{"url": "https://i.ytimg.com/x.jpg"}],
+    }
+
+
+def put(store, info):
+    store.put(URL, info, VideoInfo.from_info(info, URL))
+
+
+def test_url_expiry_takes_earliest_link():
+    info = {"formats": [
+        {"url": "https://a/videoplayback?expire=1800000000"},
+        {"manifest_url": "https://a/api/manifest/dash/expire/1700000000/sig"},
+        {"url": "https://a/plain.mp4"},
+    ]}
+    assert url_expiry(info) == 1700000000
+    assert url_expiry({"formats": [{"url": "https://a/plain.mp4"}]}) is None
+
+
+def test_round_trip_prunes_and_matches_other_url_forms(tmp_path):
+    store = MetadataCache(str(tmp_path), ttl=3600)
+    put(store, make_info())
+    assert store.get("https://youtu.be/dQw4w9WgXcQ").title == "Başlık"
+    info = store.get_info(URL)
+    assert "thumbnails" not in info
+    assert [f["format_id"] for f in info["formats"]] == ["18"]
+
+
+def test_ttl_expiry(tmp_path, monkeypatch):
+    now = [time.time()]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    store = MetadataCache(str(tmp_path), ttl=60)
+    put(store, make_info())
+    now[0] += 59
+    assert store.get(URL) is not None
+    now[0] += 2
+    assert store.get(URL) is None
+    assert store.get_info(URL) is None
+
+
+def test_signed_url_expiry_shortens_ttl(tmp_path, monkeypatch):
+    now = [time.time()]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    store = MetadataCache(str(tmp_path), ttl=3600)
+    put(store, make_info(expire=now[0] + EXPIRE_MARGIN + 100))
+    now[0] += 99
+    assert store.get_info(URL) is not None
+    now[0] += 2
+    # Akış bağlantısı bitmeden EXPIRE_MARGIN önce bayat sayılır; TTL'yi beklemez
+    assert store.get_info(URL) is None
+
+
+def test_already_expired_links_are_not_cached(tmp_path):
+    store = MetadataCache(str(tmp_path), ttl=3600)
+    put(store, make_info(expire=time.time() + EXPIRE_MARGIN - 1))
+    assert store.get(URL) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_record_cache_ttl_and_lru(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    records = RecordCache(max_items=2, ttl=10)
+    records.put(URL, "a")
+    records.put("https://vimeo.com/1", "b")
+    assert records.get("https://youtu.be/dQw4w9WgXcQ") == "a"
+    records.put("https://vimeo.com/2", "c")
+    assert records.get("https://vimeo.com/1") is None
+    now[0] += 11
+    assert records.get(URL) is None
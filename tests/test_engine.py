@@ -0,0 +1,108 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import fake_extractor  # noqa: E402
+from mediaserver import MediaServer  # noqa: E402
+from cancel import JobStopped  # noqa: E402
+import engine  # noqa: E402
+from engine import DownloadTask  # noqa: E402
+from jobs import DownloadJob  # noqa: E402
+from jobstore import JobStore  # noqa: E402
+from postprocess import plan_audio, plan_postprocess  # noqa: E402
+
+SPLIT = "Ayrı Ayrı (Ses + Video)"
+
+
+@pytest.fixture(scope="module")
+def server():
+    fake_extractor.install()
+    with MediaServer(os.urandom(4 << 20), rate=256 * 1024) as srv:
+        yield srv
+
+
+def test_cancel_keeps_files_the_job_did_not_write(server, tmp_path):
+    url = server.watch_url("dash", 2 << 20, "iptal")
+    video = tmp_path / "Karşılaştırma dash-2048-iptal_video.mp4"
+    # Önceki bir çalıştırmadan kalan görüntü; ses kısmı silinmiş
+    video.write_bytes(b"eski")
+    job = DownloadJob(url, str(tmp_path), "mp4", "best", False, SPLIT, False, "Otomatik")
+    # Görüntü kısmı "zaten indirilmiş" olarak hemen biter; iptal ses inerken gelir
+    task = DownloadTask(job, on_progress=lambda tracker: tracker.downloaded > 128 * 1024 and job.cancel_token.cancel())
+    with pytest.raises(JobStopped):
+        task.download()
+    assert sorted(os.listdir(tmp_path)) == [video.name]
+    assert video.read_bytes() == b"eski"
+
+
+def test_cancel_removes_what_the_job_wrote(server, tmp_path):
+    url = server.watch_url("dash", 2 << 20, "yeni")
+    job = DownloadJob(url, str(tmp_path), "mp4", "best", False, SPLIT, False, "Otomatik")
+    task = DownloadTask(job, on_progress=lambda tracker: tracker.downloaded > 256 * 1024 and job.cancel_token.cancel())
+    with pytest.raises(JobStopped):
+        task.download()
+    assert os.listdir(tmp_path) == []
+
+
+def failing_run_plan(plan):
+    raise subprocess.CalledProcessError(1, plan.command, stderr=b"Unknown encoder 'libmp3lame'\n")
+
+
+def test_failed_transcode_fails_the_job(tmp_path, monkeypatch):
+    monkeypatch.setattr(engine, "run_plan", failing_run_plan)
+    store = JobStore(str(tmp_path / "jobs.db"))
+    job = store.add(DownloadJob("https://vimeo.com/1", str(tmp_path), "mp3", "best", False, "Sadece Ses", False, ""))
+    source = str(tmp_path / "a.m4a")
+    task = DownloadTask(job, store=store)
+    with pytest.raises(Exception, match="libmp3lame"):
+        task.postprocess([(plan_audio(source, "mp3", "mp4a.40.2", 60), source)])
+    assert store.conn.execute("SELECT state FROM jobs WHERE id = ?", (job.store_id,)).fetchone() == ("failed",)
+    store.close()
+
+
+def test_failed_remux_keeps_the_download(tmp_path, monkeypatch):
+    monkeypatch.setattr(engine, "run_plan", failing_run_plan)
+    job = DownloadJob("https://vimeo.com/1", str(tmp_path), "mp4", "best", False, "Sadece Görüntü", False, "")
+    source = tmp_path / "a.webm"
+    source.write_bytes(b"video")
+    plan = plan_postprocess(str(source), "mp4", faststart=True)
+    assert DownloadTask(job).postprocess([(plan, str(source))]) == [str(source)]
+
+
+class ArchiveOnly:
+    """_flat_entries'in kullandığı YoutubeDL yüzeyi: arşiv ve çıkarıcı araması."""
+
+    def __init__(self, archived):
+        self.archived = archived
+
+    def in_download_archive(self, entry):
+        return entry["id"] in self.archived
+
+    def get_info_extractor(self, ie_key):
+        return None
+
+
+def flat_playlist(ids):
+    return {"_type": "playlist", "entries": [{"id": i, "url": f"https://youtu.be/{i}"} for i in ids]}
+
+
+def test_sync_reaches_entries_appended_to_a_playlist():
+    # Eski girdiler arşivde; yeni videolar listenin sonuna eklenmiş
+    ids = ["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc", "ddddddddddd"]
+    urls = engine._flat_entries(
+        ArchiveOnly(set(ids[:2])), flat_playlist(ids), "https://www.youtube.com/playlist?list=PL1"
+    )
+    assert list(urls) == ["https://youtu.be/ccccccccccc", "https://youtu.be/ddddddddddd"]
+
+
+def test_sync_stops_at_first_archived_upload():
+    # Kanal yüklemeleri yeniden eskiye: ilk arşivli girdiden sonrası zaten indirilmiş
+    ids = ["ddddddddddd", "ccccccccccc", "bbbbbbbbbbb", "aaaaaaaaaaa"]
+    urls = engine._flat_entries(ArchiveOnly({"ccccccccccc"}), flat_playlist(ids), "https://www.youtube.com/@kanal/videos")
+    assert list(urls) == ["https://youtu.be/ddddddddddd"]
+    assert engine.newest_first("https://www.youtube.com/playlist?list=UU123")
+    assert not engine.newest_first("https://www.youtube.com/watch?v=aaaaaaaaaaa&list=PL1")
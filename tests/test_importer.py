@@ -0,0 +1,64 @@
+import io
+
+from jobs import DownloadJob
+from jobstore import JobStore
+from importer import _candidates, import_urls, describe
+
+VIDEO = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+def candidates(text, delimiter=None):
+    return list(_candidates(io.StringIO(text), delimiter))
+
+
+def test_plain_lines_keep_query_punctuation():
+    text = "# yorum\n\nhttps://example.com/v?a=1;b=2,c\n  youtu.be/dQw4w9WgXcQ  başlık\n"
+    assert [url for url in candidates(text) if url] == ["https://example.com/v?a=1;b=2,c", "youtu.be/dQw4w9WgXcQ"]
+
+
+def test_jsonl_lines():
+    text = '{"title": "x", "webpage_url": "https://vimeo.com/1"}\n{"bozuk"\n'
+    assert candidates(text) == ["https://vimeo.com/1", '{"bozuk"']
+
+
+def test_csv_header_is_skipped_after_comment():
+    text = "# dışa aktarma\nbaşlık,adres\nBir,https://vimeo.com/1\n\"İki, üç\",https://vimeo.com/2\n"
+    assert candidates(text) == ["https://vimeo.com/1", "https://vimeo.com/2"]
+
+
+def test_tsv_by_extension():
+    assert candidates("ad\turl\nx\thttps://vimeo.com/1\n", "\t") == ["https://vimeo.com/1"]
+
+
+def make_template(is_playlist=False):
+    return DownloadJob("", "/tmp", "mp4", "best", is_playlist, "Birleştir (Normal)", False, "")
+
+
+def test_import_counts_duplicates_and_known(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    store.add(make_template().with_url("https://vimeo.com/9"))
+    text = "\n".join([VIDEO, "https://youtu.be/dQw4w9WgXcQ", "vimeo.com/9", "geçersiz", "https://vimeo.com/2"])
+    batch, stats = import_urls(store, make_template(), text=text)
+    assert (stats["added"], stats["duplicate"], stats["queued"], stats["invalid"]) == (2, 1, 1, 1)
+    assert [job.url for job in store.queued_in_batch(batch)] == [VIDEO, "https://vimeo.com/2"]
+    assert describe(stats) == "2 yeni, 1 tekrar, 1 zaten kuyrukta, 1 geçersiz"
+    store.close()
+
+
+def test_playlists_with_same_video_are_distinct(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    text = f"{VIDEO}&list=PL1\n{VIDEO}&list=PL2\n{VIDEO}&list=PL2&index=4\n"
+    _, stats = import_urls(store, make_template(is_playlist=True), text=text)
+    assert (stats["added"], stats["duplicate"]) == (2, 1)
+    store.close()
+
+
+def test_stop_cancels_written_rows(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    text = "\n".join(f"https://vimeo.com/{i}" for i in range(1200))
+    # İlk yoklamada (500. satır) devam, ikincide dur: yazılmış ilk parça iptal edilmeli
+    answers = iter([False, True])
+    batch, _ = import_urls(store, make_template(), text=text, should_stop=lambda: next(answers))
+    assert batch is None
+    assert store.queued_batches() == []
+    store.close()
@@ -0,0 +1,66 @@
+from jobs import DownloadJob, JobQueue, host_key
+
+
+def make_job(url="https://youtu.be/dQw4w9WgXcQ", priority=0, size_hint=0):
+    job = DownloadJob(url, "/tmp", "mp4", "best", False, "Birleştir (Normal)", False, "")
+    job.priority = priority
+    job.size_hint = size_hint
+    return job
+
+
+def test_host_key_aliases():
+    assert host_key("https://www.youtube.com/watch?v=x") == "youtube.com"
+    assert host_key("https://youtu.be/x") == "youtube.com"
+    assert host_key("x.com/user/status/1") == "twitter.com"
+
+
+def test_extend_puts_larger_files_first():
+    queue = JobQueue()
+    small, unknown, big = make_job(size_hint=10), make_job(), make_job(size_hint=1000)
+    queue.extend([small, unknown, big])
+    assert queue.pending == [big, small, unknown]
+
+
+def test_priority_wins_over_insertion_order():
+    queue = JobQueue()
+    first, second = make_job(), make_job(priority=5)
+    queue.extend([first])
+    queue.extend([second])
+    assert queue.pending == [second, first]
+    assert queue.set_priority(first.id, 10)
+    assert queue.pending == [first, second]
+    assert not queue.set_priority(-1, 1)
+
+
+def test_move_front_and_back():
+    queue = JobQueue()
+    a, b, c = make_job(), make_job(), make_job()
+    queue.extend([a, b, c])
+    assert queue.move(c.id, front=True)
+    assert queue.pending == [c, a, b]
+    assert queue.move(c.id, front=False)
+    assert queue.pending == [a, b, c]
+    assert not JobQueue().move(a.id)
+
+
+def test_next_ready_respects_per_host_limit():
+    queue = JobQueue(per_host_limit=1)
+    yt1, yt2 = make_job(), make_job("https://www.youtube.com/watch?v=aaaaaaaaaaa")
+    other = make_job("https://vimeo.com/1")
+    queue.extend([yt1, yt2, other])
+    assert queue.next_ready() is yt1
+    assert queue.next_ready() is other
+    assert queue.next_ready() is None
+    queue.mark_done(yt1)
+    assert queue.next_ready() is yt2
+    assert queue.running_count() == 2
+    assert not queue.is_idle()
+
+
+def test_remove_pending_job():
+    queue = JobQueue()
+    job = make_job()
+    queue.extend([job])
+    assert queue.remove(job.id) is job
+    assert queue.remove(job.id) is None
+    assert queue.is_idle()
@@ -0,0 +1,77 @@
+from jobs import DownloadJob
+from jobstore import JobStore, BatchFeed, DownloadArchive
+
+VIDEO = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+def make_job(url=VIDEO, is_playlist=False):
+    return DownloadJob(url, "/tmp", "mp4", "best", is_playlist, "Birleştir (Normal)", False, "")
+
+
+def test_state_transitions_and_unfinished(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    job = store.add(make_job())
+    assert store.known("youtube:dQw4w9WgXcQ") == "queued"
+    store.update_partial(job, "137+140", "/tmp/a.mp4.part")
+    store.set_state(job, "paused")
+    [resumed] = store.unfinished()
+    assert (resumed.store_id, resumed.resume_format) == (job.store_id, "137+140")
+    store.set_state(job, "done", files=["/tmp/a.mp4"])
+    assert store.unfinished() == []
+    assert store.known("youtube:dQw4w9WgXcQ") == "downloaded"
+    store.set_state(job, "failed", error="hata")
+    assert store.known("youtube:dQw4w9WgXcQ") is None
+    store.close()
+
+
+def test_jobs_survive_reopen(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    store = JobStore(path)
+    store.add(make_job())
+    store.close()
+    store = JobStore(path)
+    assert [job.url for job in store.unfinished()] == [VIDEO]
+    store.close()
+
+
+def test_archive_marks_youtube_key_downloaded(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    assert "youtube dQw4w9WgXcQ" not in DownloadArchive(store)
+    DownloadArchive(store, check=False, record=False).add("youtube dQw4w9WgXcQ")
+    assert store.known("youtube:dQw4w9WgXcQ") is None
+    DownloadArchive(store, check=False).add("youtube dQw4w9WgXcQ")
+    assert "youtube dQw4w9WgXcQ" not in DownloadArchive(store, check=False)
+    assert "youtube dQw4w9WgXcQ" in DownloadArchive(store)
+    assert store.known("youtube:dQw4w9WgXcQ") == "downloaded"
+    store.close()
+
+
+def test_playlist_children_advance_cursor(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    playlist = store.add(make_job(f"{VIDEO}&list=PL1", is_playlist=True))
+    assert store.known("playlist:PL1") == "queued"
+    children = [playlist.entry_job(f"https://vimeo.com/{i}") for i in range(3)]
+    store.add_many(children, parent=playlist)
+    assert store.playlist_cursor(playlist) == 3
+    store.set_state(children[0], "cancelled")
+    # Playlist içinde hangi durumda olursa olsun daha önce açılmış sayılır
+    assert store.known("url:vimeo.com/0", parent=playlist.store_id) == "queued"
+    assert store.known("url:vimeo.com/0") is None
+    store.close()
+
+
+def test_batch_feed_pages_queued_rows(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    batch = store.new_batch()
+    store.add_many([make_job(f"https://vimeo.com/{i}") for i in range(5)], batch)
+    assert store.queued_batches() == [(batch, 5)]
+    # Grubun bekleyenleri unfinished() ile değil BatchFeed ile yüklenir
+    assert store.unfinished() == []
+    feed = BatchFeed(store, batch)
+    assert [job.url for job in feed.take(3)] == [f"https://vimeo.com/{i}" for i in range(3)]
+    assert [job.url for job in feed.take(3)] == ["https://vimeo.com/3", "https://vimeo.com/4"]
+    assert feed.take(3) == []
+    store.cancel_batch(batch)
+    assert store.queued_batches() == []
+    assert store.new_batch() == batch + 1
+    store.close()
@@ -0,0 +1,115 @@
+import pytest
+
+import postprocess
+from postprocess import plan_postprocess, plan_audio, audio_codec_name
+
+
+def test_nothing_to_do_returns_none():
+    assert plan_postprocess("/v/a.mp4") is None
+    assert plan_postprocess("/v/a.mp4", "mp4") is None
+
+
+def test_remux_with_faststart():
+    plan = plan_postprocess("/v/a.mkv", "mp4", faststart=True)
+    assert plan.kind == "remux"
+    assert plan.output == "/v/a.mp4"
+    assert plan.command[-1] == plan.temp_output == "/v/a.pp.mp4"
+    assert ["-c:v", "copy"] == plan.command[plan.command.index("-c:v"):][:2]
+    assert "+faststart" in plan.command
+
+
+def test_fast_clip_copies_video():
+    plan = plan_postprocess("/v/a.mp4", clip=(5, 15))
+    assert plan.kind == "clip"
+    cmd = plan.command
+    assert cmd[cmd.index("-ss") + 1] == "5"
+    assert cmd.index("-ss") < cmd.index("-i")
+    assert cmd[cmd.index("-t") + 1] == "10"
+    assert "-c:v" in cmd
+
+
+def test_accurate_clip_reencodes_video():
+    plan = plan_postprocess("/v/a.mp4", clip=(5, float("inf")), accurate=True)
+    assert plan.kind == "transcode"
+    assert "-c:v" not in plan.command
+    assert "-t" not in plan.command
+
+
+def test_audio_codec_name():
+    assert audio_codec_name("mp4a.40.2") == "aac"
+    assert audio_codec_name("OPUS") == "opus"
+    assert audio_codec_name("ac-3") is None
+
+
+def test_plan_audio_copies_compatible_codec():
+    plan = plan_audio("/v/a.webm", "m4a", "opus", duration=120)
+    assert plan.output == "/v/a.ogg"
+    assert plan.audio_copy
+    assert plan.command[plan.command.index("-c:a") + 1] == "copy"
+
+
+def test_plan_audio_transcodes_to_mp3_and_clips_duration():
+    plan = plan_audio("/v/a.m4a", "mp3", "mp4a.40.2", duration=100, clip=(90, 200))
+    assert plan.output == "/v/a.mp3"
+    assert not plan.audio_copy
+    assert plan.media_seconds == 10
+    assert plan.command[plan.command.index("-c:a") + 1] == "libmp3lame"
+
+
+def test_plan_audio_keeps_matching_file():
+    assert plan_audio("/v/a.m4a", "m4a", "mp4a.40.2", duration=10) is None
+
+
+def test_failed_copy_is_not_counted(tmp_path, monkeypatch):
+    def failing_ffmpeg(cmd):
+        raise OSError("ffmpeg yok")
+
+    monkeypatch.setattr(postprocess, "AUDIO_STATS", postprocess.AudioStats())
+    monkeypatch.setattr(postprocess, "_run_measured", failing_ffmpeg)
+    plan = plan_audio(str(tmp_path / "a.webm"), "m4a", "opus", duration=30)
+    with pytest.raises(OSError):
+        postprocess.run_plan(plan)
+    assert postprocess.AUDIO_STATS.copied == 0
+
+
+def test_successful_copy_is_counted(tmp_path, monkeypatch):
+    def fake_ffmpeg(cmd):
+        open(cmd[-1], "wb").close()
+        return 0.0
+
+    monkeypatch.setattr(postprocess, "AUDIO_STATS", postprocess.AudioStats())
+    monkeypatch.setattr(postprocess, "_run_measured", fake_ffmpeg)
+    source = tmp_path / "a.webm"
+    source.write_bytes(b"ses")
+    plan = plan_audio(str(source), "m4a", "opus", duration=30)
+    assert postprocess.run_plan(plan) == str(tmp_path / "a.ogg")
+    assert not source.exists()
+    assert postprocess.AUDIO_STATS.copied == 1
+    assert postprocess.AUDIO_STATS.copied_seconds == 30
+
+
+def test_clip_seeks_subtitles_too(tmp_path):
+    sub = tmp_path / "a.tr.vtt"
+    sub.write_text("WEBVTT\n")
+    plan = plan_postprocess(str(tmp_path / "a.mp4"), clip=(30, 40), subtitles=[str(sub)])
+    cmd = plan.command
+    assert cmd[:10] == ["ffmpeg", "-y", "-loglevel", "error", "-ss", "30", "-i", str(tmp_path / "a.mp4"), "-ss", "30"]
+    assert cmd[10:12] == ["-i", str(sub)]
+    assert cmd[cmd.index("-c:s") + 1] == "mov_text"
+
+
+def test_section_download_shifts_subtitles(tmp_path):
+    sub = tmp_path / "a.en.vtt"
+    sub.write_text("WEBVTT\n")
+    plan = plan_postprocess(str(tmp_path / "a.mp4"), subtitles=[str(sub)], subtitle_start=12.5)
+    cmd = plan.command
+    assert cmd[4:10] == ["-i", str(tmp_path / "a.mp4"), "-ss", "12.5", "-i", str(sub)]
+    assert "-t" not in cmd
+
+
+def test_subtitles_without_clip_are_not_seeked(tmp_path):
+    sub = tmp_path / "a.en.vtt"
+    sub.write_text("WEBVTT\n")
+    plan = plan_postprocess(str(tmp_path / "a.mkv"), subtitles=[str(sub)])
+    assert "-ss" not in plan.command
+    assert plan.command[plan.command.index("-c:s") + 1] == "copy"
@@ -0,0 +1,49 @@
+import progress
+from progress import ProgressTracker, RateEstimator
+
+
+def test_streams_are_summed():
+    tracker = ProgressTracker()
+    tracker.update({"filename": "v.mp4", "downloaded_bytes": 30, "total_bytes": 100})
+    tracker.update({"filename": "a.m4a", "downloaded_bytes": 10, "total_bytes_estimate": 100})
+    assert tracker.downloaded == 40
+    assert tracker.total == 200
+    assert tracker.percent() == 20
+
+
+def test_finished_stream_counts_as_complete():
+    tracker = ProgressTracker()
+    tracker.update({"filename": "v.mp4", "downloaded_bytes": 30, "total_bytes": 100})
+    tracker.update({"filename": "v.mp4", "status": "finished", "downloaded_bytes": 100})
+    assert tracker.percent() == 100
+    assert tracker.eta() == 0
+
+
+def test_should_emit_throttles(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(progress.time, "monotonic", lambda: now[0])
+    tracker = ProgressTracker(emit_hz=4)
+    assert tracker.should_emit()
+    now[0] += 0.1
+    assert not tracker.should_emit()
+    assert tracker.should_emit(force=True)
+    now[0] += 0.25
+    assert tracker.should_emit()
+
+
+def test_zero_hz_never_throttles():
+    tracker = ProgressTracker(emit_hz=0)
+    assert tracker.should_emit()
+    assert tracker.should_emit()
+
+
+def test_rate_uses_sliding_window():
+    estimator = RateEstimator(window=5.0)
+    estimator.add(0, now=0.0)
+    assert estimator.rate() == 0.0
+    estimator.add(1000, now=1.0)
+    assert estimator.rate() == 1000.0
+    # Pencere dışındaki eski örnek düşer; hız son aralıktan hesaplanır
+    estimator.add(1500, now=10.0)
+    estimator.add(2500, now=11.0)
+    assert estimator.rate() == 1000.0
@@ -0,0 +1,57 @@
+import os
+import sys
+import json
+
+import pytest
+import yt_dlp
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from mediaserver import MediaServer, video_id  # noqa: E402
+from segmented import SegmentedHttpFD  # noqa: E402
+
+MB = 1 << 20
+SIZE = 6 * MB
+BLOB = os.urandom(SIZE)
+
+
+@pytest.fixture(scope="module")
+def url():
+    with MediaServer(BLOB) as srv:
+        yield f"{srv.base_url}/media/{video_id('progressive', SIZE, 'seg')}/progressive.mp4"
+
+
+def download(url, path, connections):
+    params = {"concurrent_fragment_downloads": connections, "http_chunk_size": MB, "quiet": True, "noprogress": True}
+    fd = SegmentedHttpFD(yt_dlp.YoutubeDL(params), params)
+    first = []
+    fd.add_progress_hook(lambda d: first or first.append(d["downloaded_bytes"]))
+    assert fd.real_download(str(path), {"url": url, "http_headers": {}})
+    assert path.read_bytes() == BLOB
+    return first[0]
+
+
+def test_resume_uses_saved_chunks_with_other_connection_count(url, tmp_path):
+    path = tmp_path / "a.mp4"
+    part = bytearray(SIZE)
+    part[:MB] = BLOB[:MB]
+    part[3 * MB:4 * MB] = BLOB[3 * MB:4 * MB]
+    (tmp_path / "a.mp4.part").write_bytes(bytes(part))
+    chunks = [[start, start + MB - 1] for start in range(0, SIZE, MB)]
+    (tmp_path / "a.mp4.part.segments").write_text(json.dumps({"total": SIZE, "chunks": chunks, "done": [0, 3]}))
+    # Durum 6 parçalık düzenle yazıldı; 2 bağlantıyla devam edince bitenler yeniden inmez
+    assert download(url, path, connections=2) > 2 * MB
+    assert sorted(os.listdir(tmp_path)) == ["a.mp4"]
+
+
+def test_part_without_state_is_a_finished_leading_chunk(url, tmp_path):
+    path = tmp_path / "b.mp4"
+    (tmp_path / "b.mp4.part").write_bytes(BLOB[:MB + 12345])
+    assert download(url, path, connections=4) > MB + 12345
+
+
+def test_invalid_state_starts_over(url, tmp_path):
+    path = tmp_path / "c.mp4"
+    (tmp_path / "c.mp4.part").write_bytes(b"x" * SIZE)
+    (tmp_path / "c.mp4.part.segments").write_text(json.dumps({"total": SIZE, "chunks": [[0, 5]], "done": [0]}))
+    assert download(url, path, connections=2) < MB
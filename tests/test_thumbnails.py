@@ -0,0 +1,42 @@
+import os
+
+from PyQt5.QtGui import QImage, QColor
+
+from thumbnails import ThumbnailCache
+
+
+def make_image(color):
+    image = QImage(120, 68, QImage.Format_RGB32)
+    image.fill(QColor(color))
+    return image
+
+
+def test_same_image_from_two_urls_is_stored_once(tmp_path):
+    thumbs = ThumbnailCache(str(tmp_path))
+    thumbs.put("https://i.ytimg.com/vi/a/hq.jpg", make_image("red"))
+    thumbs.put("https://i.ytimg.com/vi/a/mq.jpg", make_image("red"))
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".png")]) == 1
+    assert thumbs.get("https://i.ytimg.com/vi/a/mq.jpg").pixelColor(0, 0) == QColor("red")
+    assert thumbs.get("https://i.ytimg.com/vi/b/hq.jpg") is None
+
+
+def test_evict_removes_pointers_with_their_images(tmp_path):
+    thumbs = ThumbnailCache(str(tmp_path), max_bytes=0)
+    thumbs.put("https://i.ytimg.com/vi/a/hq.jpg", make_image("red"))
+    thumbs.put("https://i.ytimg.com/vi/b/hq.jpg", make_image("blue"))
+    assert os.listdir(tmp_path / "urls") == []
+    assert thumbs.get("https://i.ytimg.com/vi/a/hq.jpg") is None
+
+
+def test_evict_keeps_pointers_of_kept_images(tmp_path):
+    thumbs = ThumbnailCache(str(tmp_path))
+    thumbs.put("https://i.ytimg.com/vi/a/hq.jpg", make_image("red"))
+    [old] = [e for e in os.scandir(tmp_path) if e.name.endswith(".png")]
+    os.utime(old.path, (1, 1))
+    # Yalnızca bir görsel sığar: en eski (kırmızı) silinir
+    thumbs.max_bytes = old.stat().st_size * 3 // 2
+    thumbs.put("https://i.ytimg.com/vi/b/hq.jpg", make_image("blue"))
+    assert not os.path.exists(old.path)
+    assert len(os.listdir(tmp_path / "urls")) == 1
+    assert thumbs.get("https://i.ytimg.com/vi/a/hq.jpg") is None
+    assert thumbs.get("https://i.ytimg.com/vi/b/hq.jpg").pixelColor(0, 0) == QColor("blue")
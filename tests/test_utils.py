@@ -0,0 +1,39 @@
+from utils import canonical_id, playlist_key, looks_like_url
+
+
+def test_youtube_forms_share_one_id():
+    forms = [
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://youtu.be/dQw4w9WgXcQ",
+        "https://m.youtube.com/watch?v=dQw4w9WgXcQ&t=42s",
+        "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+        "https://www.youtube.com/embed/dQw4w9WgXcQ",
+        "https://music.youtube.com/watch?v=dQw4w9WgXcQ&list=RD1",
+    ]
+    assert {canonical_id(url) for url in forms} == {"youtube:dQw4w9WgXcQ"}
+
+
+def test_scheme_less_url_matches_full_form():
+    assert canonical_id("youtube.com/watch?v=dQw4w9WgXcQ") == "youtube:dQw4w9WgXcQ"
+    assert canonical_id("  vimeo.com/1/ ") == canonical_id("https://vimeo.com/1") == "url:vimeo.com/1"
+
+
+def test_other_sites_keep_query():
+    assert canonical_id("https://www.example.com/v/1/?id=2#frag") == "url:example.com/v/1?id=2"
+
+
+def test_invalid_video_id_falls_back_to_url():
+    assert canonical_id("https://youtu.be/short") == "url:youtu.be/short"
+
+
+def test_playlist_key_uses_list_id():
+    assert playlist_key("https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PL1") == "playlist:PL1"
+    assert playlist_key("youtube.com/playlist?list=PL1") == "playlist:PL1"
+    assert playlist_key("https://www.youtube.com/@kanal/videos") == "url:youtube.com/@kanal/videos"
+
+
+def test_looks_like_url():
+    assert looks_like_url("https://youtu.be/dQw4w9WgXcQ")
+    assert looks_like_url("youtube.com/watch?v=x")
+    assert not looks_like_url("https://you")
+    assert not looks_like_url("başlık")
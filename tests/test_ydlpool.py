@@ -0,0 +1,44 @@
+import pytest
+import yt_dlp
+
+from ydlpool import YoutubeDLPool
+
+
+def test_cores_are_shared_between_uses():
+    pool = YoutubeDLPool()
+    with pool.ydl({"quiet": True}) as first:
+        instances = first._ies_instances
+        director = first._request_director
+    with pool.ydl({"quiet": True, "format": "bestaudio"}) as second:
+        assert pool._shareable is True
+        assert second._ies_instances is instances
+        assert second._request_director is director
+        assert second.params["format"] == "bestaudio"
+
+
+class WithoutSharedFields(yt_dlp.YoutubeDL):
+    # Paylaşılan alanları olmayan bir yt-dlp sürümü
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__dict__.pop("_ies_instances", None)
+
+
+class PlainDirector(yt_dlp.YoutubeDL):
+    # Bağlantı havuzu cached_property değil; örnek sözlüğüne yazılamaz
+    @property
+    def _request_director(self):
+        return yt_dlp.YoutubeDL._request_director.func(self)
+
+
+@pytest.mark.parametrize("cls", [WithoutSharedFields, PlainDirector])
+def test_pool_falls_back_to_unshared_instances(monkeypatch, cls):
+    monkeypatch.setattr(yt_dlp, "YoutubeDL", cls)
+    pool = YoutubeDLPool()
+    for _ in range(2):
+        with pool.ydl({"quiet": True, "format": "best"}) as ydl:
+            assert type(ydl) is cls
+            assert ydl.params["format"] == "best"
+            # Kendi bağlantı havuzu: çekirdekten devralınmadı
+            assert "_request_director" not in ydl.__dict__
+    assert pool._shareable is False
+    assert pool._idle == []
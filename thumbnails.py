@@ -0,0 +1,135 @@
+import os
+import hashlib
+import threading
+
+from PyQt5.QtCore import Qt, QThread, QBuffer, QByteArray, QIODevice, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from net import get_session
+
+THUMB_SIZE = (120, 68)
+
+
+class ThumbnailCache:
+    """Küçültülmüş küçük resimleri içerik özetine göre diskte saklar.
+
+    `urls/` altındaki küçük işaretçi dosyaları URL'yi içerik özetine bağlar;
+    aynı görsel farklı URL'lerden gelse de bir kez saklanır.
+    """
+
+    def __init__(self, folder, max_bytes=20 * 1024 * 1024):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(folder, "urls"), exist_ok=True)
+
+    def _pointer(self, url):
+        return os.path.join(self.folder, "urls", hashlib.sha1(url.encode("utf-8")).hexdigest())
+
+    def get(self, url):
+        try:
+            with open(self._pointer(url), "r", encoding="ascii") as f:
+                path = os.path.join(self.folder, f.read().strip() + ".png")
+            image = QImage(path)
+        except OSError:
+            return None
+        if image.isNull():
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return image
+
+    def put(self, url, image):
+        data = QByteArray()
+        buf = QBuffer(data)
+        buf.open(QIODevice.WriteOnly)
+        image.save(buf, "PNG")
+        buf.close()
+        raw = bytes(data)
+        digest = hashlib.sha1(raw).hexdigest()
+        path = os.path.join(self.folder, digest + ".png")
+        try:
+            if not os.path.exists(path):
+                tmp = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(raw)
+                os.replace(tmp, path)
+            with open(self._pointer(url), "w", encoding="ascii") as f:
+                f.write(digest)
+        except OSError:
+            return
+        self.evict()
+
+    def evict(self):
+        with self._lock:
+            entries = []
+            total = 0
+            for e in os.scandir(self.folder):
+                if not e.name.endswith(".png"):
+                    continue
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, e.path))
+                total += st.st_size
+            if total <= self.max_bytes:
+                return
+            # En uzun süredir kullanılmayanlar silinir
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+            self._remove_dangling()
+
+    def _remove_dangling(self):
+        # Görseli silinmiş işaretçiler; put() önce görseli yazar, yenisi silinmez
+        for e in os.scandir(os.path.join(self.folder, "urls")):
+            try:
+                with open(e.path, "r", encoding="ascii") as f:
+                    digest = f.read().strip()
+                if not os.path.exists(os.path.join(self.folder, digest + ".png")):
+                    os.remove(e.path)
+            except (OSError, ValueError):
+                continue
+
+    def clear(self):
+        for sub in (self.folder, os.path.join(self.folder, "urls")):
+            for e in os.scandir(sub):
+                if e.is_file():
+                    try:
+                        os.remove(e.path)
+                    except OSError:
+                        pass
+
+
+class ThumbnailThread(QThread):
+    ready = pyqtSignal(str, QImage)
+
+    def __init__(self, url, cache=None, size=THUMB_SIZE):
+        super().__init__()
+        self.url = url
+        self.cache = cache
+        self.size = size
+
+    def run(self):
+        try:
+            resp = get_session().get(self.url, timeout=5)
+            resp.raise_for_status()
+            image = QImage.fromData(resp.content)
+            if image.isNull():
+                return
+            # Bir kez küçült, önbellekte ve arayüzde hep bu boyut kullanılır
+            image = image.scaled(*self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            if self.cache:
+                self.cache.put(self.url, image)
+            self.ready.emit(self.url, image)
+        except Exception:
+            pass
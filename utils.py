@@ -1,4 +1,6 @@
 import locale
+import re
+from urllib.parse import urlsplit, parse_qs
 
 def get_system_language():
     try:
@@ -13,3 +15,52 @@ def format_bytes(size):
             return f"{size:3.1f} {unit}"
         size /= 1024.0
     return f"{size:.1f} PB"
+
+_YT_ID = re.compile(r"^[0-9A-Za-z_-]{11}$")
+# Şemalı herhangi bir adres ya da şemasız "alan.adi/yol"; ikisinde de yol gerekir
+_URL_LIKE = re.compile(r"^(?:https?://[^\s/]+|(?:[\w-]+\.)+[A-Za-z]{2,})/\S+$")
+
+
+def looks_like_url(text):
+    # Yazılırken ("https://you") çözümleme başlatılmasın: alan adı ve yol gerekir
+    return bool(_URL_LIKE.match(text.strip()))
+
+
+def canonical_id(url):
+    # youtu.be/X, watch?v=X&t=.., shorts/X, embed/X, live/X -> "youtube:X"
+    url = url.strip()
+    if "://" not in url:
+        # looks_like_url şemasız "alan.adi/yol" kabul eder; aynı adresin tam haliyle eşleşsin
+        url = "https://" + url
+    try:
+        parts = urlsplit(url)
+    except Exception:
+        return ""
+    host = (parts.hostname or "").lower()
+    if host.startswith("www.") or host.startswith("m."):
+        host = host.split(".", 1)[1]
+    path = parts.path.strip("/").split("/")
+    video_id = None
+    if host == "youtu.be":
+        video_id = path[0]
+    elif host in ("youtube.com", "music.youtube.com", "youtube-nocookie.com"):
+        if path[0] == "watch":
+            video_id = (parse_qs(parts.query).get("v") or [None])[0]
+        elif path[0] in ("shorts", "embed", "live", "v") and len(path) > 1:
+            video_id = path[1]
+    if video_id and _YT_ID.match(video_id):
+        return f"youtube:{video_id}"
+    # Diğer siteler: şema, parça ve sondaki eğik çizgi olmadan URL
+    return f"url:{host}/{parts.path.strip('/')}" + (f"?{parts.query}" if parts.query else "")
+
+
+def playlist_key(url):
+    # Playlist modunda iş, videoya değil listeye aittir: watch?v=X&list=PL1 ile
+    # watch?v=X&list=PL2 farklı işlerdir. Liste kimliği yoksa kanonik adres kullanılır
+    if "://" not in url:
+        url = "https://" + url.strip()
+    try:
+        list_id = (parse_qs(urlsplit(url).query).get("list") or [None])[0]
+    except Exception:
+        list_id = None
+    return f"playlist:{list_id}" if list_id else canonical_id(url)
@@ -0,0 +1,90 @@
+from utils import canonical_id
+
+VIDEO_EXTS = ("mp4", "webm", "mkv")
+FORMAT_ORDER = ("mp3", "mp4", "webm", "mkv")
+
+
+class VideoInfo:
+    """Arayüz ve iş parçacıkları arasında taşınan küçük video kaydı.
+
+    yt-dlp bilgi sözlüğünün yalnızca gösterim ve format seçimi için gereken
+    kısmını tutar; akış bağlantıları, başlıklar ve parça listeleri yoktur.
+    `formats` satırları: (format_id, ext, height, vcodec, acodec, filesize).
+    """
+
+    __slots__ = ("id", "url", "title", "uploader", "duration", "thumbnail", "formats")
+
+    def __init__(self, id, url, title, uploader, duration, thumbnail, formats):
+        self.id = id
+        self.url = url
+        self.title = title
+        self.uploader = uploader
+        self.duration = duration
+        self.thumbnail = thumbnail
+        self.formats = formats
+
+    @classmethod
+    def from_info(cls, info, url=None):
+        url = info.get("webpage_url") or url or ""
+        formats = []
+        for f in info.get("formats") or []:
+            # Bazı durumlarda yt-dlp format listesine None koyabiliyor -> koruma
+            if not f or not isinstance(f, dict) or f.get("ext") == "mhtml":
+                continue
+            formats.append((
+                f.get("format_id"), f.get("ext"), f.get("height"),
+                f.get("vcodec"), f.get("acodec"),
+                f.get("filesize_approx") or f.get("filesize") or 0,
+            ))
+        return cls(
+            canonical_id(url), url, info.get("title"), info.get("uploader"),
+            int(info.get("duration") or 0), info.get("thumbnail") or "", tuple(formats)
+        )
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "url": self.url,
+            "title": self.title,
+            "uploader": self.uploader,
+            "duration": self.duration,
+            "thumbnail": self.thumbnail,
+            "formats": [list(f) for f in self.formats],
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            d["id"], d["url"], d.get("title"), d.get("uploader"), d.get("duration") or 0,
+            d.get("thumbnail") or "", tuple(tuple(f) for f in d.get("formats") or ())
+        )
+
+    def format_exts(self):
+        exts = {ext for _, ext, _, vcodec, _, _ in self.formats if vcodec != "none" and ext}
+        exts.add("mp3")
+        return sorted(exts, key=lambda x: FORMAT_ORDER.index(x) if x in FORMAT_ORDER else 99)
+
+    def estimated_size(self, height=None, audio_only=False):
+        # Sıralama için kaba tahmin (bayt): istenen yükseklikteki en büyük görüntü + en büyük ses
+        audio = max((size for _, _, _, vcodec, acodec, size in self.formats
+                     if vcodec == "none" and acodec != "none"), default=0)
+        if audio_only:
+            return audio
+        videos = [(h, acodec, size) for _, _, h, vcodec, acodec, size in self.formats if vcodec != "none" and size]
+        videos = [v for v in videos if v[0] == height] or videos
+        if not videos:
+            return 0
+        _, acodec, size = max(videos, key=lambda v: v[2])
+        return size + (audio if acodec == "none" else 0)
+
+    def quality_labels(self):
+        qualities = []
+        seen = set()
+        for _, ext, height, vcodec, _, filesize in self.formats:
+            if vcodec == "none" or ext not in VIDEO_EXTS or not height or (height, ext) in seen:
+                continue
+            mb = f"{round(filesize / 1024 / 1024)} MB" if filesize else "?? MB"
+            qualities.append((height, ext, mb))
+            seen.add((height, ext))
+        qualities.sort(key=lambda q: int(q[0]), reverse=True)
+        return [f"{h}p ({mb}) [{ext}]" for h, ext, mb in qualities] or ["best"]
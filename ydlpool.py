@@ -0,0 +1,102 @@
+import inspect
+import threading
+import functools
+from contextlib import contextmanager
+
+
+class _Core:
+    """Bir YoutubeDL'in işten işe değişmeyen parçaları: çıkarıcılar, çerezler, HTTP bağlantıları."""
+
+    def __init__(self):
+        import yt_dlp
+
+        # Çıkarıcı listesini kurmak tek başına ~50 ms; çekirdek başına bir kez yapılır
+        self.base = yt_dlp.YoutubeDL({'quiet': True, 'noprogress': True})
+
+    def shareable(self):
+        # Paylaşılan alanlar yt-dlp'nin iç yapısı; kurulu sürümde değişmişse çekirdek
+        # paylaşılmaz, her kullanım kendi YoutubeDL'ini kurar
+        cls = type(self.base)
+        return (
+            hasattr(self.base, '_ies') and hasattr(self.base, '_ies_instances')
+            and all(isinstance(getattr(cls, name, None), functools.cached_property)
+                    for name in ('cookiejar', '_request_director'))
+            and 'auto_init' in inspect.signature(cls.__init__).parameters
+        )
+
+    def attach(self, ydl):
+        base = self.base
+        # Çıkarıcı örnekleri (YouTube oynatıcı JS önbelleği dahil) ve tablosu paylaşılır;
+        # sonradan oluşturulan örnekler de aynı sözlüğe eklenir
+        ydl._ies = base._ies
+        ydl._ies_instances = base._ies_instances
+        for ie in base._ies_instances.values():
+            ie.set_downloader(ydl)
+        # cached_property değerleri örnek sözlüğünde tutulur
+        ydl.__dict__['cookiejar'] = base.cookiejar
+        ydl.__dict__['_request_director'] = base._request_director
+
+    def detach(self, ydl):
+        # close() paylaşılan bağlantı havuzunu kapatmasın
+        ydl.__dict__.pop('_request_director', None)
+        ydl.close()
+        for ie in self.base._ies_instances.values():
+            ie.set_downloader(self.base)
+
+    def close(self):
+        self.base.close()
+
+
+class YoutubeDLPool:
+    """Hazır YoutubeDL çekirdeklerini işler arasında yeniden kullanır.
+
+    Her kullanım kendi seçenekleriyle yeni bir YoutubeDL alır (format, kancalar,
+    arşiv vb. işe özgü kalır); çıkarıcılar, çerezler ve keep-alive HTTP
+    bağlantıları havuzdaki bir çekirdekten devralınır. Bir çekirdeği aynı anda
+    tek kullanım tutar, yani eşzamanlı her işçiye bir çekirdek düşer; boşta en
+    fazla `max_idle` çekirdek kalır. Kurulu yt-dlp paylaşılan alanları
+    tanımıyorsa her kullanım kendi YoutubeDL'ini kurar.
+    """
+
+    def __init__(self, max_idle=8):
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+        # İlk çekirdekte belirlenir
+        self._shareable = None
+
+    @contextmanager
+    def ydl(self, params, cls=None):
+        import yt_dlp
+
+        cls = cls or yt_dlp.YoutubeDL
+        if self._shareable is False:
+            with cls(params) as ydl:
+                yield ydl
+            return
+        with self._lock:
+            core = self._idle.pop() if self._idle else None
+        if core is None:
+            core = _Core()
+            if self._shareable is None:
+                self._shareable = core.shareable()
+            if not self._shareable:
+                core.close()
+                with cls(params) as ydl:
+                    yield ydl
+                return
+        ydl = cls(params, auto_init=False)
+        core.attach(ydl)
+        try:
+            yield ydl
+        finally:
+            core.detach(ydl)
+            with self._lock:
+                if len(self._idle) < self.max_idle:
+                    self._idle.append(core)
+                    core = None
+            if core:
+                core.close()
+
+
+YDL_POOL = YoutubeDLPool()